@@ -0,0 +1,127 @@
+"""
+Times build_path before and after the compiled path templates.
+
+Two workloads, both resolving every role the UI asks for (client / project / asset / task /
+data and 5 task folders):
+    - sweep: 4 clients, 10 projects each and 50 assets each, every folder once, as the
+      project indexer does; the memo is cold.
+    - refresh: the same 20 environments again and again, as the selector, the folder
+      watcher and the prefetcher do while browsing.
+Each workload is run REPEAT times, the memo cleared before each sweep, and the best run is
+reported. Both versions must return the same paths.
+
+Run from the folder containing the BetterFileExplorer package:
+    python -m BetterFileExplorer.benchmarks.bench_build_path
+"""
+import os
+import time
+import shutil
+import tempfile
+
+# Keep the settings of the benchmark away from the user's own
+_TMP_DIR = tempfile.mkdtemp(prefix="bfe_bench_")
+os.environ["BFE_USER_DATA"] = _TMP_DIR
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import settings_store
+
+PROJECT_PATH = "P:/projects"
+CLIENTS = ("BLENDER", "ACME", "NorthStudio", "pixel_farm")
+PROJECTS = 10
+ASSETS = 50
+ROLES = ("client", "project", "asset", "task", "data", "modeling", "rig", "lookdev", "anim", "fx")
+REPEAT = 5
+
+
+def legacy_build_path(environment: dict, role: str) -> str:
+    """ build_path as it was before the path templates, reading the project path each call. """
+    base_path = load.get_project_path()
+
+    if role == "client":
+        return base_path
+
+    elif role == "project":
+        return os.path.join(base_path, environment.get("client", ""))
+
+    elif role == "asset":
+        return os.path.join(base_path, environment.get("client", ""), environment.get("project", ""), "Assets")
+
+    elif role == "task":
+        return os.path.join(base_path,
+                            environment.get("client", ""),
+                            environment.get("project", ""),
+                            "Assets",
+                            environment.get("asset", ""),
+                            "maya",
+                            "scenes")
+
+    elif role == "data":
+        return os.path.join(base_path,
+                            environment.get("client", ""),
+                            environment.get("project", ""),
+                            "Assets",
+                            environment.get("asset", ""),
+                            "maya",
+                            "data")
+    else:
+        return os.path.join(base_path,
+                            environment.get("client", ""),
+                            environment.get("project", ""),
+                            "Assets",
+                            environment.get("asset", ""),
+                            "maya",
+                            "scenes",
+                            role)
+
+
+def sweep_calls() -> list:
+    calls = []
+    for client in CLIENTS:
+        for project in range(PROJECTS):
+            for asset in range(ASSETS):
+                environment = {"client": client, "project": f"PRJ{project}", "asset": f"ASSET{asset:03d}", "task": "rig"}
+                calls.extend((environment, role) for role in ROLES)
+    return calls
+
+
+def refresh_calls() -> list:
+    environments = [{"client": "ACME", "project": "PRJ3", "asset": f"ASSET{asset:03d}", "task": "rig"}
+                    for asset in range(20)]
+    return [(environment, role) for _ in range(100) for environment in environments for role in ROLES]
+
+
+def best_of(fn, calls, setup=None):
+    timings = []
+    for _ in range(REPEAT):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        results = [fn(environment, role) for environment, role in calls]
+        timings.append(time.perf_counter() - start)
+    return min(timings), results
+
+
+def run():
+    store = settings_store.get_store()
+    with store.transaction():
+        store.set("project_path", PROJECT_PATH)
+        store.set("current_hierarchy_profile", "_default")
+
+    print(f"{'workload':<10}{'calls':>8}{'before':>14}{'after':>14}{'speed-up':>10}{'diffs':>7}")
+    for name, calls, setup in (("sweep", sweep_calls(), maya_utils.clear_cache),
+                               ("refresh", refresh_calls(), None)):
+        before, expected = best_of(legacy_build_path, calls)
+        after, results = best_of(maya_utils.build_path, calls, setup)
+        mismatches = sum(1 for old, new in zip(expected, results) if old != new)
+        per_call = 1_000_000 / len(calls)
+        print(f"{name:<10}{len(calls):>8}{before * per_call:>11.2f} us{after * per_call:>11.2f} us"
+              f"{before / after:>9.2f}x{mismatches:>7}")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    finally:
+        settings_store.get_store().flush()
+        shutil.rmtree(_TMP_DIR, ignore_errors=True)
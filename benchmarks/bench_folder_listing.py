@@ -0,0 +1,80 @@
+"""
+Compares the folder-content listing before and after the scandir pipeline on a task folder
+holding 2,000 versions.
+
+before: os.listdir, then os.path.getmtime and strftime for every file.
+after:  one os.scandir pass keeping raw stat values, dates formatted only for the rows
+        on screen. A revisit of an unchanged folder is served by the listing cache.
+
+Run from the folder containing the BetterFileExplorer package:
+    python -m BetterFileExplorer.benchmarks.bench_folder_listing
+"""
+import os
+import time
+import shutil
+import tempfile
+
+from BetterFileExplorer.core import listing_cache
+
+VERSIONS = 100
+SUB_VERSIONS = 20
+VISIBLE_ROWS = 30
+REPEAT = 5
+
+
+def format_file_date(m_time):
+    return time.strftime('%m/%d/%Y  | %I:%M %p', time.localtime(m_time))
+
+
+def legacy_listing(path):
+    files = []
+    for name in os.listdir(path):
+        if name.startswith("."):
+            continue
+        full_path = os.path.join(path, name)
+        files.append((name, full_path, format_file_date(os.path.getmtime(full_path))))
+    return files
+
+
+def scandir_listing(path):
+    cache = listing_cache.ListingCache()
+    entries = [entry for entry in cache.list_entries(path) if not entry.name.startswith(".")]
+    for entry in entries[:VISIBLE_ROWS]:
+        format_file_date(entry.mtime)
+    return entries
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run():
+    tmp_dir = tempfile.mkdtemp(prefix="bfe_bench_")
+    try:
+        for version in range(1, VERSIONS + 1):
+            for sub_version in range(1, SUB_VERSIONS + 1):
+                open(os.path.join(tmp_dir, f"ASSET_rig_v{version:03d}.{sub_version:03d}.ma"), "w").close()
+
+        before = best_of(legacy_listing, tmp_dir)
+        after = best_of(scandir_listing, tmp_dir)
+
+        cache = listing_cache.ListingCache()
+        cache.list_entries(tmp_dir)
+        revisit = best_of(cache.list_entries, tmp_dir)
+
+        file_count = VERSIONS * SUB_VERSIONS
+        print(f"{file_count} files")
+        print(f"{'listdir + getmtime + strftime':<34}{before * 1000:>10.2f} ms")
+        print(f"{'scandir, deferred formatting':<34}{after * 1000:>10.2f} ms")
+        print(f"{'cached revisit (one stat)':<34}{revisit * 1000:>10.2f} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
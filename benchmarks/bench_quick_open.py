@@ -0,0 +1,75 @@
+"""
+Times quick-open queries on a search index holding 200,000 scene files.
+
+The files are spread over 4 clients, 10 projects each, 50 assets each, 5 tasks each, with
+20 versions per task (every 5th one published). Each query is run REPEAT times and the
+slowest run, the first one, is reported; the palette budget is 10 ms per keystroke.
+
+Run from the folder containing the BetterFileExplorer package:
+    python -m BetterFileExplorer.benchmarks.bench_quick_open
+"""
+import time
+
+from BetterFileExplorer.core import search_index
+
+CLIENTS = ("BLENDER", "ACME", "NorthStudio", "pixel_farm")
+PROJECTS = 10
+ASSETS = 50
+TASKS = ("modeling", "rig", "lookdev", "anim", "fx")
+VERSIONS = 20
+REPEAT = 20
+
+QUERIES = (
+    "bbb rig pub",
+    "bigbuck",
+    "asset017 lookdev v012",
+    "acme prj3 anim",
+    "rig",
+    "ma",
+    "nrth fx 020",
+)
+
+
+def build_index() -> search_index.SearchIndex:
+    index = search_index.SearchIndex()
+    for client in CLIENTS:
+        for project in range(PROJECTS):
+            for asset_number in range(ASSETS):
+                asset = "BIGBUCKBUNNY" if asset_number == 0 else f"ASSET{asset_number:03d}"
+                for task in TASKS:
+                    environment = {"client": client, "project": f"PRJ{project}", "asset": asset, "task": task}
+                    scenes = []
+                    for version in range(1, VERSIONS + 1):
+                        sub_version = "pub" if version % 5 == 0 else "001"
+                        scenes.append((f"{asset}_{task}_v{version:03d}.{sub_version}.ma", float(version)))
+                    path = f"/projects/{client}/PRJ{project}/Assets/{asset}/maya/scenes/{task}"
+                    index.update_directory(path, environment, scenes)
+    return index
+
+
+def worst_of(fn, *args):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return max(timings), result
+
+
+def run():
+    start = time.perf_counter()
+    index = build_index()
+    build_time = time.perf_counter() - start
+
+    stats = index.stats()
+    print(f"{stats['files']} files, {stats['tokens']} tokens, built in {build_time:.2f} s")
+
+    for query in QUERIES:
+        # The first run resolves the terms against the vocabulary, the next ones hit the term cache
+        worst, results = worst_of(index.search, query)
+        best = results[0].name if results else "-"
+        print(f"{query!r:<26}{worst * 1000:>8.2f} ms   {len(results):>3} results   {best}")
+
+
+if __name__ == "__main__":
+    run()
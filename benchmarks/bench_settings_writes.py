@@ -0,0 +1,101 @@
+"""
+Counts settings.json reads and writes per UI action, before and after the settings store.
+
+Run from the folder containing the BetterFileExplorer package:
+    python -m BetterFileExplorer.benchmarks.bench_settings_writes
+"""
+import os
+import json
+import shutil
+import tempfile
+
+# Keep the settings of the benchmark away from the user's own
+_TMP_DIR = tempfile.mkdtemp(prefix="bfe_bench_")
+os.environ["BFE_USER_DATA"] = _TMP_DIR
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import settings_store
+from BetterFileExplorer.core import state_location
+
+
+class LegacySettings:
+    """ The read-modify-write behaviour load.py had before the store, with counters. """
+
+    def __init__(self, path):
+        self.path = path
+        self.reads = 0
+        self.writes = 0
+
+    def get_settings(self):
+        self.reads += 1
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def save_settings_parameter(self, key, value):
+        settings_dict = self.get_settings()
+        settings_dict[key] = value
+        self.writes += 1
+        with open(self.path, "w") as f:
+            json.dump(settings_dict, f, indent=4)
+
+    def save_current_environment(self, environment_dict):
+        self.save_settings_parameter("current_environment", environment_dict)
+
+
+def legacy_save_settings_dialog(legacy):
+    legacy.save_settings_parameter("project_path", "P:/projects")
+    legacy.save_settings_parameter("default_task", "rig")
+    legacy.save_settings_parameter("recent_files_amount", "20")
+
+
+def store_save_settings_dialog():
+    with load.settings_transaction():
+        load.save_settings_parameter("project_path", "P:/projects")
+        load.save_settings_parameter("default_task", "rig")
+        load.save_settings_parameter("recent_files_amount", "20")
+
+
+def environment_burst(save_environment, steps=25):
+    """ Simulates a user scrolling through combos: one environment save per index change. """
+    for i in range(steps):
+        save_environment({"client": "client", "project": "project", "asset": f"asset_{i}", "task": "rig"})
+
+
+def run():
+    # Seeds the temp user folder with the settings shipped with the install
+    state_location.ensure_user_state()
+    tmp_settings = settings.SETTINGS_PATH
+    if not os.path.isfile(tmp_settings):
+        load.save_json(tmp_settings, {})
+
+    rows = []
+
+    legacy = LegacySettings(tmp_settings)
+    legacy_save_settings_dialog(legacy)
+    before = (legacy.reads, legacy.writes)
+    store = settings_store.get_store()
+    store.reset_stats()
+    store_save_settings_dialog()
+    rows.append(("Settings > Save and Close", before, (store.stats()["disk_reads"], store.stats()["disk_writes"])))
+
+    legacy = LegacySettings(tmp_settings)
+    environment_burst(legacy.save_current_environment)
+    before = (legacy.reads, legacy.writes)
+    store.invalidate()
+    store.reset_stats()
+    environment_burst(load.save_current_environment)
+    load.flush_settings()
+    rows.append(("25 combo changes", before, (store.stats()["disk_reads"], store.stats()["disk_writes"])))
+
+    print(f"{'UI action':<28}{'before (r/w)':>16}{'after (r/w)':>16}")
+    for name, (b_reads, b_writes), (a_reads, a_writes) in rows:
+        print(f"{name:<28}{f'{b_reads}/{b_writes}':>16}{f'{a_reads}/{a_writes}':>16}")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    finally:
+        settings_store.get_store().flush()
+        shutil.rmtree(_TMP_DIR, ignore_errors=True)
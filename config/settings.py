@@ -1,20 +1,51 @@
 import os
+import sys
 from pathlib import Path
-from BetterFileExplorer.core import load
+from BetterFileExplorer.core import settings_store
 
 APP_NAME = "BetterFileExplorer"
 VERSION = "1.1"
 
+
+def get_user_data_path() -> str:
+    """ Local, per-user folder for mutable state. BFE_USER_DATA overrides it. """
+    override = os.environ.get("BFE_USER_DATA")
+    if override:
+        return os.path.abspath(os.path.expanduser(override))
+
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+
+    return os.path.join(base, APP_NAME)
+
+
 ROOT_DIR = Path(__file__).parent.parent
+
+# Shared, read-mostly data shipped with the install (may live on a network share)
 DATA_PATH = os.path.join(ROOT_DIR, "config/data")
+HIERARCHY_PROFILES_PATH = os.path.join(DATA_PATH, "hierarchy_profiles")
+
+# Per-user, mutable state on local disk
+USER_DATA_PATH = get_user_data_path()
+CACHE_PATH = os.path.join(USER_DATA_PATH, "cache")
+
+SETTINGS_PATH = os.path.join(USER_DATA_PATH, "settings.json")
+RECENT_FILE_PATH = os.path.join(USER_DATA_PATH, "recent_files.json")
+RECENT_JOURNAL_PATH = os.path.join(USER_DATA_PATH, "recent_files.journal")
 
-SETTINGS_PATH = os.path.join(DATA_PATH, "settings.json")
-CURRENT_PROFILE_PATH = os.path.join(DATA_PATH, "current_hierarchy_profile.json")
-RECENT_FILE_PATH = os.path.join(DATA_PATH, "recent_files.json")
+# Files copied from the install on first run, as (old location, new location)
+LEGACY_STATE_FILES = [
+    (os.path.join(DATA_PATH, "settings.json"), SETTINGS_PATH),
+    (os.path.join(DATA_PATH, "recent_files.json"), RECENT_FILE_PATH),
+]
 
 CONTEXT_MENU_QSS = "QPushButton{background:#666;border-radius:3px;min-height:20px;padding:0 10px}QPushButton:hover{background:#5285a6}QPushButton:pressed{background:#28658d}"
 
 
 # TODO Maybe its better those 2 functions end up in load module
 def get_current_hierarchy_profile():
-    return load.open_json(SETTINGS_PATH)["current_hierarchy_profile"]
+    return settings_store.get_store().get_current_hierarchy_profile()
@@ -0,0 +1,136 @@
+import os
+import re
+import csv
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import listing_cache
+from BetterFileExplorer.core import folder_planner
+
+BulkResult = namedtuple("BulkResult", ["path", "created", "failed", "dry_run"])
+
+# Characters Windows refuses in a folder name
+_INVALID_CHARACTERS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def parse_names(text: str, role: str = "") -> list:
+    """
+    Names of a pasted list or CSV, in order and without duplicates.
+
+    A single line is split on tabs, semicolons or commas; several lines give the first
+    column of each row, quoted CSV cells included. A first row reading "name" or ``role``
+    is taken for a header.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+
+    delimiter = next((character for character in "\t;," if character in text), ",")
+    rows = [[cell.strip() for cell in row] for row in csv.reader(lines, delimiter=delimiter)]
+    names = rows[0] if len(rows) == 1 else [row[0] for row in rows if row]
+
+    if names and names[0].lower() in {"name", role.lower()} - {""}:
+        names = names[1:]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def validate_name(name: str):
+    """ Returns why ``name`` can't be a folder name, or None. """
+    if _INVALID_CHARACTERS.search(name):
+        return "contains a character not allowed in folder names"
+    if name.endswith((".", " ")):
+        return "ends with a dot or a space"
+    if name in (".", ".."):
+        return "is not a folder name"
+    return None
+
+
+def create_in_bulk(current_env: dict,
+                   role: str,
+                   names: list,
+                   dry_run: bool = False,
+                   max_workers: int = 8,
+                   progress=None) -> BulkResult:
+    """
+    Creates the ``role`` folder of every name in ``names``, each with its template branch.
+
+    The parent folder is listed once to reject names already taken, then the branches are
+    created on ``max_workers`` threads without scanning again. A leftover template folder
+    ("ASSET NAME", ...) is renamed to the first name, as a single creation would. Failures
+    are reported per name and don't stop the others. ``progress(done, total)`` is called as
+    names are processed. Safe to run off the main thread.
+    """
+    profile = profiles.get_profile()
+    full_path = maya_utils.build_path(current_env, role)
+    listing_cache.invalidate(full_path)
+    taken = {os.path.normcase(entry.name) for entry in listing_cache.list_entries(full_path) or ()}
+
+    created = []
+    failed = []
+    to_create = []
+    for name in names:
+        error = validate_name(name)
+        if error is None and os.path.normcase(name) in taken:
+            error = "already exists"
+        if error:
+            failed.append((name, error))
+        else:
+            taken.add(os.path.normcase(name))
+            to_create.append(name)
+
+    if role == "client":
+        nodes = profile.nodes
+    else:
+        branch = profile.find_branch(role)
+        if branch is None:
+            return BulkResult(full_path, [], failed + [(name, "no such folder in the profile") for name in to_create], dry_run)
+        nodes = [branch]
+
+    template_folder = f"{role.upper()} NAME"
+    if role != "client" and to_create and os.path.normcase(template_folder) in taken:
+        name = to_create.pop(0)
+        try:
+            if not dry_run:
+                os.rename(os.path.join(full_path, template_folder), os.path.join(full_path, name))
+            created.append(name)
+        except OSError as error:
+            failed.append((name, str(error)))
+
+    if dry_run:
+        return BulkResult(full_path, created + to_create, failed, dry_run)
+
+    report = progress or (lambda done, total: None)
+    total = len(to_create)
+    report(0, total)
+
+    def create(name):
+        # The names are spread over the threads already, each branch is created in order
+        return name, folder_planner.plan_folders(nodes, full_path, {role: name}, max_workers=1, scan=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfe_bulk") as executor:
+        for done, (name, plan) in enumerate(executor.map(create, to_create), 1):
+            if plan.errors:
+                failed.append((name, "; ".join(plan.errors[:3])))
+            else:
+                created.append(name)
+            report(done, total)
+
+    listing_cache.invalidate(full_path)
+    return BulkResult(full_path, created, failed, dry_run)
+
+
+def format_result(result: BulkResult, limit: int = 30) -> str:
+    verb = "Would create" if result.dry_run else "Created"
+    lines = [f"{verb} {len(result.created)} folder(s) in {result.path}."]
+    if result.dry_run:
+        lines.extend(result.created[:limit])
+        if len(result.created) > limit:
+            lines.append(f"... and {len(result.created) - limit} more")
+    if result.failed:
+        lines.append(f"{len(result.failed)} failed:")
+        lines.extend(f"{name}: {error}" for name, error in result.failed[:limit])
+        if len(result.failed) > limit:
+            lines.append(f"... and {len(result.failed) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,203 @@
+import os
+import sys
+import errno
+import shutil
+import tempfile
+from collections import namedtuple
+
+CopyResult = namedtuple("CopyResult", ["destination", "method", "size"])
+
+CHUNK_SIZE = 8 * 1024 * 1024
+VERIFY_SAMPLE_SIZE = 64 * 1024
+
+# Linux ioctl sharing the source extents with the destination (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+class CopyError(Exception):
+    pass
+
+
+class CopyCancelled(CopyError):
+    pass
+
+
+def copy_file(source: str,
+              destination: str,
+              progress=None,
+              allow_hardlink: bool = False,
+              should_stop=None,
+              chunk_size: int = CHUNK_SIZE) -> CopyResult:
+    """
+    Copies ``source`` to ``destination`` with the cheapest method the file systems allow.
+
+    In order: a reflink (copy on write clone), a hard link when ``allow_hardlink`` is set,
+    the OS copy routine (CopyFileExW on Windows, which copies server side on SMB shares;
+    copy_file_range on Linux, which stays in the kernel) and finally a chunked read / write.
+    The copy is written next to ``destination`` and renamed once complete, so a partial
+    file never carries the final name.
+
+    ``progress(copied, total)`` is called as bytes are copied, ``should_stop()`` polled to
+    cancel. Safe to run off the main thread.
+    """
+    total = os.path.getsize(source)
+    report = progress or (lambda copied, size: None)
+    report(0, total)
+
+    directory = os.path.dirname(destination) or "."
+    handle, temp_path = tempfile.mkstemp(prefix=".copy_", dir=directory)
+    os.close(handle)
+
+    try:
+        method = None
+        for name, copier in _copiers(allow_hardlink):
+            try:
+                copier(source, temp_path, total, report, should_stop, chunk_size)
+            except CopyCancelled:
+                raise
+            except (OSError, AttributeError, NotImplementedError):
+                # Not supported here, try the next method
+                continue
+            method = name
+            break
+
+        if method is None:
+            raise CopyError(f"Could not copy {source} to {destination}")
+
+        if method != "hardlink":
+            shutil.copymode(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    report(total, total)
+    return CopyResult(destination=destination, method=method, size=total)
+
+
+def verify_copy(source: str, destination: str, sample_size: int = VERIFY_SAMPLE_SIZE) -> bool:
+    """
+    Cheap check that ``destination`` holds the content of ``source``.
+
+    Compares the sizes, then the first, middle and last ``sample_size`` bytes of both files,
+    which catches truncated and misplaced writes without reading a large file twice.
+    """
+    try:
+        size = os.path.getsize(source)
+        if os.path.getsize(destination) != size:
+            return False
+
+        with open(source, "rb") as source_file, open(destination, "rb") as destination_file:
+            for offset in sorted({0, max(0, size // 2 - sample_size // 2), max(0, size - sample_size)}):
+                source_file.seek(offset)
+                destination_file.seek(offset)
+                if source_file.read(sample_size) != destination_file.read(sample_size):
+                    return False
+    except OSError:
+        return False
+
+    return True
+
+
+def _copiers(allow_hardlink: bool):
+    yield "reflink", _reflink
+    if allow_hardlink:
+        yield "hardlink", _hardlink
+    if sys.platform.startswith("win"):
+        yield "copyfile", _copy_file_ex
+    elif hasattr(os, "copy_file_range"):
+        yield "copy_file_range", _copy_file_range
+    yield "chunked", _chunked_copy
+
+
+def _check_stop(should_stop):
+    if should_stop and should_stop():
+        raise CopyCancelled("Copy cancelled")
+
+
+def _reflink(source, temp_path, total, report, should_stop, chunk_size):
+    if sys.platform.startswith("linux"):
+        import fcntl
+        with open(source, "rb") as source_file, open(temp_path, "wb") as temp_file:
+            fcntl.ioctl(temp_file.fileno(), FICLONE, source_file.fileno())
+    elif sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        # clonefile refuses to overwrite, the placeholder temp file goes first
+        os.remove(temp_path)
+        if libc.clonefile(os.fsencode(source), os.fsencode(temp_path), 0) != 0:
+            open(temp_path, "wb").close()
+            raise OSError(ctypes.get_errno(), "clonefile failed")
+    else:
+        raise NotImplementedError("No reflink on this platform")
+    report(total, total)
+
+
+def _hardlink(source, temp_path, total, report, should_stop, chunk_size):
+    os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        open(temp_path, "wb").close()
+        raise
+    report(total, total)
+
+
+def _copy_file_range(source, temp_path, total, report, should_stop, chunk_size):
+    with open(source, "rb") as source_file, open(temp_path, "wb") as temp_file:
+        copied = 0
+        while copied < total:
+            _check_stop(should_stop)
+            count = os.copy_file_range(source_file.fileno(), temp_file.fileno(), min(chunk_size, total - copied))
+            if not count:
+                break
+            copied += count
+            report(copied, total)
+    if copied != total:
+        raise OSError(errno.EIO, "copy_file_range stopped early")
+
+
+def _copy_file_ex(source, temp_path, total, report, should_stop, chunk_size):
+    import ctypes
+    from ctypes import wintypes
+
+    progress_continue, progress_cancel = 0, 1
+    progress_routine = ctypes.WINFUNCTYPE(
+        wintypes.DWORD,
+        ctypes.c_longlong, ctypes.c_longlong, ctypes.c_longlong, ctypes.c_longlong,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE, wintypes.HANDLE, wintypes.LPVOID
+    )
+
+    cancelled = []
+
+    def on_progress(total_size, transferred, *_):
+        report(transferred, total_size)
+        if should_stop and should_stop():
+            cancelled.append(True)
+            return progress_cancel
+        return progress_continue
+
+    callback = progress_routine(on_progress)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, progress_routine,
+                                     wintypes.LPVOID, ctypes.POINTER(wintypes.BOOL), wintypes.DWORD]
+    kernel32.CopyFileExW.restype = wintypes.BOOL
+
+    if not kernel32.CopyFileExW(source, temp_path, callback, None, None, 0):
+        if cancelled:
+            raise CopyCancelled("Copy cancelled")
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def _chunked_copy(source, temp_path, total, report, should_stop, chunk_size):
+    copied = 0
+    with open(source, "rb") as source_file, open(temp_path, "wb") as temp_file:
+        while True:
+            _check_stop(should_stop)
+            chunk = source_file.read(chunk_size)
+            if not chunk:
+                break
+            temp_file.write(chunk)
+            copied += len(chunk)
+            report(copied, total)
@@ -0,0 +1,242 @@
+import os
+import stat
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import versions
+from BetterFileExplorer.core import version_index
+from BetterFileExplorer.core.python_utils import format_file_size
+
+SETTINGS_KEY = "dedup_enabled"
+STORE_DIR_NAME = ".bfe_objects"
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+DedupReport = namedtuple("DedupReport", ["files", "hashed", "linked", "reclaimed", "errors"])
+
+
+def is_enabled() -> bool:
+    return bool(load.get_settings_parameter(SETTINGS_KEY, False))
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """ Streams ``path`` through BLAKE2b. hashlib releases the GIL on large chunks, so threads hash in parallel. """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ObjectStore:
+    """
+    Content addressed store of scene files, ``<root>/<digest[:2]>/<digest>``.
+
+    Lives inside the project path, so its objects are on the same volume as the scenes and
+    can be hard linked. Objects are read-only: every scene linked to one shares its inode,
+    and an in-place write would silently change all of them.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def known_inodes(self) -> dict:
+        """ Returns {(st_dev, st_ino): digest} for every stored object. """
+        inodes = {}
+        if not os.path.isdir(self.root):
+            return inodes
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                try:
+                    entry_stat = os.stat(entry.path)
+                except OSError:
+                    continue
+                inodes[(entry_stat.st_dev, entry_stat.st_ino)] = entry.name
+        return inodes
+
+    def add(self, digest: str, path: str) -> str:
+        """ Makes ``path`` the object of ``digest`` if there is none yet, and returns the object path. """
+        object_path = self.object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.link(path, object_path)
+        os.chmod(object_path, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+        return object_path
+
+    @staticmethod
+    def link(object_path: str, path: str) -> None:
+        """ Replaces ``path`` with a hard link to ``object_path``, atomically. """
+        temp_path = f"{path}.dedup_tmp"
+        os.link(object_path, temp_path)
+        try:
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+
+def is_shared(path: str) -> bool:
+    """ True when ``path`` is read-only or hard linked, e.g. a deduplicated version, and must not be saved over in place. """
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return False
+    return file_stat.st_nlink > 1 or not file_stat.st_mode & stat.S_IWUSR
+
+
+def get_store() -> ObjectStore:
+    return ObjectStore(os.path.join(load.get_project_path(), STORE_DIR_NAME))
+
+
+def find_candidates(folders) -> list:
+    """
+    Returns (path, stat) for the versioned scenes of ``folders`` that may be deduplicated.
+
+    The latest work file of each scene family is left out: it is the one still being saved
+    over, and linking it would make it read-only. So is any file sharing its inode, e.g. the
+    hard linked first file of the next version, as the store would make that inode read-only.
+    """
+    candidates = []
+    latest_inodes = set()
+    for folder in folders:
+        try:
+            names = [entry.name for entry in os.scandir(folder) if entry.is_file()]
+        except OSError:
+            continue
+
+        families = {}
+        for name in names:
+            scene = versions.parse_scene_name(name)
+            if scene is not None:
+                families.setdefault(scene.base, []).append(name)
+
+        for base, family in families.items():
+            index = version_index.VersionIndex(base)
+            index.sync(family)
+            latest = index.latest_work_file()
+            for name in family:
+                path = os.path.join(folder, name)
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    continue
+                if name == latest:
+                    latest_inodes.add((file_stat.st_dev, file_stat.st_ino))
+                else:
+                    candidates.append((path, file_stat))
+    return [(path, file_stat) for path, file_stat in candidates
+            if (file_stat.st_dev, file_stat.st_ino) not in latest_inodes]
+
+
+_hash_cache = {}
+_hash_cache_lock = threading.Lock()
+
+
+def _cached_hash(path: str, file_stat) -> str:
+    key = (file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+    with _hash_cache_lock:
+        digest = _hash_cache.get(key)
+    if digest is None:
+        digest = hash_file(path)
+        with _hash_cache_lock:
+            _hash_cache[key] = digest
+    return digest
+
+
+def deduplicate(folders, store: ObjectStore = None, max_workers: int = 4, should_stop=None) -> DedupReport:
+    """
+    Replaces byte-identical scenes of ``folders`` with hard links into the object store.
+
+    Files are grouped by size first and only sizes shared by several distinct files are
+    hashed, on ``max_workers`` threads; files already linked to the store reuse its digest.
+    Safe to run off the main thread.
+    """
+    store = store or get_store()
+    candidates = find_candidates(folders)
+    known = store.known_inodes()
+
+    by_size = {}
+    for path, file_stat in candidates:
+        by_size.setdefault(file_stat.st_size, []).append((path, file_stat))
+
+    to_hash = []
+    digests = {}
+    for group in by_size.values():
+        inodes = {(file_stat.st_dev, file_stat.st_ino) for _, file_stat in group}
+        if len(inodes) < 2:
+            continue
+        for path, file_stat in group:
+            digest = known.get((file_stat.st_dev, file_stat.st_ino))
+            if digest:
+                digests[path] = digest
+            else:
+                to_hash.append((path, file_stat))
+
+    errors = []
+
+    def hash_one(item):
+        path, file_stat = item
+        if should_stop and should_stop():
+            return path, None
+        try:
+            return path, _cached_hash(path, file_stat)
+        except OSError as error:
+            errors.append(f"{path}: {error}")
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfe_dedup") as executor:
+        for path, digest in executor.map(hash_one, to_hash):
+            if digest:
+                digests[path] = digest
+
+    stats = {path: file_stat for path, file_stat in candidates}
+    by_digest = {}
+    for path, digest in digests.items():
+        by_digest.setdefault(digest, []).append(path)
+
+    linked = 0
+    reclaimed = 0
+    for digest, paths in by_digest.items():
+        if len(paths) < 2 or (should_stop and should_stop()):
+            continue
+
+        # Reuse a file already linked to the store as the object, if any
+        paths.sort(key=lambda path: (stats[path].st_dev, stats[path].st_ino) not in known)
+        try:
+            object_path = store.add(digest, paths[0])
+            object_inode = (os.stat(object_path).st_dev, os.stat(object_path).st_ino)
+        except OSError as error:
+            errors.append(f"{paths[0]}: {error}")
+            continue
+
+        for path in paths:
+            file_stat = stats[path]
+            if (file_stat.st_dev, file_stat.st_ino) == object_inode:
+                continue
+            try:
+                store.link(object_path, path)
+            except OSError as error:
+                errors.append(f"{path}: {error}")
+                continue
+            linked += 1
+            # The old inode is only freed when this was its last link
+            if file_stat.st_nlink == 1:
+                reclaimed += file_stat.st_size
+
+    return DedupReport(files=len(candidates), hashed=len(to_hash), linked=linked, reclaimed=reclaimed, errors=errors)
+
+
+def format_report(report: DedupReport) -> str:
+    text = (f"{report.linked} file(s) linked to identical versions, "
+            f"{format_file_size(report.reclaimed)} reclaimed.\n"
+            f"{report.files} scene(s) checked, {report.hashed} hashed.")
+    if report.errors:
+        text += f"\n{len(report.errors)} error(s):\n" + "\n".join(report.errors[:10])
+    return text
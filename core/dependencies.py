@@ -0,0 +1,168 @@
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import ma_header
+from BetterFileExplorer.core import maya_utils
+
+CACHE_VERSION = 1
+
+# Copy number Maya appends to a file referenced more than once, "rig.ma{1}"
+_COPY_NUMBER = re.compile(r"\{\d+\}$")
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def resolve_reference(scene_path: str, reference: str) -> str:
+    """ Absolute path of ``reference`` as written in ``scene_path``, relative paths being workspace relative. """
+    reference = os.path.expandvars(_COPY_NUMBER.sub("", reference))
+    if not os.path.isabs(reference):
+        reference = os.path.join(maya_utils.workspace_path(scene_path), reference)
+    return os.path.normpath(reference)
+
+
+def read_references(path: str) -> tuple:
+    """
+    Returns the files referenced by the Maya ASCII scene ``path``.
+
+    Only the ``file -r`` statements are kept, the top level references; nested ones belong
+    to the referenced files. They come before the first node, so only the header is read,
+    through the bounded buffer of ma_header.
+    """
+    references = []
+    for command, text in ma_header.iter_header_statements(path):
+        if command != "file":
+            continue
+        tokens = ma_header.tokenize(text)[1:]
+        flags = {value for is_string, value in tokens if not is_string and value.startswith("-")}
+        strings = [value for is_string, value in tokens if is_string]
+        if strings and flags & {"-r", "-reference"}:
+            references.append(resolve_reference(path, strings[-1]))
+    return tuple(dict.fromkeys(references))
+
+
+class DependencyGraph:
+    """
+    References between the Maya ASCII scenes of the project, both ways.
+
+    The references of each scene are kept with the mtime they were read at, so a rebuild only
+    parses the scenes saved since. Parsing runs on a thread pool: reading a header is mostly
+    waiting on the disk, which releases the GIL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scenes = {}
+        self._referenced_by = {}
+
+    def __len__(self) -> int:
+        return len(self._scenes)
+
+    def build(self, scenes, max_workers: int = None, should_stop=None) -> dict:
+        """ Syncs the graph with ``scenes``, (path, mtime) pairs, and returns counts of the work done. """
+        scenes = {_key(path): (path, mtime) for path, mtime in scenes if ma_header.is_maya_ascii(path)}
+
+        with self._lock:
+            known = dict(self._scenes)
+
+        updated = {key: known[key] for key, (_, mtime) in scenes.items()
+                   if key in known and known[key][1] == mtime}
+        to_parse = [(key, path, mtime) for key, (path, mtime) in scenes.items() if key not in updated]
+
+        def parse(item):
+            key, path, mtime = item
+            if should_stop and should_stop():
+                return key, None
+            try:
+                return key, (path, mtime, read_references(path))
+            except OSError:
+                return key, (path, mtime, ())
+
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfe_dependencies") as executor:
+            for key, scene in executor.map(parse, to_parse):
+                if scene is not None:
+                    updated[key] = scene
+
+        referenced_by = {}
+        for key, (path, _, references) in updated.items():
+            for reference in references:
+                referenced_by.setdefault(_key(reference), []).append(path)
+
+        with self._lock:
+            self._scenes = updated
+            self._referenced_by = referenced_by
+
+        return {"scenes": len(updated), "parsed": len(to_parse), "removed": len(set(known) - set(updated))}
+
+    def references(self, path: str) -> list:
+        with self._lock:
+            scene = self._scenes.get(_key(path))
+        return list(scene[2]) if scene else []
+
+    def referenced_by(self, path: str) -> list:
+        with self._lock:
+            return sorted(self._referenced_by.get(_key(path), ()))
+
+    def contains(self, path: str) -> bool:
+        with self._lock:
+            return _key(path) in self._scenes
+
+    # Persistence
+    def save(self, file_path: str) -> None:
+        with self._lock:
+            scenes = [[path, mtime, list(references)] for path, mtime, references in self._scenes.values()]
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        load.save_json(file_path, {"version": CACHE_VERSION, "scenes": scenes})
+
+    def load(self, file_path: str) -> None:
+        try:
+            data = load.open_json(file_path)
+        except ValueError:
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        with self._lock:
+            self._scenes = {_key(path): (path, mtime, tuple(references))
+                            for path, mtime, references in data.get("scenes", ())}
+
+
+def cache_path(project_path: str) -> str:
+    digest = hashlib.sha1(_key(project_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.CACHE_PATH, f"dependencies_{digest}.json")
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """ The graph of the last build, or None while no build has ended. Never touches the disk. """
+    return _graph
+
+
+def build_from_project_index(index, should_stop=None) -> DependencyGraph:
+    """
+    Brings the dependency graph in step with the scenes of the project index.
+
+    The previous run is loaded from the cache folder first, so only the scenes saved since
+    are parsed again. Safe to run off the main thread.
+    """
+    global _graph
+
+    with _graph_lock:
+        graph = DependencyGraph()
+        file_path = cache_path(index.project_path)
+        graph.load(file_path)
+
+        graph.build(((os.path.join(dir_path, name), mtime) for dir_path, name, _, mtime, _, _, _ in index.iter_scenes()),
+                    should_stop=should_stop)
+        graph.save(file_path)
+        _graph = graph
+    return graph
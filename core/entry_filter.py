@@ -0,0 +1,104 @@
+import re
+import fnmatch
+import threading
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import profiles
+
+SETTINGS_KEY = "entry_filter"
+
+# Used when settings.json has no "entry_filter" section
+DEFAULT_RULES = {
+    "hidden_globs": [".*", "*~", "*.tmp", "*.swp", "*.swatches", "incrementalSave", "Thumbs.db", "desktop.ini"],
+    "hidden_regex": [],
+    "file_extensions": [],
+}
+
+
+class EntryFilter:
+    """
+    Decides which folder entries are shown.
+
+    Exact names (the template folders of the hierarchy profile) are checked against a
+    frozenset; glob and regex rules are merged into one compiled pattern, so each entry costs
+    a set lookup and a single regex match. ``file_extensions``, when not empty, restricts
+    files (not folders) to those extensions.
+    """
+
+    def __init__(self, names=(), hidden_globs=(), hidden_regex=(), file_extensions=()):
+        self.names = frozenset(names)
+        self.invalid_rules = []
+
+        parts = []
+        for glob in hidden_globs:
+            parts.append(fnmatch.translate(glob))
+        for expression in hidden_regex:
+            try:
+                re.compile(expression)
+            except re.error:
+                self.invalid_rules.append(expression)
+                continue
+            parts.append(f"(?:{expression})")
+
+        self._pattern = re.compile("|".join(parts), re.IGNORECASE) if parts else None
+        self._extensions = tuple(f".{extension.lower().lstrip('.')}" for extension in file_extensions if extension)
+
+    def accepts(self, name: str, is_dir: bool = False) -> bool:
+        if name in self.names:
+            return False
+        if self._pattern is not None and self._pattern.match(name):
+            return False
+        if self._extensions and not is_dir and not name.lower().endswith(self._extensions):
+            return False
+        return True
+
+    def filter_entries(self, entries) -> list:
+        accepts = self.accepts
+        return [entry for entry in entries if accepts(entry.name, entry.is_dir)]
+
+
+def get_rules() -> dict:
+    rules = dict(DEFAULT_RULES)
+    rules.update(load.get_settings_parameter(SETTINGS_KEY) or {})
+    return rules
+
+
+def _rules_key(rules: dict) -> tuple:
+    return tuple((key, tuple(rules.get(key) or ())) for key in sorted(DEFAULT_RULES))
+
+
+_filters = {}
+_lock = threading.Lock()
+
+
+def _get_filter(kind: str, key: tuple, build) -> EntryFilter:
+    with _lock:
+        cached = _filters.get(kind)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    entry_filter = build()
+    with _lock:
+        _filters[kind] = (key, entry_filter)
+    return entry_filter
+
+
+def get_selector_filter() -> EntryFilter:
+    """ Filter for the selector combos: profile template names plus the user rules. """
+    profile = profiles.get_profile()
+    rules = get_rules()
+    key = (profile.name, profile.signature, _rules_key(rules))
+
+    return _get_filter("selector", key, lambda: EntryFilter(names=profile.black_list,
+                                                            hidden_globs=rules["hidden_globs"],
+                                                            hidden_regex=rules["hidden_regex"],
+                                                            file_extensions=rules["file_extensions"]))
+
+
+def get_content_filter() -> EntryFilter:
+    """ Filter for the folder content list: the user rules only. """
+    rules = get_rules()
+
+    return _get_filter("content", _rules_key(rules), lambda: EntryFilter(hidden_globs=rules["hidden_globs"],
+                                                                         hidden_regex=rules["hidden_regex"],
+                                                                         file_extensions=rules["file_extensions"]))
@@ -0,0 +1,150 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+FolderPlan = namedtuple("FolderPlan", ["root", "missing", "existing", "created", "errors", "dry_run"])
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def template_paths(nodes, names: dict = None) -> list:
+    """
+    Relative paths of every folder of the profile ``nodes``, parents first.
+
+    ``names`` maps a role to the folder name replacing its template name, e.g.
+    {"asset": "Robot"} for "ASSET NAME". Nodes without a name are skipped with their children.
+    """
+    names = names or {}
+    paths = []
+
+    def walk(items, parent):
+        for node in items:
+            name = names.get(node.role, node.name) if node.role else node.name
+            if not name:
+                continue
+            path = os.path.join(parent, name) if parent else name
+            paths.append(path)
+            walk(node.children, path)
+
+    walk(nodes, "")
+    return paths
+
+
+def scan_existing(root: str, relative_paths) -> set:
+    """
+    Returns the keys of the folders of ``relative_paths`` that exist under ``root``.
+
+    Each existing folder on the way is listed once, and only when the template has folders
+    inside it, so the cost is one listing per existing template level instead of one
+    round trip per folder.
+    """
+    wanted = {}
+    for path in relative_paths:
+        parent = os.path.dirname(path)
+        wanted.setdefault(_key(os.path.join(root, parent) if parent else root), set()).add(
+            os.path.normcase(os.path.basename(path))
+        )
+
+    existing = set()
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        folder_key = _key(folder)
+        children = wanted.get(folder_key)
+        if not children:
+            continue
+        try:
+            with os.scandir(folder) as iterator:
+                found = [entry.name for entry in iterator if entry.is_dir() and os.path.normcase(entry.name) in children]
+        except OSError:
+            continue
+        for name in found:
+            child = os.path.join(folder, name)
+            existing.add(_key(child))
+            pending.append(child)
+    return existing
+
+
+def _create(path: str):
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+    except OSError as error:
+        return f"{path}: {error}"
+    return None
+
+
+def plan_folders(nodes,
+                 root: str,
+                 names: dict = None,
+                 dry_run: bool = False,
+                 max_workers: int = 8,
+                 scan: bool = True) -> FolderPlan:
+    """
+    Creates the folders of the profile ``nodes`` missing under ``root``, or only lists them with ``dry_run``.
+
+    The target is scanned once and diffed against the template. Missing folders are created
+    one depth level at a time, each level in parallel on ``max_workers`` threads: parents
+    always exist before their children, and siblings don't wait on each other over the
+    network. A failed folder is reported, and its children left out.
+
+    ``scan=False`` skips the scan when the caller already knows nothing of the template is
+    under ``root``, e.g. the top folder name was just checked against a listing.
+    """
+    relative_paths = template_paths(nodes, names)
+    existing = scan_existing(root, relative_paths) if scan else set()
+
+    missing = [os.path.join(root, path) for path in relative_paths if _key(os.path.join(root, path)) not in existing]
+    if not os.path.isdir(root):
+        missing.insert(0, root)
+    missing.sort(key=lambda path: _key(path).count(os.sep))
+
+    if dry_run or not missing:
+        return FolderPlan(root, missing, len(existing), [], [], dry_run)
+
+    created = []
+    errors = []
+    failed = []
+    to_create = missing
+    if missing[0] == root:
+        # The root may be several levels deep, it is the only folder created with its parents
+        try:
+            os.makedirs(root, exist_ok=True)
+        except OSError as error:
+            return FolderPlan(root, missing, len(existing), created, [f"{root}: {error}"], dry_run)
+        created.append(root)
+        to_create = missing[1:]
+
+    levels = {}
+    for path in to_create:
+        levels.setdefault(_key(path).count(os.sep), []).append(path)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfe_folders") as executor:
+        for depth in sorted(levels):
+            paths = [path for path in levels[depth] if not any(_key(path).startswith(parent) for parent in failed)]
+            for path, error in zip(paths, executor.map(_create, paths)):
+                if error:
+                    errors.append(error)
+                    failed.append(_key(path) + os.sep)
+                else:
+                    created.append(path)
+
+    return FolderPlan(root, missing, len(existing), created, errors, dry_run)
+
+
+def format_plan(plan: FolderPlan, limit: int = 30) -> str:
+    """ Human readable summary, the folders relative to the plan root. """
+    verb = "Would create" if plan.dry_run else "Created"
+    paths = plan.missing if plan.dry_run else plan.created
+    lines = [f"{verb} {len(paths)} folder(s), {plan.existing} already there."]
+    for path in paths[:limit]:
+        lines.append(os.path.relpath(path, plan.root) if path != plan.root else path)
+    if len(paths) > limit:
+        lines.append(f"... and {len(paths) - limit} more")
+    if plan.errors:
+        lines.append(f"{len(plan.errors)} error(s):")
+        lines.extend(plan.errors[:limit])
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+import os
+import sys
+
+from PySide2 import QtCore
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import workers
+
+
+def is_network_path(path: str) -> bool:
+    """ True for UNC paths and, on Windows, mapped network drives. """
+    normalized = path.replace("\\", "/")
+    if normalized.startswith("//"):
+        return True
+
+    if sys.platform.startswith("win"):
+        import ctypes
+        drive = os.path.splitdrive(os.path.abspath(path))[0]
+        if drive:
+            drive_remote = 4
+            return ctypes.windll.kernel32.GetDriveTypeW(f"{drive}\\") == drive_remote
+
+    return False
+
+
+def _stat_mtimes(paths) -> dict:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+class FolderWatcher(QtCore.QObject):
+    """
+    Watches a small set of directories and emits ``directory_changed`` when their content changes.
+
+    Local folders use QFileSystemWatcher. Network shares rarely deliver change notifications,
+    so they are polled instead: their mtimes are stat'ed on a worker thread every
+    ``poll_interval`` ms. Bursts of events on the same folder are coalesced.
+    """
+    directory_changed = QtCore.Signal(str)
+
+    def __init__(self, parent=None, poll_interval: int = 3000, debounce: int = 300):
+        super(FolderWatcher, self).__init__(parent)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._queue_change)
+
+        self._polled = {}
+        self._polling = False
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(poll_interval)
+        self._poll_timer.timeout.connect(self._poll)
+
+        self._pending = set()
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce)
+        self._debounce_timer.timeout.connect(self._emit_pending)
+
+    def watch(self, paths) -> None:
+        """ Replaces the watched directories with ``paths``. """
+        wanted = {os.path.normpath(path) for path in paths if path and os.path.isdir(path)}
+        force_polling = bool(load.get_settings_parameter("force_polling_watcher", False))
+
+        watched = set(self._watcher.directories())
+        stale = list(watched - wanted)
+        if stale:
+            self._watcher.removePaths(stale)
+        for path in list(self._polled):
+            if path not in wanted:
+                del self._polled[path]
+
+        for path in wanted - watched - set(self._polled):
+            if force_polling or is_network_path(path) or not self._watcher.addPath(path):
+                self._polled[path] = None
+
+        if self._polled:
+            self._poll()
+            self._poll_timer.start()
+        else:
+            self._poll_timer.stop()
+
+    def _poll(self):
+        if self._polling or not self._polled:
+            return
+        self._polling = True
+        workers.run_in_background(_stat_mtimes, list(self._polled),
+                                  on_finished=self._on_polled,
+                                  on_failed=lambda _: setattr(self, "_polling", False))
+
+    def _on_polled(self, mtimes: dict):
+        self._polling = False
+        for path, mtime in mtimes.items():
+            if path not in self._polled:
+                continue
+            previous = self._polled[path]
+            self._polled[path] = mtime
+            # The first poll only records a baseline
+            if previous is not None and previous != mtime:
+                self._queue_change(path)
+
+    def _queue_change(self, path: str):
+        self._pending.add(os.path.normpath(path))
+        self._debounce_timer.start()
+
+    def _emit_pending(self):
+        pending, self._pending = self._pending, set()
+        for path in pending:
+            self.directory_changed.emit(path)
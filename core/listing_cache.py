@@ -0,0 +1,181 @@
+import os
+import stat
+import threading
+from collections import OrderedDict, namedtuple
+
+# Raw values only, formatting is left to whoever displays them
+ListingEntry = namedtuple("ListingEntry", ["name", "is_dir", "mtime", "size"])
+
+
+class ListingCache:
+    """
+    Directory listings shared by the selector, folder content and save-as logic.
+
+    A listing is reused as long as the directory's own mtime is unchanged, so revisiting a
+    folder costs a single stat. Adding, removing or renaming an entry updates the directory
+    mtime; a file rewritten in place does not, so callers that modify files themselves should
+    call ``invalidate``, and callers showing file dates ask for ``restat_files``. The least
+    recently used listings are evicted past ``max_entries``.
+
+    An optional ``backing`` store (see project_index) is asked on a miss before the folder is
+    scanned, and is given every fresh scan.
+    """
+
+    def __init__(self, max_entries: int = 512, backing=None):
+        self.max_entries = max_entries
+        self.backing = backing
+
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path))
+
+    @staticmethod
+    def _scan(path: str) -> tuple:
+        """
+        Lists ``path`` in a single scandir pass.
+
+        The DirEntry stat result gives type, mtime and size together. On Windows it comes with the
+        directory listing itself, so there is no extra round trip per file on SMB shares.
+        """
+        entries = []
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    # Deleted while listing
+                    continue
+                entries.append(ListingEntry(entry.name,
+                                            stat.S_ISDIR(entry_stat.st_mode),
+                                            entry_stat.st_mtime,
+                                            entry_stat.st_size))
+        return tuple(entries)
+
+    @staticmethod
+    def _restat(path: str, entries: tuple):
+        """ Returns ``entries`` with the files stat'ed again, or None when none of them changed. """
+        changed = False
+        fresh = []
+        for entry in entries:
+            if not entry.is_dir:
+                try:
+                    entry_stat = os.stat(os.path.join(path, entry.name))
+                except OSError:
+                    # Deleted since, the next directory mtime change drops it
+                    entry_stat = None
+                if entry_stat is not None and (entry_stat.st_mtime, entry_stat.st_size) != (entry.mtime, entry.size):
+                    entry = entry._replace(mtime=entry_stat.st_mtime, size=entry_stat.st_size)
+                    changed = True
+            fresh.append(entry)
+        return tuple(fresh) if changed else None
+
+    def list_entries(self, path: str, restat_files: bool = False):
+        """
+        Returns the entries of ``path``, or None if it isn't a readable directory.
+
+        With ``restat_files``, the files of a reused listing are stat'ed again: saving over a
+        file in place changes its mtime and size but not the directory mtime. Meant for the
+        displayed task folder, where one stat per file is cheap next to a listing.
+        """
+        key = self._key(path)
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.invalidate(path)
+            return None
+
+        backing = self.backing
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] == dir_mtime:
+                self._listings.move_to_end(key)
+                self._stats["hits"] += 1
+                entries = cached[1]
+            else:
+                entries = None
+                self._stats["misses"] += 1
+
+        if entries is not None:
+            if not restat_files:
+                return entries
+            fresh = self._restat(path, entries)
+            if fresh is None:
+                return entries
+            entries = fresh
+            if backing is not None:
+                backing.store(path, dir_mtime, entries)
+        else:
+            entries = backing.lookup(path, dir_mtime) if backing is not None else None
+            if entries is None:
+                try:
+                    entries = self._scan(path)
+                except OSError:
+                    return None
+                if backing is not None:
+                    backing.store(path, dir_mtime, entries)
+            elif restat_files:
+                fresh = self._restat(path, entries)
+                if fresh is not None:
+                    entries = fresh
+                    backing.store(path, dir_mtime, entries)
+
+        with self._lock:
+            self._listings[key] = (dir_mtime, entries)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.max_entries:
+                self._listings.popitem(last=False)
+                self._stats["evictions"] += 1
+
+        return entries
+
+    def list_names(self, path: str):
+        entries = self.list_entries(path)
+        if entries is None:
+            return None
+        return [entry.name for entry in entries]
+
+    def invalidate(self, path: str = None) -> None:
+        """ Forgets one listing, or all of them when no path is given. """
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(self._key(path), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._listings)
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+_cache = ListingCache()
+
+
+def get_listing_cache() -> ListingCache:
+    return _cache
+
+
+def list_entries(path: str, restat_files: bool = False):
+    return _cache.list_entries(path, restat_files)
+
+
+def list_names(path: str):
+    return _cache.list_names(path)
+
+
+def invalidate(path: str = None) -> None:
+    _cache.invalidate(path)
+
+
+def stats() -> dict:
+    return _cache.stats()
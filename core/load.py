@@ -1,8 +1,13 @@
 import os
 import re
 import json
+import uuid
 
-from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import recent_files
+from BetterFileExplorer.core import settings_store
+
+_COMMENT_LINES = re.compile(r'^//.*$', re.MULTILINE)
 
 
 def load_qss_with_fixed_urls(qss_path):
@@ -29,29 +34,59 @@ def load_stylesheet(path):
 def open_json(file_path):
     if os.path.isfile(file_path):
         with open(file_path, 'r') as jsonfile:
-            jsondata = ''.join(line for line in jsonfile if not line.startswith('//'))
-            data = json.loads(jsondata)
-            return data
+            jsondata = jsonfile.read()
+        if '//' in jsondata:
+            jsondata = _COMMENT_LINES.sub('', jsondata)
+        return json.loads(jsondata)
     return {}
 
 
 def save_json(file_path, content):
-    with open(file_path, 'w') as f:
-        json.dump(content, f, indent=4)
+    """ Writes through a temp file in the same folder then renames it, so readers never see a partial file. """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    tmp_path = os.path.join(directory, f".tmp_{uuid.uuid4().hex}.json")
+    # Unlike mkstemp's owner-only file, the kernel applies the umask, as for any new file
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(content, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            # Keeps the mode of the file replaced, e.g. a shared profile
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def get_settings() -> dict:
-    return open_json(settings.SETTINGS_PATH)
+    return settings_store.get_store().as_dict()
+
+
+def get_settings_parameter(key, default=None):
+    return settings_store.get_store().get(key, default)
 
 
 def save_settings_parameter(key, value):
-    settings_dict = get_settings()
-    settings_dict[key] = value
-    save_json(settings.SETTINGS_PATH, settings_dict)
+    settings_store.get_store().set(key, value)
+
+
+def settings_transaction():
+    """ Context manager writing every settings change made inside it at once. """
+    return settings_store.get_store().transaction()
+
+
+def flush_settings() -> None:
+    settings_store.get_store().flush()
 
 
 def get_project_path() -> str:
-    return get_settings()["project_path"]
+    return settings_store.get_store().get_project_path()
 
 
 def get_project_file_name() -> str:
@@ -59,57 +94,37 @@ def get_project_file_name() -> str:
 
 
 def get_hierarchy_template_list():
-    current_profile = settings.get_current_hierarchy_profile()
-    return open_json(f"{settings.DATA_PATH}/hierarchy_profiles/{current_profile}.json")
+    return profiles.get_profile().to_list()
 
 
 def get_default_task() -> str:
-    return open_json(settings.SETTINGS_PATH)["default_task"]
+    return settings_store.get_store().get_default_task()
 
 
 def get_current_environment() -> dict:
-    return open_json(f"{settings.SETTINGS_PATH}")["current_environment"]
+    return settings_store.get_store().get_current_environment()
 
 
-def save_current_environment(environment_dict: dict) -> None:
-    save_settings_parameter("current_environment", environment_dict)
-
-
-def collect_names(data):
-    names = []
-
-    def recurse(items):
-        for item in items:
-            name = item.get("name")
-            if name:
-                names.append(name)
-                if name == "maya":
-                    continue
-            if name != "maya" and "children" in item:
-                recurse(item["children"])
+def get_recent_files_amount() -> int:
+    return settings_store.get_store().get_recent_files_amount()
 
-    recurse(data)
-    return names
 
-
-def update_selector_black_list(data):
-    black_list = collect_names(data)
-    save_json(f"{settings.DATA_PATH}/selector_word_black_list.json", black_list)
+def save_current_environment(environment_dict: dict) -> None:
+    # Changes on every combo event, so writes are coalesced
+    settings_store.get_store().set_deferred("current_environment", environment_dict)
 
 
 def get_recent_files():
-    if os.path.exists(settings.RECENT_FILE_PATH):
-        return open_json(settings.RECENT_FILE_PATH)
-    return []
+    return recent_files.get_recent_files_store().entries()
 
 
 def save_recent_file(data_dict):
-    recent = get_recent_files()
+    recent_files.get_recent_files_store().touch(data_dict)
+
 
-    recent = [f for f in recent if f["path"] != data_dict["path"]]
-    recent.insert(0, data_dict)
+def remove_recent_files(paths) -> None:
+    recent_files.get_recent_files_store().remove(paths)
 
-    recent_files_amount = open_json(settings.SETTINGS_PATH)["recent_files_amount"]
-    recent = recent[:int(recent_files_amount)]
 
-    save_json(settings.RECENT_FILE_PATH, recent)
+def clear_recent_files() -> None:
+    recent_files.get_recent_files_store().clear()
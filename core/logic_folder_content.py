@@ -7,13 +7,22 @@ from maya import cmds
 from BetterFileExplorer.config import settings
 from BetterFileExplorer.core import load
 from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import dedup
+from BetterFileExplorer.core import dependencies
+from BetterFileExplorer.core import profiles
 from BetterFileExplorer.core.python_utils import open_containing_folder
+from BetterFileExplorer.widgets import folder_content_model
 
 from PySide2 import QtWidgets, QtCore, QtGui
 
+HEADER_COLUMNS_SETTINGS_KEY = "show_scene_info_columns"
 
-def open_file(main_window, item, column, recent_tree: QtWidgets.QTreeWidget):
-    data = item.data(0, QtCore.Qt.UserRole)
+
+def open_file(main_window, index: QtCore.QModelIndex, recent_tree: QtWidgets.QTreeWidget):
+    data = index.siblingAtColumn(0).data(QtCore.Qt.UserRole)
+    if not data:
+        return
     file_path = data["path"]
 
     if file_path and os.path.exists(file_path):
@@ -37,18 +46,23 @@ def open_file(main_window, item, column, recent_tree: QtWidgets.QTreeWidget):
 
 
 def refresh_recent_files(tree: QtWidgets.QTreeWidget):
+    tree.setUpdatesEnabled(False)
     tree.clear()
-    for recent_data in load.get_recent_files():
-        add_recent_file_item(tree, recent_data)
+    tree.addTopLevelItems([create_recent_file_item(recent_data) for recent_data in load.get_recent_files()])
+    tree.setUpdatesEnabled(True)
 
 
-def add_recent_file_item(tree: QtWidgets.QTreeWidget, recent_data):
+def create_recent_file_item(recent_data) -> QtWidgets.QTreeWidgetItem:
     path = recent_data["path"]
 
     item = QtWidgets.QTreeWidgetItem([os.path.basename(path)])
     item.setData(0, QtCore.Qt.UserRole, recent_data)
 
-    tree.addTopLevelItem(item)
+    return item
+
+
+def add_recent_file_item(tree: QtWidgets.QTreeWidget, recent_data):
+    tree.addTopLevelItem(create_recent_file_item(recent_data))
 
 
 def on_recent_file_clicked(main_window, item, column):
@@ -57,29 +71,21 @@ def on_recent_file_clicked(main_window, item, column):
     if not isinstance(data, dict):
         return
 
-    main_window.client_combo.setCurrentText(data.get("client", ""))
-    main_window.project_combo.setCurrentText(data.get("project", ""))
-    main_window.asset_combo.setCurrentText(data.get("asset", ""))
-    main_window.task_combo.setCurrentText(data.get("task", ""))
-
-    text = data.get("file_name", "")
-    matching_items = main_window.folder_content_list.findItems(text, QtCore.Qt.MatchExactly)
-    if matching_items:
-        item = matching_items[0]
-        main_window.folder_content_list.setCurrentItem(item)
+    target_env = {role: data.get(role, "") for role in profiles.ROLES}
+    main_window.switch_environment(target_env, data.get("file_name", ""))
 
 
-def setup_files_context_menu(tree_widget):
-    tree_widget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-    tree_widget.customContextMenuRequested.connect(lambda pos: show_files_context_menu(tree_widget, pos))
+def setup_files_context_menu(tree_view):
+    tree_view.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+    tree_view.customContextMenuRequested.connect(lambda pos: show_files_context_menu(tree_view, pos))
 
 
-def show_files_context_menu(tree_widget, pos):
-    item = tree_widget.itemAt(pos)
-    if not item:
+def show_files_context_menu(tree_view, pos):
+    data = tree_view.indexAt(pos).siblingAtColumn(0).data(QtCore.Qt.UserRole)
+    if not data:
         return
 
-    menu = QtWidgets.QMenu(tree_widget)
+    menu = QtWidgets.QMenu(tree_view)
 
     folder_icon = QtGui.QIcon(QtGui.QPixmap(f"{settings.ROOT_DIR}/resources/icons/folder_white.png").scaled(14, 14))
     open_action = menu.addAction(folder_icon, "Open In Directory")
@@ -90,16 +96,47 @@ def show_files_context_menu(tree_widget, pos):
     # reference_icon = QtGui.QIcon(QtGui.QPixmap(f"{settings.ROOT_DIR}/resources/icons/reference_white.svg").scaled(14, 14))
     reference_action = menu.addAction("Reference File")
 
-    global_pos = tree_widget.viewport().mapToGlobal(pos)
+    menu.addSeparator()
+    dependency_targets = add_dependency_menus(menu, data["path"])
+
+    menu.addSeparator()
+    sort_version_action = menu.addAction("Sort By Version")
+    sort_date_action = menu.addAction("Sort By Date")
+
+    header_columns_action = menu.addAction("Show Scene Info")
+    header_columns_action.setCheckable(True)
+    header_columns_action.setChecked(header_columns_shown())
+
+    dedup_action = None
+    if dedup.is_enabled():
+        menu.addSeparator()
+        dedup_action = menu.addAction("Link Identical Versions")
+
+    global_pos = tree_view.viewport().mapToGlobal(pos)
     action = menu.exec_(global_pos)
 
-    selected_text = item.text(0)
-    if selected_text:
-        current_env = load.get_current_environment()
-        parent_path = maya_utils.build_path(current_env, "task")
-        task = item.data(0, QtCore.Qt.UserRole)["task"]
+    if action in dependency_targets:
+        go_to_file(tree_view, dependency_targets[action])
+        return
 
-        file_path = os.path.join(parent_path, task, selected_text)
+    if action is not None and action == dedup_action:
+        deduplicate_folder(tree_view, os.path.dirname(data["path"]))
+        return
+
+    if action == header_columns_action:
+        load.save_settings_parameter(HEADER_COLUMNS_SETTINGS_KEY, header_columns_action.isChecked())
+        show_header_columns(tree_view, header_columns_action.isChecked())
+        return
+    if action == sort_version_action:
+        tree_view.sortByColumn(folder_content_model.NAME_COLUMN, QtCore.Qt.AscendingOrder)
+        return
+    if action == sort_date_action:
+        tree_view.sortByColumn(folder_content_model.DATE_COLUMN, QtCore.Qt.DescendingOrder)
+        return
+
+    selected_text = data["file_name"]
+    if selected_text:
+        file_path = data["path"]
         filename = Path(file_path).stem
         if action == open_action:
             open_containing_folder(file_path)
@@ -109,6 +146,57 @@ def show_files_context_menu(tree_widget, pos):
             cmds.file(file_path, reference=True, namespace=filename)
 
 
+def add_dependency_menus(menu: QtWidgets.QMenu, path: str) -> dict:
+    """ Adds the References and Referenced By submenus of ``path``, returns {action: scene path}. """
+    graph = dependencies.get_graph()
+    targets = {}
+
+    for title, get_paths in (("References", "references"), ("Referenced By", "referenced_by")):
+        if graph is None:
+            submenu = menu.addMenu(f"{title} (indexing...)")
+            submenu.setEnabled(False)
+            continue
+
+        paths = getattr(graph, get_paths)(path)
+        submenu = menu.addMenu(f"{title} ({len(paths)})")
+        submenu.setEnabled(bool(paths))
+        submenu.setToolTipsVisible(True)
+        for scene_path in paths:
+            action = submenu.addAction(os.path.basename(scene_path))
+            action.setToolTip(scene_path)
+            targets[action] = scene_path
+
+    return targets
+
+
+def go_to_file(widget: QtWidgets.QWidget, path: str):
+    """ Shows ``path`` in the explorer when it is in a task folder of the project, else in the OS explorer. """
+    environment = maya_utils.environment_from_path(path)
+    main_window = widget.window()
+    if environment and hasattr(main_window, "switch_environment"):
+        main_window.switch_environment(environment, os.path.basename(path))
+    else:
+        open_containing_folder(path)
+
+
+def header_columns_shown() -> bool:
+    return bool(load.get_settings_parameter(HEADER_COLUMNS_SETTINGS_KEY, False))
+
+
+def show_header_columns(tree_view: QtWidgets.QTreeView, visible: bool):
+    """ Shows or hides the Maya version and units columns, read from the scene headers. """
+    for column in folder_content_model.HEADER_COLUMNS:
+        tree_view.setColumnHidden(column, not visible)
+
+
+def deduplicate_folder(widget: QtWidgets.QWidget, folder: str):
+    """ Links the identical versions of ``folder`` in the background, then shows the reclaimed space. """
+    def on_finished(report):
+        QtWidgets.QMessageBox.information(widget, "Link Identical Versions", dedup.format_report(report))
+
+    workers.run_in_background(dedup.deduplicate, [folder], on_finished=on_finished)
+
+
 def setup_recent_context_menu(tree_widget):
     tree_widget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
     tree_widget.customContextMenuRequested.connect(lambda pos: show_recent_context_menu(tree_widget, pos))
@@ -144,30 +232,30 @@ def show_recent_context_menu(tree_widget, pos):
         if action == open_action:
             open_containing_folder(file_path)
         elif action == remove_selected_action:
-            json_data = load.get_recent_files()
-            remove_selected_entry(tree_widget, json_data)
+            remove_selected_entry(tree_widget)
         elif action == remove_all_action:
             remove_all_entries(tree_widget)
 
 
-def remove_selected_entry(tree_widget, json_data):
-    current_selection = tree_widget.selectedItems()
-    for sel in current_selection:
+def remove_selected_entry(tree_widget):
+    paths_to_remove = []
+    items_to_remove = []
+    for sel in tree_widget.selectedItems():
         entry = sel.data(0, QtCore.Qt.UserRole)
-        if not entry:
-            return
+        if not entry or not entry.get("path"):
+            continue
 
-        path_to_remove = entry.get("path")
-        if not path_to_remove:
-            return
+        paths_to_remove.append(entry["path"])
+        items_to_remove.append(sel)
 
-        new_recent_data = [item for item in json_data if item.get("path") != path_to_remove]
-        load.save_json(settings.RECENT_FILE_PATH, new_recent_data)
+    # One journal write for the whole selection
+    load.remove_recent_files(paths_to_remove)
 
+    for sel in items_to_remove:
         index = tree_widget.indexOfTopLevelItem(sel)
         tree_widget.takeTopLevelItem(index)
 
 
 def remove_all_entries(tree_widget):
-    load.save_json(settings.RECENT_FILE_PATH, [])
+    load.clear_recent_files()
     tree_widget.clear()
@@ -0,0 +1,67 @@
+from BetterFileExplorer.core import search_index
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core.python_utils import format_file_date
+
+from PySide2 import QtWidgets, QtCore
+
+MAX_RESULTS = 50
+INDEXING_TEXT = "Indexing project..."
+NO_RESULT_TEXT = "No matching scene."
+
+
+def update_results(results_tree: QtWidgets.QTreeWidget, query: str):
+    """ Fills the quick-open list with the scenes matching ``query``, best first. """
+    results_tree.setUpdatesEnabled(False)
+    results_tree.clear()
+
+    if query.strip():
+        index = search_index.get_search_index()
+        results = index.search(query, limit=MAX_RESULTS)
+
+        if results:
+            results_tree.addTopLevelItems([create_result_item(result) for result in results])
+            results_tree.setCurrentItem(results_tree.topLevelItem(0))
+        else:
+            results_tree.addTopLevelItem(create_message_item(NO_RESULT_TEXT if len(index) else INDEXING_TEXT))
+
+    results_tree.setUpdatesEnabled(True)
+
+
+def create_result_item(result: search_index.SearchResult) -> QtWidgets.QTreeWidgetItem:
+    location = "  /  ".join(result.environment[role] for role in profiles.ROLES)
+
+    item = QtWidgets.QTreeWidgetItem([result.name, location])
+    item.setData(0, QtCore.Qt.UserRole, result)
+    item.setToolTip(0, f"{result.path}\n{format_file_date(result.mtime)}")
+    item.setTextAlignment(1, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+    return item
+
+
+def create_message_item(text: str) -> QtWidgets.QTreeWidgetItem:
+    item = QtWidgets.QTreeWidgetItem([text])
+    item.setFlags(QtCore.Qt.NoItemFlags)
+    return item
+
+
+def open_result(window: QtWidgets.QDialog, main_window: QtWidgets.QDialog, item: QtWidgets.QTreeWidgetItem):
+    """ Moves the main window to the environment of the chosen scene and selects it. """
+    if item is None:
+        return
+
+    result = item.data(0, QtCore.Qt.UserRole)
+    if not isinstance(result, search_index.SearchResult):
+        return
+
+    window.close()
+    main_window.switch_environment(dict(result.environment), result.name)
+
+
+def move_current_item(results_tree: QtWidgets.QTreeWidget, step: int):
+    count = results_tree.topLevelItemCount()
+    if not count:
+        return
+
+    current = results_tree.indexOfTopLevelItem(results_tree.currentItem())
+    row = min(max(current + step, 0), count - 1)
+    results_tree.setCurrentItem(results_tree.topLevelItem(row))
@@ -1,10 +1,15 @@
 import os
-import shutil
 
 from maya import cmds
 
 from BetterFileExplorer.core import load
 from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import listing_cache
+from BetterFileExplorer.core import version_index
+from BetterFileExplorer.core import copy_engine
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import dedup
+from BetterFileExplorer.core import thumbnails
 
 from PySide2 import QtWidgets
 
@@ -39,17 +44,29 @@ def save_file(window: QtWidgets.QDialog):
 
     file_name = build_name_from_environment(window)
 
-    if cmds.file(query=True, sceneName=True):
-        cmds.file(save=True, type="mayaAscii", f=True)
+    # Planned before saving, the publish itself changes the latest version
+    next_version_copy = plan_next_version_copy(current_env, path) if window.publish_rb.isChecked() else None
 
-    if window.publish_rb.isChecked():
-        create_next_version_on_publish(current_env, path)
+    # A deduplicated version shares its inode with identical ones, saving over it would change them all
+    scene_name = cmds.file(query=True, sceneName=True)
+    if scene_name and not dedup.is_shared(scene_name):
+        cmds.file(save=True, type="mayaAscii", f=True)
 
     new_file = os.path.join(path, file_name)
+    if thumbnails.is_capture_enabled():
+        thumbnails.capture_preview(new_file)
+
     cmds.file(rename=new_file)
     cmds.file(save=True, type="mayaAscii", f=True)
+    listing_cache.invalidate(path)
 
-    add_to_recent_files(new_file)
+    if next_version_copy is None:
+        add_to_recent_files(new_file)
+        deduplicate_in_background(path)
+        window.close()
+        return
+
+    create_next_version_on_publish(window, path, next_version_copy, new_file)
 
 
 def build_name_from_environment(window: QtWidgets.QDialog):
@@ -61,56 +78,99 @@ def build_name_from_environment(window: QtWidgets.QDialog):
     return file_name
 
 
-def get_versions(window: QtWidgets.QDialog, current_env) -> list:
+def get_task_version_index(current_env) -> version_index.VersionIndex:
     path = maya_utils.build_path(current_env, current_env.get("task", "task"))
+    return version_index.get_version_index(path, f"{current_env['asset']}_{current_env['task']}")
+
+
+def get_versions(window: QtWidgets.QDialog, current_env) -> list:
+    index = get_task_version_index(current_env)
+    version, sub_version = index.next_save(publish=window.publish_rb.isChecked())
+
+    return [f"{version:03d}", "pub" if sub_version is None else f"{sub_version:03d}"]
+
+
+def plan_next_version_copy(current_env, path):
+    """ Returns (origin, destination) to start the version after the published one, or None. """
+    index = get_task_version_index(current_env)
+    last_item = index.latest_work_file()
+    if last_item is None:
+        return None
 
-    items_list = os.listdir(path)
-    if items_list:
-        item_split = items_list[-1].split(".")
-        version = f"{int(item_split[0][-3:]):03d}"
+    published_version, _ = index.next_save(publish=True)
+    next_version_item = index.file_name(published_version + 1, 1)
 
-        if window.publish_rb.isChecked():
-            sub_version = "pub"
-        else:
-            sub_version = f"{int(item_split[-2])+1:03d}"
+    return os.path.join(path, last_item), os.path.join(path, next_version_item)
 
-        return [version, sub_version]
-    else:
-        return ["001", "001"]
 
+def create_next_version_on_publish(window: QtWidgets.QDialog, path: str, next_version_copy: tuple, published_file: str):
+    """
+    Copies the latest work file as the first file of the next version, on a worker thread.
 
-def create_next_version_on_publish(current_env, path):
-    last_item = os.listdir(path)[-1]
-    item_split = last_item.split(".")
-    version = f"{int(item_split[0][-3:])+1:03d}"
-    next_version_item = f"{current_env['asset']}_{current_env['task']}_v{version}.001.ma"
+    Progress is shown in the Save As window, which closes once the copy is verified. The
+    publish is already saved, so it is added to the recent files either way; after a failed
+    copy the window stays open with the save button enabled again.
+    """
+    origin, destination = next_version_copy
+    allow_hardlink = bool(load.get_settings_parameter("publish_copy_hardlink", False))
 
-    origin = os.path.join(path, last_item)
-    destination = os.path.join(path, next_version_item)
-    shutil.copy(origin, destination)
+    def copy_and_verify(progress=None):
+        result = copy_engine.copy_file(origin, destination, progress=progress, allow_hardlink=allow_hardlink)
+        if not copy_engine.verify_copy(origin, destination):
+            raise copy_engine.CopyError(f"{os.path.basename(destination)} doesn't match {os.path.basename(origin)}")
+        return result
+
+    def on_progress(copied, total):
+        window.copy_progress_bar.setValue(int(copied * 100 / total) if total else 100)
+
+    def on_finished(result):
+        listing_cache.invalidate(path)
+        add_to_recent_files(published_file)
+        deduplicate_in_background(path)
+        window.close()
+
+    def on_failed(message):
+        listing_cache.invalidate(path)
+        add_to_recent_files(published_file)
+        window.save_button.setEnabled(True)
+        window.copy_status_label.setText(f"Could not create {os.path.basename(destination)}, see the script editor.")
+        cmds.warning(f"Next version copy failed:\n{message}")
+
+    window.save_button.setEnabled(False)
+    window.copy_progress_bar.setRange(0, 100)
+    window.copy_progress_bar.setValue(0)
+    window.copy_progress_bar.setVisible(True)
+    window.copy_status_label.setText(f"Creating {os.path.basename(destination)}...")
+    window.copy_status_label.setVisible(True)
+
+    workers.run_in_background(copy_and_verify, on_finished=on_finished, on_failed=on_failed, on_progress=on_progress)
+
+
+def deduplicate_in_background(path: str):
+    """ When enabled in the settings, links the versions of ``path`` that are identical after a save. """
+    if not dedup.is_enabled():
+        return
+
+    def on_finished(report):
+        if report.errors:
+            cmds.warning(dedup.format_report(report))
+
+    workers.run_in_background(dedup.deduplicate, [path], on_finished=on_finished)
 
 
 def add_to_recent_files(path):
     data_dict = parse_asset_path(path)
+    if data_dict is None:
+        cmds.warning(f"{path} is not in a task folder of the project, it is not added to the recent files.")
+        return
     load.save_recent_file(data_dict)
 
 
 def parse_asset_path(path):
+    """ The recent files entry of a scene, or None when it isn't in a task folder of the project. """
     norm_path = os.path.normpath(path)
-    parts = norm_path.split(os.sep)
-
-    client = parts[parts.index(load.get_project_file_name()) + 1]
-    project = parts[parts.index(client) + 1]
-    asset = parts[parts.index("Assets") + 1]
-    task = parts[parts.index("scenes") + 1]
-
-    file_name = os.path.basename(norm_path)
-
-    return {
-        "asset": asset,
-        "client": client,
-        "file_name": file_name,
-        "path": norm_path,
-        "project": project,
-        "task": task
-    }
+    environment = maya_utils.environment_from_path(norm_path)
+    if environment is None:
+        return None
+
+    return dict(environment, file_name=os.path.basename(norm_path), path=norm_path)
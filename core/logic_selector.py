@@ -5,10 +5,23 @@ from maya import cmds
 from BetterFileExplorer.config import settings
 from BetterFileExplorer.core import load
 from BetterFileExplorer.core import maya_utils
-from BetterFileExplorer.core.python_utils import get_file_date, open_containing_folder
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import listing_cache
+from BetterFileExplorer.core import project_index
+from BetterFileExplorer.core import search_index
+from BetterFileExplorer.core import dependencies
+from BetterFileExplorer.core import prefetch
+from BetterFileExplorer.core import entry_filter
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import folder_planner
+from BetterFileExplorer.core import bulk_content
+from BetterFileExplorer.core.python_utils import open_containing_folder
 
 from PySide2 import QtWidgets, QtCore, QtGui
 
+LOADING_TEXT = "Loading..."
+CONTENT_TARGET = "content"
+
 
 def create_client_hierarchy_from_template(window: QtWidgets.QDialog,
                                           role: str,
@@ -17,7 +30,6 @@ def create_client_hierarchy_from_template(window: QtWidgets.QDialog,
     """
     Create folder hierarchy from a structured list of dictionaries when client is created.
     """
-    data = load.get_hierarchy_template_list()
     current_env = load.get_current_environment()
     user_input = line_edit_widget.text()
 
@@ -25,102 +37,183 @@ def create_client_hierarchy_from_template(window: QtWidgets.QDialog,
         cmds.warning("Please input a name.")
         return
 
-    full_path = maya_utils.build_path(current_env, role)
+    try:
+        plan = plan_new_content(current_env, role, user_input)
+    except OSError as error:
+        cmds.warning(str(error))
+        return
 
-    if role == "client":
-        if not os.path.exists(os.path.join(full_path, user_input)):
-            recurse_on_folders(data, full_path, user_input, role)
-            load.update_selector_black_list(data)
-        else:
-            cmds.warning(f"Client folder '{user_input}' already exists.")
-    else:
-        check_template_folder_exist(data, full_path, user_input, role)
+    if plan.errors:
+        cmds.warning(folder_planner.format_plan(plan))
 
     current_env[role] = user_input
-    load.save_current_environment(current_env)
 
     window.close()
-    update_selector_on_env(main_window, current_env)
+    main_window.switch_environment(current_env)
 
 
-def recurse_on_folders(data, path, user_input=None, role=None):
-    """Recursively create folders from nested JSON structure."""
-    for item in data:
-        folder_name = item.get("name")
+def preview_hierarchy_from_template(window: QtWidgets.QDialog, role: str, line_edit_widget: QtWidgets.QLineEdit):
+    """ Shows the folders the Create button would make, without touching the disk beyond one scan. """
+    user_input = line_edit_widget.text()
+    if not user_input:
+        cmds.warning("Please input a name.")
+        return
 
-        if not folder_name:
-            continue
-        if item.get("role") == role:
-            folder_name = user_input
+    try:
+        plan = plan_new_content(load.get_current_environment(), role, user_input, dry_run=True)
+    except OSError as error:
+        cmds.warning(str(error))
+        return
 
-        current_path = os.path.join(path, folder_name)
-        os.makedirs(current_path, exist_ok=True)
+    QtWidgets.QMessageBox.information(window, "Preview", folder_planner.format_plan(plan))
 
-        children = item.get("children", [])
-        if children:
-            recurse_on_folders(children, current_path, user_input, role)
 
+def create_new_content(window: QtWidgets.QDialog, role: str, main_window: QtWidgets.QDialog):
+    """ Create button of NewContentUI, for one name or, in bulk mode, for every pasted name. """
+    if window.bulk_checkbox.isChecked():
+        create_content_in_bulk(window, role, main_window)
+    else:
+        create_client_hierarchy_from_template(window, role, window.name_line_edit, main_window)
 
-def check_template_folder_exist(data, path, user_input, role):
-    file_name_check = f"{role.upper()} NAME"
-    original = os.path.join(path, file_name_check)
-    destination = os.path.join(path, user_input)
 
-    if os.path.exists(original):
-        if not os.path.exists(destination):
-            os.rename(original, destination)
-        else:
-            cmds.warning(f"Target folder '{user_input}' already exists.")
-            return
-    else:
-        role_branch = find_branch_by_role(data, role)
-        recurse_on_folders([role_branch], path, user_input, role)
+def preview_new_content(window: QtWidgets.QDialog, role: str):
+    if not window.bulk_checkbox.isChecked():
+        preview_hierarchy_from_template(window, role, window.name_line_edit)
+        return
+
+    names = bulk_content.parse_names(window.names_text_edit.toPlainText(), role)
+    if not names:
+        cmds.warning("Please input at least one name.")
+        return
+
+    result = bulk_content.create_in_bulk(load.get_current_environment(), role, names, dry_run=True)
+    QtWidgets.QMessageBox.information(window, "Preview", bulk_content.format_result(result))
+
+
+def create_content_in_bulk(window: QtWidgets.QDialog, role: str, main_window: QtWidgets.QDialog):
+    """
+    Creates every pasted name of ``role`` on a worker pool, with the progress in the window.
+
+    Failures are listed per name once all are processed; the selector is refreshed once, on
+    the first name created.
+    """
+    names = bulk_content.parse_names(window.names_text_edit.toPlainText(), role)
+    if not names:
+        cmds.warning("Please input at least one name.")
+        return
+
+    current_env = load.get_current_environment()
+
+    def on_progress(done, total):
+        window.progress_bar.setRange(0, max(total, 1))
+        window.progress_bar.setValue(done)
+
+    def on_finished(result):
+        window.create_button.setEnabled(True)
+        window.progress_bar.setVisible(False)
+        if result.failed:
+            QtWidgets.QMessageBox.warning(window, "Bulk Creation", bulk_content.format_result(result))
+
+        if result.created:
+            window.close()
+            main_window.switch_environment(dict(current_env, **{role: result.created[0]}))
+
+    def on_failed(message):
+        window.create_button.setEnabled(True)
+        window.progress_bar.setVisible(False)
+        cmds.warning(f"Bulk creation failed:\n{message}")
+
+    window.create_button.setEnabled(False)
+    window.progress_bar.setRange(0, len(names))
+    window.progress_bar.setValue(0)
+    window.progress_bar.setVisible(True)
 
+    workers.run_in_background(bulk_content.create_in_bulk, dict(current_env), role, names,
+                              on_finished=on_finished, on_failed=on_failed, on_progress=on_progress)
 
-def find_branch_by_role(data, role):
-    for item in data:
-        if item.get("role") == role:
-            return item
-        children = item.get("children", [])
-        if children:
-            result = find_branch_by_role(children, role)
-            if result:
-                return result
-    return None
+
+def plan_new_content(current_env: dict, role: str, name: str, dry_run: bool = False) -> folder_planner.FolderPlan:
+    """
+    Creates the ``role`` folder ``name`` and its template subfolders, or only plans it with ``dry_run``.
+
+    A new client gets the whole profile. Under an existing parent, a leftover template
+    folder ("ASSET NAME", ...) is renamed, otherwise the role branch of the profile is
+    diffed against the disk and only the missing folders are created. Raises
+    FileExistsError when ``name`` is taken, FileNotFoundError when the profile has no
+    ``role`` folder.
+    """
+    profile = profiles.get_profile()
+    full_path = maya_utils.build_path(current_env, role)
+    destination = os.path.join(full_path, name)
+
+    if role == "client":
+        if os.path.exists(destination):
+            raise FileExistsError(f"Client folder '{name}' already exists.")
+        return folder_planner.plan_folders(profile.nodes, full_path, {role: name}, dry_run=dry_run)
+
+    template_folder = os.path.join(full_path, f"{role.upper()} NAME")
+    if os.path.exists(template_folder):
+        if os.path.exists(destination):
+            raise FileExistsError(f"Target folder '{name}' already exists.")
+        if not dry_run:
+            os.rename(template_folder, destination)
+        return folder_planner.FolderPlan(full_path, [destination], 0, [] if dry_run else [destination], [], dry_run)
+
+    branch = profile.find_branch(role)
+    if branch is None:
+        raise FileNotFoundError(f"The hierarchy profile has no {role} folder.")
+    return folder_planner.plan_folders([branch], full_path, {role: name}, dry_run=dry_run)
+
+
+def index_project_in_background() -> None:
+    """
+    Plugs the persistent project index under the listing cache and refreshes it off the main thread.
+
+    The quick-open search index is loaded from the project index first, so it is usable
+    before the refresh ends, then follows every folder the refresh lists again. The reference
+    graph is brought up to date once the refresh is over.
+    """
+    index = project_index.get_index()
+    if index is None:
+        return
+
+    def build_and_update():
+        search_index.build_from_project_index(index)
+        stats = index.update()
+        dependencies.build_from_project_index(index)
+        return stats
+
+    workers.run_in_background(build_and_update)
 
 
 def update_selector_on_env(main_window: QtWidgets.QDialog, current_env: dict) -> None:
-    client_items = get_items(current_env, "client")
-    project_items = get_items(current_env, "project")
-    asset_items = get_items(current_env, "asset")
-    task_items = get_items(current_env, "task")
-
-    populate_combobox(main_window.client_combo, current_env, client_items, "client")
-    if project_items:
-        populate_combobox(main_window.project_combo, current_env, project_items, "project")
-    else:
-        main_window.project_combo.clear()
-    if asset_items:
-        populate_combobox(main_window.asset_combo, current_env, asset_items, "asset")
-    else:
-        main_window.asset_combo.clear()
-    if task_items:
-        populate_combobox(main_window.task_combo, current_env, task_items, "task")
-    else:
-        main_window.task_combo.clear()
+    """ Lists every selector level for ``current_env`` in the background, then fills all combos at once. """
+    # Warms the target and recent environments in parallel with the sequential resolve below
+    prefetch.get_prefetcher().prefetch(prefetch.environment_paths(current_env) + prefetch.recent_paths())
+
+    request_id = main_window.selector_request.next()
+    set_combos_loading(main_window, profiles.ROLES)
+    set_folder_content_loading(main_window)
+
+    workers.run_in_background(
+        resolve_environment, current_env, profiles.ROLES,
+        on_finished=lambda result: apply_resolved_environment(main_window, request_id, result),
+        on_failed=lambda message: resolve_environment_failed(main_window, request_id, profiles.ROLES, message)
+    )
 
 
 def get_items(current_env, role):
     items_path = maya_utils.build_path(current_env, role)
 
-    if os.path.exists(items_path):
-        black_list = load.open_json(f"{settings.DATA_PATH}/selector_word_black_list.json")
-        return [item for item in os.listdir(items_path) if item not in black_list]
-    else:
+    entries = listing_cache.list_entries(items_path)
+    if entries is None:
         return None
 
+    return [entry.name for entry in entry_filter.get_selector_filter().filter_entries(entries)]
+
 
 def populate_combobox(combobox, current_env, items, role):
+    combobox.blockSignals(True)
     combobox.clear()
     combobox.addItems(items)
 
@@ -129,6 +222,9 @@ def populate_combobox(combobox, current_env, items, role):
         if new_value:
             combobox.setCurrentText(new_value)
 
+    combobox.setEnabled(True)
+    combobox.blockSignals(False)
+
 
 def update_comboboxes_from_fs(main_window: QtWidgets.QDialog,
                               role: str,
@@ -137,77 +233,253 @@ def update_comboboxes_from_fs(main_window: QtWidgets.QDialog,
     """
     Dynamically updates the combo boxes based on the existing folders.
 
+    The folders are listed on a worker thread; the combos below ``role`` show a loading state
+    until the result comes back. Results of a selection the user already moved away from are
+    dropped.
+
     :param main_window: Main window object.
-    :param role: 'client', 'project' or 'asset' (the role that was changed).
+    :param role: 'client', 'project', 'asset' or 'task' (the role that was changed).
     :param current_env: Dictionary representing the current environment.
     :param combo_dict: Dictionary containing the QComboBoxes {'client': ..., 'project': ..., 'asset': ..., 'task': ...}
-    :param default_task: Optional string representing the default task to select.
     """
+    fields = profiles.ROLES[profiles.ROLES.index(role) + 1:]
+
+    prefetch.get_prefetcher().cancel()
+    request_id = main_window.selector_request.next()
+    set_combos_loading(main_window, fields, combo_dict)
+    set_folder_content_loading(main_window)
 
-    def _update_field(field: str):
-        # Update a single combo box and the corresponding value in current_env.
-        items = get_items(current_env, field) or []
-        combo = combo_dict.get(field)
+    workers.run_in_background(
+        resolve_environment, current_env, fields,
+        on_finished=lambda result: apply_resolved_environment(main_window, request_id, result, combo_dict),
+        on_failed=lambda message: resolve_environment_failed(main_window, request_id, fields, message, combo_dict)
+    )
+
+
+def resolve_environment(current_env: dict, fields) -> dict:
+    """
+    Lists the given selector levels top to bottom and picks a value for each.
 
+    A value already in ``current_env`` is kept when it still exists, the default task is
+    preferred for the task level, otherwise the first folder is used. Safe to run off the
+    main thread.
+    """
+    env = dict(current_env)
+    items_by_field = {}
+
+    for field in fields:
+        items = get_items(env, field) or []
+        items_by_field[field] = items
+
+        value = env.get(field)
+        if value not in items:
+            value = ""
+            if field == "task":
+                default_task = load.get_default_task()
+                if default_task in items:
+                    value = default_task
+            if not value and items:
+                value = items[0]
+        env[field] = value
+
+    files = list_folder_content(env) if env.get("task") else ("", [])
+
+    return {"env": env, "items": items_by_field, "files": files}
+
+
+def apply_resolved_environment(main_window: QtWidgets.QDialog,
+                               request_id: int,
+                               result: dict,
+                               combo_dict: dict[str, QtWidgets.QComboBox] = None):
+    if not main_window.selector_request.is_current(request_id):
+        return
+    main_window.applied_selector_request = request_id
+
+    current_env = result["env"]
+    for field, items in result["items"].items():
+        populate_combobox(get_combo(main_window, field, combo_dict), current_env, items, field)
+
+    load.save_current_environment(current_env)
+
+    main_window.content_request.next()
+    populate_folder_content(main_window, current_env, result["files"])
+
+    prefetch_next_level(current_env, result["items"])
+
+
+def prefetch_next_level(current_env: dict, items_by_field: dict):
+    """ Warms the listings behind the choices offered by the first combo that was just filled. """
+    paths = []
+    if items_by_field:
+        field = next(iter(items_by_field))
+        candidates = prefetch.rank_candidates(current_env, field, items_by_field[field])
+        paths = prefetch.next_level_paths(current_env, field, candidates)
+
+    prefetch.get_prefetcher().prefetch(paths + prefetch.recent_paths())
+
+
+def get_combo(main_window: QtWidgets.QDialog, role: str, combo_dict: dict = None) -> QtWidgets.QComboBox:
+    if combo_dict:
+        return combo_dict[role]
+    return getattr(main_window, f"{role}_combo")
+
+
+def resolve_environment_failed(main_window: QtWidgets.QDialog,
+                               request_id: int,
+                               fields,
+                               message: str,
+                               combo_dict: dict[str, QtWidgets.QComboBox] = None):
+    """ Leaves the loading state after a failed resolve, so the combos don't stay disabled. """
+    if not main_window.selector_request.is_current(request_id):
+        return
+
+    for field in fields:
+        populate_combobox(get_combo(main_window, field, combo_dict), None, [], field)
+    main_window.folder_content_model.set_message("")
+    cmds.warning(f"Could not list the project folders:\n{message}")
+
+
+def set_combos_loading(main_window: QtWidgets.QDialog, fields, combo_dict: dict = None):
+    for field in fields:
+        combo = get_combo(main_window, field, combo_dict)
         combo.blockSignals(True)
         combo.clear()
-        combo.addItems(items)
+        combo.addItem(LOADING_TEXT)
+        combo.setEnabled(False)
+        combo.blockSignals(False)
 
-        if field == "task":
-            default_task = load.get_default_task()
-            if default_task and default_task in items:
-                combo.setCurrentText(default_task)
 
-        combo.blockSignals(False)
+def set_folder_content_loading(main_window: QtWidgets.QDialog):
+    main_window.folder_content_model.set_message(LOADING_TEXT)
 
-        current_env[field] = combo.currentText() if items else ""
 
-    # Define which fields to update for each role
-    role_to_fields = {
-        "client": ["project", "asset", "task"],
-        "project": ["asset", "task"],
-        "asset": ["task"]
-    }
+def display_assets(main_window: QtWidgets.QDialog, current_env: dict):
+    """ Lists the task folder in the background and shows its files. """
+    request_id = main_window.content_request.next()
+    set_folder_content_loading(main_window)
 
-    for roles in role_to_fields.get(role, []):
-        _update_field(roles)
+    def on_finished(files):
+        if main_window.content_request.is_current(request_id):
+            populate_folder_content(main_window, current_env, files)
 
-    load.save_current_environment(current_env)
+    workers.run_in_background(list_folder_content, dict(current_env), on_finished=on_finished)
 
-    is_task = combo_dict["task"].currentText()
-    if is_task:
-        display_assets(main_window, current_env)
 
+def list_folder_content(current_env: dict) -> tuple:
+    """
+    Returns the task folder path and its raw listing entries (name, type, mtime, size).
 
-def display_assets(main_window: QtWidgets.QDialog, current_env: dict):
+    Nothing is formatted here; dates are only turned into text when rows are displayed.
+    Safe to run off the main thread.
+    """
     tasks_path = maya_utils.build_path(current_env, "task")
     assets_path = os.path.join(tasks_path, current_env["task"])
 
-    asset_files = [i for i in os.listdir(assets_path) if not i.startswith(".")]
-    main_window.folder_content_list.clear()
-
-    for asset in asset_files:
-        full_asset_path = os.path.join(assets_path, asset)
-        date = get_file_date(full_asset_path)
-        item = QtWidgets.QTreeWidgetItem([asset, date])
-        item.setData(0, QtCore.Qt.UserRole, {
-            "path": full_asset_path,
-            "file_name": asset,
-            "client": current_env["client"],
-            "project": current_env["project"],
-            "asset": current_env["asset"],
-            "task": current_env["task"]
-        })
-        # Align date column
-        item.setTextAlignment(1, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
-
-        if "pub" in asset.lower():
-            font = item.font(0)
-            font.setBold(True)
-            item.setFont(0, font)
-            item.setFont(1, font)
-
-        main_window.folder_content_list.addTopLevelItem(item)
+    entries = listing_cache.list_entries(assets_path, restat_files=True) or ()
+
+    return assets_path, entry_filter.get_content_filter().filter_entries(entries)
+
+
+def populate_folder_content(main_window: QtWidgets.QDialog, current_env: dict, files: tuple):
+    assets_path, entries = files
+    main_window.folder_content_model.set_entries(assets_path, current_env, entries)
+
+    # Selection requested before the content was available, e.g. from the recent files
+    pending_file = main_window.pending_file_selection
+    main_window.pending_file_selection = ""
+    if pending_file:
+        select_folder_content_file(main_window, pending_file)
+
+    watch_environment(main_window, current_env)
+
+
+def select_folder_content_file(main_window: QtWidgets.QDialog, file_name: str) -> bool:
+    row = main_window.folder_content_model.row_for_name(file_name)
+    if row < 0:
+        return False
+
+    index = main_window.folder_content_model.index(row, 0)
+    main_window.folder_content_list.setCurrentIndex(index)
+    main_window.folder_content_list.scrollTo(index)
+    return True
+
+
+def watch_environment(main_window: QtWidgets.QDialog, current_env: dict):
+    """ Points the folder watcher at the folders behind the four combos and the file list. """
+    watched = {}
+    for index, role in enumerate(profiles.ROLES):
+        if index and not current_env.get(profiles.ROLES[index - 1]):
+            break
+        watched[os.path.normpath(maya_utils.build_path(current_env, role))] = role
+
+    if current_env.get("task"):
+        watched[os.path.normpath(maya_utils.build_path(current_env, current_env["task"]))] = CONTENT_TARGET
+
+    main_window.watched_paths = watched
+    main_window.folder_watcher.watch(watched)
+
+
+def on_directory_changed(main_window: QtWidgets.QDialog, path: str):
+    """ Refreshes only the widget showing ``path``, in place. """
+    listing_cache.invalidate(path)
+
+    target = main_window.watched_paths.get(os.path.normpath(path))
+    if target is None:
+        return
+
+    current_env = load.get_current_environment()
+
+    if target == CONTENT_TARGET:
+        request_id = main_window.content_request.next()
+
+        def on_content_listed(files):
+            if main_window.content_request.is_current(request_id):
+                sync_folder_content(main_window, current_env, files)
+
+        workers.run_in_background(list_folder_content, current_env, on_finished=on_content_listed)
+    else:
+        selector_id = main_window.selector_request.current()
+
+        def on_items_listed(items):
+            if main_window.selector_request.is_current(selector_id):
+                sync_combobox(main_window, target, items or [])
+
+        workers.run_in_background(get_items, current_env, target, on_finished=on_items_listed)
+
+
+def sync_combobox(main_window: QtWidgets.QDialog, role: str, items: list):
+    combo = get_combo(main_window, role)
+    current = combo.currentText()
+
+    combo.blockSignals(True)
+    sync_combobox_items(combo, items)
+    combo.blockSignals(False)
+
+    if current and current not in items:
+        # The selected folder is gone, resolve the environment again from what is left
+        env = {field: get_combo(main_window, field).currentText() for field in profiles.ROLES}
+        update_selector_on_env(main_window, env)
+
+
+def sync_combobox_items(combo: QtWidgets.QComboBox, items: list):
+    """ Inserts and removes single items so the combo matches ``items``, keeping the current one. """
+    wanted = set(items)
+    for index in reversed(range(combo.count())):
+        if combo.itemText(index) not in wanted:
+            combo.removeItem(index)
+
+    for index, name in enumerate(items):
+        if combo.itemText(index) != name:
+            combo.insertItem(index, name)
+
+    while combo.count() > len(items):
+        combo.removeItem(combo.count() - 1)
+
+
+def sync_folder_content(main_window: QtWidgets.QDialog, current_env: dict, files: tuple):
+    """ Applies a row-level diff to the folder content model instead of rebuilding it. """
+    _, entries = files
+    main_window.folder_content_model.sync_entries(entries)
 
 
 def setup_context_menu(widget, name):
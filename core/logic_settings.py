@@ -4,6 +4,10 @@ from maya import cmds
 
 from BetterFileExplorer.config import settings
 from BetterFileExplorer.core import load
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import entry_filter
+from BetterFileExplorer.core import dedup
+from BetterFileExplorer.core import thumbnails
 
 from PySide2 import QtWidgets, QtGui, QtCore
 
@@ -34,29 +38,25 @@ def populate_profile_drop_down(widget: QtWidgets.QComboBox):
 
 
 def get_profiles_list():
-    dir_path = Path(settings.DATA_PATH) / "hierarchy_profiles"
+    dir_path = Path(settings.HIERARCHY_PROFILES_PATH)
     return [f.stem for f in dir_path.iterdir() if f.is_file() and f.suffix == ".json" and f.stem[0] != "_"]
 
 
 def populate_folder_hierarchy_tree(tree_widget: QtWidgets.QTreeWidget):
     tree_widget.clear()
-    current_profile = settings.get_current_hierarchy_profile()
-    data = load.open_json(f"{settings.DATA_PATH}/hierarchy_profiles/{current_profile}.json")
+    data = load.get_hierarchy_template_list()
     folder_icon = QtGui.QIcon(f"{settings.ROOT_DIR}/resources/icons/folder_white.png")
 
     list_to_tree(tree_widget.invisibleRootItem(), data, folder_icon)
     tree_widget.expandAll()
 
-    # Updates black list for selector combo boxes
-    load.update_selector_black_list(data)
-
 
 def update_hierarchy_json(tree_widget):
     current_profile = settings.get_current_hierarchy_profile()
-    current_profile_path = f"{settings.DATA_PATH}/hierarchy_profiles/{current_profile}.json"
 
     updated_list = tree_to_list(tree_widget)
-    load.save_json(current_profile_path, updated_list)
+    load.save_json(profiles.profile_path(current_profile), updated_list)
+    profiles.invalidate(current_profile)
 
 
 def list_to_tree(widget: QtWidgets.QTreeWidget, data_list: list, icon: QtGui.QIcon):
@@ -108,8 +108,8 @@ def create_default_template(line_edit_widget: QtWidgets.QLineEdit,
     elif not new_name:
         cmds.warning("Please enter a new name for the template.")
     else:
-        default_content = load.open_json(f"{settings.DATA_PATH}/hierarchy_profiles/_default.json")
-        load.save_json(file_path=f"{settings.DATA_PATH}/hierarchy_profiles/{new_name}.json",
+        default_content = profiles.get_profile("_default").to_list()
+        load.save_json(file_path=profiles.profile_path(new_name),
                        content=default_content)
         window.close()
 
@@ -171,23 +171,7 @@ def delete_folder(parent_window: QtWidgets.QDialog, item, tree_widget: QtWidgets
 
 
 def get_default_task_list() -> list[str]:
-    def recurse(node):
-        if isinstance(node, dict):
-            if node.get("name") == "scenes":
-                return [child["name"] for child in node.get("children", [])]
-            for child in node.get("children", []):
-                result = recurse(child)
-                if result:
-                    return result
-        elif isinstance(node, list):
-            for item in node:
-                result = recurse(item)
-                if result:
-                    return result
-        return None
-
-    data = load.get_hierarchy_template_list()
-    return recurse(data)
+    return list(profiles.get_profile().task_list)
 
 
 def save_default_task(combo: QtWidgets.QComboBox):
@@ -197,12 +181,32 @@ def save_default_task(combo: QtWidgets.QComboBox):
 
 def save_recent_files_amount(spinbox: QtWidgets.QSpinBox):
     count = spinbox.text()
-    settings_dict = load.open_json(settings.SETTINGS_PATH)
-    settings_dict["recent_files_amount"] = count
-    load.save_json(settings.SETTINGS_PATH, settings_dict)
+    load.save_settings_parameter("recent_files_amount", count)
+
+
+def save_entry_filter_rules(hidden_entries: QtWidgets.QLineEdit, file_extensions: QtWidgets.QLineEdit):
+    def split(line_edit):
+        return [value.strip() for value in line_edit.text().split(",") if value.strip()]
+
+    rules = entry_filter.get_rules()
+    rules["hidden_globs"] = split(hidden_entries)
+    rules["file_extensions"] = split(file_extensions)
+    load.save_settings_parameter(entry_filter.SETTINGS_KEY, rules)
+
+
+def save_dedup_enabled(checkbox: QtWidgets.QCheckBox):
+    load.save_settings_parameter(dedup.SETTINGS_KEY, checkbox.isChecked())
+
+
+def save_capture_preview(checkbox: QtWidgets.QCheckBox):
+    load.save_settings_parameter(thumbnails.PREVIEW_SETTINGS_KEY, checkbox.isChecked())
 
 
 def save_settings(settings_window: QtWidgets.QDialog):
-    save_project_path(settings_window.project_path_line_edit)
-    save_default_task(settings_window.default_task_combo)
-    save_recent_files_amount(settings_window.recent_files_spinbox)
+    with load.settings_transaction():
+        save_project_path(settings_window.project_path_line_edit)
+        save_default_task(settings_window.default_task_combo)
+        save_recent_files_amount(settings_window.recent_files_spinbox)
+        save_entry_filter_rules(settings_window.hidden_entries_line_edit, settings_window.file_extensions_line_edit)
+        save_dedup_enabled(settings_window.dedup_checkbox)
+        save_capture_preview(settings_window.preview_checkbox)
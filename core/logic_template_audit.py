@@ -0,0 +1,61 @@
+import threading
+
+from maya import cmds
+
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import template_audit
+
+from PySide2 import QtWidgets, QtCore
+
+
+def run_audit(parent: QtWidgets.QWidget):
+    """ Audits the project folders in the background, with a cancellable progress dialog, then shows the report. """
+    progress_dialog = QtWidgets.QProgressDialog("Auditing folders...", "Cancel", 0, 0, parent)
+    progress_dialog.setWindowTitle("Audit Folders")
+    progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+    progress_dialog.setMinimumDuration(300)
+
+    # Polled from the worker thread, which mustn't query the dialog itself
+    stop = threading.Event()
+    progress_dialog.canceled.connect(stop.set)
+
+    def on_progress(directories, rechecked):
+        progress_dialog.setLabelText(f"Auditing folders... {directories} checked, {rechecked} listed again")
+
+    def on_finished(report):
+        progress_dialog.close()
+        if not stop.is_set():
+            show_report(parent, report)
+
+    def on_failed(message):
+        progress_dialog.close()
+        cmds.warning(f"Folder audit failed:\n{message}")
+
+    workers.run_in_background(template_audit.audit_project, should_stop=stop.is_set,
+                              on_finished=on_finished, on_failed=on_failed, on_progress=on_progress)
+
+
+def show_report(parent: QtWidgets.QWidget, report: template_audit.AuditReport):
+    message_box = QtWidgets.QMessageBox(parent)
+    message_box.setWindowTitle("Audit Folders")
+    message_box.setIcon(QtWidgets.QMessageBox.Warning if report.findings else QtWidgets.QMessageBox.Information)
+    message_box.setText(template_audit.format_summary(report))
+    if report.findings:
+        message_box.setDetailedText(template_audit.format_report(report))
+
+    export_button = message_box.addButton("Export JSON...", QtWidgets.QMessageBox.ActionRole)
+    message_box.addButton(QtWidgets.QMessageBox.Close)
+    message_box.exec_()
+
+    if message_box.clickedButton() == export_button:
+        export_report(parent, report)
+
+
+def export_report(parent: QtWidgets.QWidget, report: template_audit.AuditReport):
+    file_path, _ = QtWidgets.QFileDialog.getSaveFileName(parent, "Export Audit", "folder_audit.json", "JSON (*.json)")
+    if not file_path:
+        return
+    try:
+        template_audit.export_json(report, file_path)
+    except OSError as error:
+        cmds.warning(f"Could not export the audit: {error}")
@@ -0,0 +1,268 @@
+import os
+import re
+import threading
+from collections import namedtuple, OrderedDict
+
+from PySide2 import QtCore
+
+from BetterFileExplorer.core import workers
+
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_BYTES = 2 * 1024 * 1024
+MAX_CACHED_HEADERS = 4096
+
+# Statement starting the scene body, the header is over once it is reached
+BODY_COMMANDS = ("createNode",)
+
+MaHeader = namedtuple("MaHeader", ["maya_version", "requires", "units", "file_info", "complete"])
+
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s;]+)')
+_ASCII_COMMENT = re.compile(r"^//Maya ASCII (\S+) scene")
+
+# currentUnit flags, short and long
+_UNIT_FLAGS = {"-l": "linear", "-linear": "linear",
+               "-a": "angle", "-angle": "angle",
+               "-t": "time", "-time": "time"}
+
+
+def is_maya_ascii(path: str) -> bool:
+    return path.lower().endswith(".ma")
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r"\\(.)", r"\1", text)
+
+
+def tokenize(statement: str) -> list:
+    """ Splits a MEL statement into (is_string, value) tokens. """
+    tokens = []
+    for match in _TOKEN.finditer(statement):
+        if match.group(1) is not None:
+            tokens.append((True, _unescape(match.group(1))))
+        else:
+            tokens.append((False, match.group(2)))
+    return tokens
+
+
+def _positional_arguments(tokens: list) -> list:
+    """ Values of ``tokens`` that are neither a flag nor the argument of one. """
+    arguments = []
+    flag_argument = False
+    for is_string, value in tokens:
+        if flag_argument:
+            flag_argument = False
+        elif not is_string and value.startswith("-"):
+            flag_argument = True
+        else:
+            arguments.append(value)
+    return arguments
+
+
+def iter_header_statements(path: str, max_bytes: int = MAX_HEADER_BYTES, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields the header of a Maya ASCII file as ``("//", comment)`` and ``(command, statement)``.
+
+    The file is read in ``chunk_size`` blocks through a buffer holding one partial line, and
+    reading stops at the first node creation or after ``max_bytes``, so the cost doesn't
+    depend on the size of the scene. Yields ``(None, "complete")`` when the header end was
+    reached rather than the byte limit.
+    """
+    statement = []
+    pending = b""
+    read = 0
+
+    with open(path, "rb") as file:
+        while read < max_bytes:
+            chunk = file.read(min(chunk_size, max_bytes - read))
+            if not chunk:
+                if pending:
+                    chunk, pending = pending + b"\n", b""
+                else:
+                    yield None, "complete"
+                    return
+            read += len(chunk)
+
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+
+            for raw_line in lines:
+                line = raw_line.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+
+                if not statement:
+                    if line.startswith("//"):
+                        yield "//", line
+                        continue
+                    if line.split(None, 1)[0] in BODY_COMMANDS:
+                        yield None, "complete"
+                        return
+
+                statement.append(line)
+                if line.endswith(";"):
+                    text = " ".join(statement)
+                    statement = []
+                    yield text.split(None, 1)[0], text
+
+
+def parse_header(path: str, max_bytes: int = MAX_HEADER_BYTES) -> MaHeader:
+    """ Reads the Maya version, required plugins, units and fileInfo of a Maya ASCII file. """
+    maya_version = ""
+    requires = OrderedDict()
+    units = {}
+    file_info = OrderedDict()
+    complete = False
+
+    for command, text in iter_header_statements(path, max_bytes=max_bytes):
+        if command is None:
+            complete = True
+
+        elif command == "//":
+            match = _ASCII_COMMENT.match(text)
+            if match and not maya_version:
+                maya_version = match.group(1)
+
+        elif command == "requires":
+            # requires [-nodeType "..." -dataType "..."] "plugin" "version";
+            arguments = _positional_arguments(tokenize(text)[1:])
+            if len(arguments) >= 2:
+                requires[arguments[-2]] = arguments[-1]
+
+        elif command == "currentUnit":
+            tokens = tokenize(text)[1:]
+            for (_, flag), (_, value) in zip(tokens, tokens[1:]):
+                if flag in _UNIT_FLAGS:
+                    units[_UNIT_FLAGS[flag]] = value
+
+        elif command == "fileInfo":
+            strings = [value for is_string, value in tokenize(text)[1:] if is_string]
+            if len(strings) >= 2:
+                file_info[strings[0]] = strings[1]
+
+    if requires.get("maya"):
+        maya_version = requires["maya"]
+
+    return MaHeader(maya_version=maya_version,
+                    requires=dict(requires),
+                    units=units,
+                    file_info=dict(file_info),
+                    complete=complete)
+
+
+_headers = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def cached_header(path: str, mtime: float):
+    """ The header of ``path`` if it was parsed at ``mtime``, without touching the disk. """
+    with _lock:
+        cached = _headers.get(_key(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    return None
+
+
+def get_header(path: str, mtime: float = None, raise_errors: bool = False):
+    """
+    Returns the header of the Maya ASCII file ``path``, or None.
+
+    Headers are cached per path and mtime; a file saved again is parsed again. A file that
+    can't be read returns None, or raises its OSError with ``raise_errors``. Safe to run off
+    the main thread.
+    """
+    if not is_maya_ascii(path):
+        return None
+
+    if mtime is None:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            if raise_errors:
+                raise
+            return None
+
+    header = cached_header(path, mtime)
+    if header is not None:
+        return header
+
+    try:
+        header = parse_header(path)
+    except OSError:
+        if raise_errors:
+            raise
+        return None
+
+    with _lock:
+        _headers[_key(path)] = (mtime, header)
+        _headers.move_to_end(_key(path))
+        while len(_headers) > MAX_CACHED_HEADERS:
+            _headers.popitem(last=False)
+    return header
+
+
+def format_units(header: MaHeader) -> str:
+    return " / ".join(header.units[unit] for unit in ("linear", "angle", "time") if unit in header.units)
+
+
+def format_tooltip(header: MaHeader) -> str:
+    """ Rich text summary of ``header`` for the folder content tooltips. """
+    lines = [f"<b>Maya {header.maya_version or '?'}</b>"]
+    if header.units:
+        lines.append(f"Units: {format_units(header)}")
+
+    plugins = [f"{plugin} {version}" for plugin, version in header.requires.items() if plugin != "maya"]
+    if plugins:
+        lines.append("Plugins: " + ", ".join(plugins))
+
+    for key in ("product", "cutIdentifier", "osv", "license"):
+        if key in header.file_info:
+            lines.append(f"{key}: {header.file_info[key]}")
+
+    if not header.complete:
+        lines.append("<i>Header truncated</i>")
+    return "<br>".join(lines)
+
+
+class HeaderService(workers.PathService):
+    """
+    Parses the headers of the rows a view shows, on a small thread pool.
+
+    ``header`` answers from the cache, or returns None and queues the file. ``header_ready``
+    is emitted with the path once its header is cached. A file that can't be read is not
+    queued again until its mtime changes.
+    """
+
+    header_ready = QtCore.Signal(str)
+
+    def __init__(self, max_workers: int = 2, max_failed: int = 4096, parent=None):
+        super(HeaderService, self).__init__(max_workers=max_workers, max_unavailable=max_failed, parent=parent)
+
+    def header(self, path: str, mtime: float):
+        if not is_maya_ascii(path):
+            return None
+
+        header = cached_header(path, mtime)
+        if header is None:
+            self.request(path, mtime)
+        return header
+
+    def _load(self, path: str, mtime: float):
+        # A read error fails the worker, so the file is not queued again
+        return get_header(path, mtime, raise_errors=True)
+
+    def _on_loaded(self, key: tuple, result: MaHeader) -> None:
+        self.header_ready.emit(key[0])
+
+
+_service = None
+
+
+def get_service() -> HeaderService:
+    global _service
+    if _service is None:
+        _service = HeaderService()
+    return _service
@@ -1,46 +1,98 @@
 import os
 
 from BetterFileExplorer.core import load
+from BetterFileExplorer.core import profiles
+
+MAX_PATHS = 4096
+
+# Resolved paths of the current profile, keyed by (project path, role, client, project, asset).
+# Swapped as a whole when the profile changes, so a thread never mixes two layouts
+_paths = (None, {})
 
 
 def build_path(environment: dict, role: str) -> str:
-    """ Returns a path depending on the environment and the role that is passed """
+    """
+    Returns a path depending on the environment and the role that is passed.
+
+    The layout comes from the path templates of the current hierarchy profile: a part is the
+    environment value of its role, or a literal folder name. Only the client, project and
+    asset values can appear in a template, so the resolved path is memoized on them.
+    """
+    global _paths
+    profile = profiles.get_profile()
+    cached_profile, paths = _paths
+    if cached_profile is not profile:
+        paths = {}
+        _paths = (profile, paths)
+
+    return _resolve(profile, paths, load.get_project_path(), environment, role)
+
+
+def _resolve(profile, paths: dict, base_path: str, environment: dict, role: str) -> str:
+    key = (base_path,
+           role,
+           environment.get("client", ""),
+           environment.get("project", ""),
+           environment.get("asset", ""))
+    path = paths.get(key)
+    if path is None:
+        template = profile.path_templates.get(role)
+        if template is None:
+            # Any other role is a task folder, under the memoized folder of the tasks
+            path = os.path.join(_resolve(profile, paths, base_path, environment, "task"), role)
+        else:
+            path = os.path.join(base_path, *[environment.get(part_role, "") if part_role else name
+                                             for part_role, name in template])
+        if len(paths) >= MAX_PATHS:
+            paths.clear()
+        paths[key] = path
+    return path
+
+
+def clear_cache() -> None:
+    global _paths
+    _paths = (None, {})
+
+
+def environment_from_path(path: str):
+    """
+    Inverse of build_path for task folders and the files inside them.
+
+    Returns the environment of ``path`` (client / project / asset / task), or None when it isn't
+    under a task folder of the project path.
+    """
     base_path = load.get_project_path()
+    if not base_path:
+        return None
+
+    try:
+        relative_path = os.path.relpath(path, base_path)
+    except ValueError:
+        return None
+
+    template = profiles.get_profile().path_template("task")
+    parts = relative_path.replace("\\", "/").split("/")
+    if len(parts) <= len(template) or parts[0] == "..":
+        return None
+
+    environment = {}
+    for part, (role, name) in zip(parts, template):
+        if role:
+            environment[role] = part
+        elif os.path.normcase(part) != os.path.normcase(name):
+            return None
+
+    environment["task"] = parts[len(template)]
+    return environment
+
+
+def workspace_path(scene_path: str) -> str:
+    """
+    Maya workspace of a scene, the folder holding the "scenes" folder of the profile.
 
-    if role == "client":
-        return base_path
-
-    elif role == "project":
-        return os.path.join(base_path, environment.get("client", ""))
-
-    elif role == "asset":
-        return os.path.join(base_path, environment.get("client", ""), environment.get("project", ""), "Assets")
-
-    elif role == "task":
-        return os.path.join(base_path,
-                            environment.get("client", ""),
-                            environment.get("project", ""),
-                            "Assets",
-                            environment.get("asset", ""),
-                            "maya",
-                            "scenes")
-
-    elif role == "data":
-        return os.path.join(base_path,
-                            environment.get("client", ""),
-                            environment.get("project", ""),
-                            "Assets",
-                            environment.get("asset", ""),
-                            "maya",
-                            "data")
-    else:
-        return os.path.join(base_path,
-                            environment.get("client", ""),
-                            environment.get("project", ""),
-                            "Assets",
-                            environment.get("asset", ""),
-                            "maya",
-                            "scenes",
-                            role)
-
-    # return base_path
+    A scene outside of the project path is taken for ``<workspace>/scenes/<task>/<scene>``.
+    """
+    environment = environment_from_path(scene_path)
+    if environment is None:
+        return os.path.dirname(os.path.dirname(os.path.dirname(scene_path)))
+    return os.path.dirname(build_path(environment, "task"))
@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import listing_cache
+from BetterFileExplorer.core import profiles
+
+
+class Prefetcher:
+    """
+    Warms the listing cache for folders the user is likely to open next.
+
+    At most ``max_workers`` listings run at once, and one round stops after
+    ``max_directories`` folders or ``max_entries`` listed entries, whichever comes first.
+    Starting a new round, or calling ``cancel``, drops whatever the previous round still
+    had queued.
+    """
+
+    def __init__(self, max_workers: int = 2, max_directories: int = 48, max_entries: int = 20000):
+        self.max_directories = max_directories
+        self.max_entries = max_entries
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfe_prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._futures = []
+        self._entries_listed = 0
+
+    def prefetch(self, paths) -> None:
+        """ Starts a new round over ``paths``, most likely first. """
+        self.cancel()
+
+        with self._lock:
+            generation = self._generation
+            unique_paths = list(dict.fromkeys(path for path in paths if path))[:self.max_directories]
+            self._futures = [self._executor.submit(self._warm, path, generation) for path in unique_paths]
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries_listed = 0
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+    def _warm(self, path: str, generation: int):
+        with self._lock:
+            if generation != self._generation or self._entries_listed >= self.max_entries:
+                return
+
+        entries = listing_cache.list_entries(path)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries_listed += len(entries or ())
+
+
+def next_level_paths(current_env: dict, field: str, candidates: list) -> list:
+    """
+    Returns the folders listed once ``field`` is set to one of ``candidates``.
+
+    For a task, that is the task folder itself; for the other roles, the folder holding the
+    next role's items.
+    """
+    index = profiles.ROLES.index(field)
+    paths = []
+    for candidate in candidates:
+        env = dict(current_env, **{field: candidate})
+        if field == "task":
+            paths.append(maya_utils.build_path(env, candidate))
+        else:
+            paths.append(maya_utils.build_path(env, profiles.ROLES[index + 1]))
+    return paths
+
+
+def rank_candidates(current_env: dict, field: str, candidates: list) -> list:
+    """ Orders ``candidates`` so the ones found in recent files, under the same parents, come first. """
+    index = profiles.ROLES.index(field)
+    parents = profiles.ROLES[:index]
+
+    positions = {}
+    for position, entry in enumerate(load.get_recent_files()):
+        name = entry.get(field)
+        if name is not None and all(entry.get(parent) == current_env.get(parent) for parent in parents):
+            positions.setdefault(name, position)
+
+    # Dense ranks, so every recent name stays ahead of the ones never used
+    ranks = {name: rank for rank, name in enumerate(sorted(positions, key=positions.get))}
+    order = {name: len(ranks) + position for position, name in enumerate(candidates)}
+    return sorted(candidates, key=lambda name: ranks.get(name, order[name]))
+
+
+def recent_paths(limit: int = 10) -> list:
+    """ Returns the folders behind the most recent files. """
+    paths = []
+    for entry in load.get_recent_files()[:limit]:
+        paths.extend(environment_paths(entry))
+    return paths
+
+
+def environment_paths(environment: dict) -> list:
+    """ Returns every folder listed when opening ``environment``, top level first. """
+    paths = []
+    for index, role in enumerate(profiles.ROLES):
+        if index and not environment.get(profiles.ROLES[index - 1]):
+            return paths
+        paths.append(maya_utils.build_path(environment, role))
+
+    if environment.get("task"):
+        paths.append(maya_utils.build_path(environment, environment["task"]))
+    return paths
+
+
+_prefetcher = None
+
+
+def get_prefetcher() -> Prefetcher:
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = Prefetcher()
+    return _prefetcher
@@ -0,0 +1,246 @@
+import os
+import time
+import pickle
+import threading
+from types import MappingProxyType
+from dataclasses import dataclass, field
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+
+# Bump when the pickled layout changes so stale sidecars are ignored
+_SIDECAR_FORMAT = 1
+
+# Roles whose template node stands for any folder name, the items of the selector combos
+ITEM_ROLES = ("client", "project", "asset")
+# The selector levels, top to bottom
+ROLES = ITEM_ROLES + ("task",)
+# Folder holding the task folders, and the folders of the asset branch addressed by name
+TASKS_FOLDER_NAME = "scenes"
+NAMED_FOLDERS = ("data",)
+
+# Layout used for the roles a profile doesn't define. A part is (role, name): the environment
+# value of ``role`` when it is set, else the literal ``name``
+_DEFAULT_PATH_TEMPLATES = {
+    "client": (),
+    "project": (("client", ""),),
+    "asset": (("client", ""), ("project", ""), ("", "Assets")),
+    "task": (("client", ""), ("project", ""), ("", "Assets"), ("asset", ""), ("", "maya"), ("", "scenes")),
+    "data": (("client", ""), ("project", ""), ("", "Assets"), ("asset", ""), ("", "maya"), ("", "data")),
+}
+
+
+@dataclass(frozen=True)
+class ProfileNode:
+    name: str
+    role: str = ""
+    children: tuple = ()
+
+    def to_dict(self) -> dict:
+        node = {"name": self.name}
+        if self.role:
+            node["role"] = self.role
+        node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """
+    Immutable, pre-digested hierarchy profile.
+
+    ``roles`` maps a role to its node and ``role_paths`` to the template names leading to it
+    from the root, ``task_list`` holds the folders under "scenes" and ``black_list`` the
+    template names hidden from the selector combos.
+
+    ``path_templates`` maps the item roles and "task" to the parts, relative to the project
+    path, of the folder listing their items, and "data" to the data folder of an asset.
+    """
+    name: str
+    signature: tuple
+    nodes: tuple
+    roles: MappingProxyType = field(repr=False)
+    role_paths: MappingProxyType = field(repr=False)
+    path_templates: MappingProxyType = field(repr=False)
+    task_list: tuple = ()
+    black_list: frozenset = frozenset()
+
+    @classmethod
+    def from_nodes(cls, name: str, signature: tuple, nodes: tuple) -> "CompiledProfile":
+        roles = {}
+        role_paths = {}
+        path_templates = {}
+
+        def walk(items, parents, parts):
+            for node in items:
+                names = parents + (node.name,)
+                node_parts = parts + (((node.role, "") if node.role in ITEM_ROLES else ("", node.name)),)
+                if node.role and node.role not in roles:
+                    roles[node.role] = node
+                    role_paths[node.role] = names
+                    if node.role in ITEM_ROLES:
+                        path_templates[node.role] = parts
+                if node.name == TASKS_FOLDER_NAME:
+                    path_templates.setdefault("task", node_parts)
+                if node.name in NAMED_FOLDERS:
+                    path_templates.setdefault(node.name, node_parts)
+                walk(node.children, names, node_parts)
+
+        walk(nodes, (), ())
+        if "task" in path_templates and "data" not in path_templates:
+            # The data folder sits next to "scenes" when the profile doesn't list it
+            path_templates["data"] = path_templates["task"][:-1] + (("", "data"),)
+
+        return cls(name=name,
+                   signature=signature,
+                   nodes=nodes,
+                   roles=MappingProxyType(roles),
+                   role_paths=MappingProxyType(role_paths),
+                   path_templates=MappingProxyType(dict(_DEFAULT_PATH_TEMPLATES, **path_templates)),
+                   task_list=_find_task_list(nodes),
+                   black_list=frozenset(_collect_black_list(nodes)))
+
+    def find_branch(self, role: str):
+        return self.roles.get(role)
+
+    def path_template(self, role: str) -> tuple:
+        """ Parts of the folder of ``role``; a role the profile doesn't know is a task folder. """
+        template = self.path_templates.get(role)
+        if template is None:
+            template = self.path_templates["task"] + (("", role),)
+        return template
+
+    def to_list(self) -> list:
+        """ Returns a fresh, mutable copy in the same shape as the profile json. """
+        return [node.to_dict() for node in self.nodes]
+
+
+def _node_from_dict(data: dict) -> ProfileNode:
+    return ProfileNode(name=data.get("name", ""),
+                       role=data.get("role", ""),
+                       children=tuple(_node_from_dict(child) for child in data.get("children", [])))
+
+
+def nodes_from_list(data) -> tuple:
+    """ Profile nodes of a list in the profile json shape. """
+    return tuple(_node_from_dict(item) for item in data or [])
+
+
+def _find_task_list(nodes) -> tuple:
+    for node in nodes:
+        if node.name == "scenes":
+            return tuple(child.name for child in node.children)
+        result = _find_task_list(node.children)
+        if result:
+            return result
+    return ()
+
+
+def _collect_black_list(nodes) -> list:
+    # The content of the "maya" folder stays visible, e.g. the task folders under "scenes"
+    names = []
+    for node in nodes:
+        if node.name:
+            names.append(node.name)
+        if node.name != "maya":
+            names.extend(_collect_black_list(node.children))
+    return names
+
+
+def profile_path(name: str) -> str:
+    return os.path.join(settings.HIERARCHY_PROFILES_PATH, f"{name}.json")
+
+
+def sidecar_path(name: str) -> str:
+    return os.path.join(settings.CACHE_PATH, "profiles", f"{name}.pickle")
+
+
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_sidecar(name: str, signature: tuple):
+    try:
+        with open(sidecar_path(name), "rb") as f:
+            file_format, cached_signature, nodes = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError, AttributeError):
+        return None
+
+    if file_format != _SIDECAR_FORMAT or tuple(cached_signature) != signature:
+        return None
+    return nodes
+
+
+def _write_sidecar(name: str, signature: tuple, nodes: tuple) -> None:
+    path = sidecar_path(name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((_SIDECAR_FORMAT, signature, nodes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The sidecar is only an optimisation
+        pass
+
+
+_cache = {}
+_checked = {}
+_lock = threading.Lock()
+
+# Seconds a compiled profile is handed out before its json is stat'ed again
+CHECK_INTERVAL = 0.5
+
+
+def get_profile(name: str = None, persist: bool = True) -> CompiledProfile:
+    """
+    Returns the compiled profile, by default the current one.
+
+    The result is cached in memory keyed by the json mtime/size, checked at most every
+    CHECK_INTERVAL seconds, so path resolution can ask for it on every call. On a miss, a
+    binary sidecar with a matching signature is used before falling back to parsing the json.
+    """
+    name = name or settings.get_current_hierarchy_profile()
+    now = time.monotonic()
+
+    # Single dict reads don't need the lock, at worst a racing call stats the json once more
+    cached = _cache.get(name)
+    if cached is not None and now - _checked.get(name, float("-inf")) < CHECK_INTERVAL:
+        return cached
+
+    path = profile_path(name)
+    signature = _file_signature(path)
+
+    with _lock:
+        if cached is not None and cached.signature == signature:
+            _checked[name] = now
+            return cached
+
+    nodes = _read_sidecar(name, signature) if (persist and signature) else None
+    if nodes is None:
+        nodes = nodes_from_list(load.open_json(path))
+        if persist and signature:
+            _write_sidecar(name, signature, nodes)
+
+    compiled = CompiledProfile.from_nodes(name, signature, nodes)
+    with _lock:
+        _cache[name] = compiled
+        _checked[name] = now
+    return compiled
+
+
+def invalidate(name: str = None) -> None:
+    """ Drops cached compilations and sidecars, for all profiles when no name is given. """
+    with _lock:
+        names = list(_cache) if name is None else [name]
+        for profile_name in names:
+            _cache.pop(profile_name, None)
+            _checked.pop(profile_name, None)
+            try:
+                os.remove(sidecar_path(profile_name))
+            except OSError:
+                pass
@@ -0,0 +1,245 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import entry_filter
+from BetterFileExplorer.core import versions
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import listing_cache
+from BetterFileExplorer.core import profiles
+
+
+# Bumped when the tables change, older index files are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (dir, name)
+);
+CREATE TABLE IF NOT EXISTS scenes (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    dir_path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    version INTEGER NOT NULL,
+    sub_version INTEGER,
+    published INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenes_dir ON scenes (dir);
+"""
+
+
+class ProjectIndex:
+    """
+    On-disk (SQLite) index of the project_path tree.
+
+    Stores every directory listed under the project with the mtime it had when listed, and
+    the versioned scene files with their size, mtime and parsed version. A listing is served
+    from the index while the directory mtime is unchanged, so a cold start only stats folders
+    instead of listing them. Used as the persistent backing of the listing cache.
+    """
+
+    def __init__(self, db_path: str, project_path: str):
+        self.db_path = db_path
+        self.project_path = project_path
+        self._root_key = _key(project_path)
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._connection.executescript("DROP TABLE IF EXISTS directories; "
+                                           "DROP TABLE IF EXISTS entries; "
+                                           "DROP TABLE IF EXISTS scenes;")
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        # Called with (directory path, [(scene name, mtime), ...]) every time a directory is stored
+        self.listeners = []
+
+        self._stats = {"reused": 0, "stored": 0}
+
+    def contains(self, path: str) -> bool:
+        key = _key(path)
+        return key == self._root_key or key.startswith(self._root_key + os.sep)
+
+    # Listing cache backing
+    def lookup(self, path: str, dir_mtime_ns: int):
+        """ Returns the stored entries of ``path`` if it was indexed with this mtime, else None. """
+        if not self.contains(path):
+            return None
+
+        key = _key(path)
+        with self._lock:
+            row = self._connection.execute("SELECT mtime_ns FROM directories WHERE path = ?", (key,)).fetchone()
+            if row is None or row[0] != dir_mtime_ns:
+                return None
+            rows = self._connection.execute(
+                "SELECT name, is_dir, mtime, size FROM entries WHERE dir = ?", (key,)
+            ).fetchall()
+            self._stats["reused"] += 1
+
+        return tuple(listing_cache.ListingEntry(name, bool(is_dir), mtime, size) for name, is_dir, mtime, size in rows)
+
+    def store(self, path: str, dir_mtime_ns: int, entries) -> None:
+        """ Replaces the indexed content of ``path``, dropping sub folders that disappeared. """
+        if not self.contains(path):
+            return
+
+        key = _key(path)
+        new_dirs = {entry.name for entry in entries if entry.is_dir}
+
+        with self._lock, self._connection:
+            old_dirs = {name for (name,) in self._connection.execute(
+                "SELECT name FROM entries WHERE dir = ? AND is_dir = 1", (key,)
+            )}
+            for removed in old_dirs - new_dirs:
+                self._forget_tree(os.path.join(key, removed))
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns, indexed_at) VALUES (?, ?, ?)",
+                (key, dir_mtime_ns, time.time())
+            )
+            self._connection.execute("DELETE FROM entries WHERE dir = ?", (key,))
+            self._connection.executemany(
+                "INSERT INTO entries (dir, name, is_dir, mtime, size) VALUES (?, ?, ?, ?, ?)",
+                [(key, entry.name, int(entry.is_dir), entry.mtime, entry.size) for entry in entries]
+            )
+
+            self._connection.execute("DELETE FROM scenes WHERE dir = ?", (key,))
+            scenes = []
+            for entry in entries:
+                scene = None if entry.is_dir else versions.parse_scene_name(entry.name)
+                if scene:
+                    scenes.append((os.path.join(key, entry.name), key, path, entry.name, entry.size, entry.mtime,
+                                   scene.version, scene.sub_version, int(scene.published)))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO scenes "
+                "(path, dir, dir_path, name, size, mtime, version, sub_version, published) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", scenes
+            )
+            self._stats["stored"] += 1
+
+        for listener in self.listeners:
+            listener(path, [(scene[3], scene[5]) for scene in scenes])
+
+    def _forget_tree(self, key: str):
+        pattern = _like_prefix(key + os.sep)
+        for table, column in (("directories", "path"), ("entries", "dir"), ("scenes", "dir")):
+            self._connection.execute(
+                f"DELETE FROM {table} WHERE {column} = ? OR {column} LIKE ? ESCAPE '\\'", (key, pattern)
+            )
+
+    # Queries
+    def iter_scenes(self):
+        """
+        Yields (dir_path, name, size, mtime, version, sub_version, published) for every indexed scene.
+
+        ``dir_path`` is the folder as it was listed, with its original case.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT dir_path, name, size, mtime, version, sub_version, published FROM scenes"
+            ).fetchall()
+        for row in rows:
+            yield row
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["directories"] = self._connection.execute("SELECT COUNT(*) FROM directories").fetchone()[0]
+            stats["scenes"] = self._connection.execute("SELECT COUNT(*) FROM scenes").fetchone()[0]
+        return stats
+
+    # Update
+    def update(self, should_stop=None) -> dict:
+        """
+        Walks client / project / asset / task folders and refreshes the index.
+
+        Folders whose mtime didn't change since the last run are not listed again. The layout
+        follows maya_utils.build_path and entries hidden by the selector filter are
+        skipped. ``should_stop`` is polled to abort early.
+        """
+        selector_filter = entry_filter.get_selector_filter()
+        visited = 0
+
+        def child_dirs(path):
+            entries = listing_cache.list_entries(path) or ()
+            return [entry.name for entry in selector_filter.filter_entries(entries) if entry.is_dir]
+
+        def walk(env, depth):
+            nonlocal visited
+            if should_stop and should_stop():
+                return
+
+            role = profiles.ROLES[depth]
+            for name in child_dirs(maya_utils.build_path(env, role)):
+                visited += 1
+                child_env = dict(env, **{role: name})
+                if role == "task":
+                    listing_cache.list_entries(maya_utils.build_path(child_env, name))
+                else:
+                    walk(child_env, depth + 1)
+
+        walk({}, 0)
+
+        stats = self.stats()
+        stats["visited"] = visited
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def index_path(project_path: str) -> str:
+    digest = hashlib.sha1(_key(project_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.CACHE_PATH, f"project_index_{digest}.sqlite")
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """ Returns the index of the current project path, plugged in as the listing cache backing. """
+    global _index
+
+    project_path = load.get_project_path()
+    if not project_path:
+        return None
+
+    with _index_lock:
+        if _index is None or _index.project_path != project_path:
+            if _index is not None:
+                _index.close()
+            _index = ProjectIndex(index_path(project_path), project_path)
+            listing_cache.get_listing_cache().backing = _index
+        return _index
@@ -7,6 +7,8 @@ import platform
 from maya import cmds
 
 from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import folder_planner
 
 current_os = platform.system().lower()
 
@@ -54,21 +56,23 @@ def create_folders_from_tree(data, parent_path):
 
     print(f"Structure créée dans : {output_root}")
     """
-    for node in data:
-        folder_name = node["name"]
-        folder_path = os.path.join(parent_path, folder_name)
-        os.makedirs(folder_path, exist_ok=True)
-
-        children = node.get("children", [])
-        if children:
-            create_folders_from_tree(children, folder_path)
+    return folder_planner.plan_folders(profiles.nodes_from_list(data), parent_path)
 
 
 def get_file_date(file):
     m_time = os.path.getmtime(file)
-    date = time.strftime('%m/%d/%Y  | %I:%M %p', time.localtime(m_time))
+    return format_file_date(m_time)
+
+
+def format_file_date(m_time):
+    return time.strftime('%m/%d/%Y  | %I:%M %p', time.localtime(m_time))
+
 
-    return date
+def format_file_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
 
 def open_containing_folder(path):
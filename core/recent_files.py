@@ -0,0 +1,149 @@
+import os
+import json
+import threading
+import itertools
+from collections import OrderedDict
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import state_location
+
+
+class RecentFiles:
+    """
+    Most-recently-used list of opened files, backed by a snapshot and an append-only journal.
+
+    The snapshot keeps the historical recent_files.json format (a list, most recent first).
+    Every change is appended to the journal as one json line, so touching or removing entries
+    never rewrites the whole list. The journal is folded back into the snapshot once it grows
+    past ``compact_every`` lines.
+
+    In memory, entries live in an OrderedDict keyed by path with the most recent entry last,
+    which makes touch and remove O(1).
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str, compact_every: int = 200):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+
+        self._entries = OrderedDict()
+        self._journal_lines = 0
+        self._signature = None
+        self._lock = threading.RLock()
+
+    # Loading
+    def _files_signature(self):
+        signature = []
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _ensure_loaded(self):
+        signature = self._files_signature()
+        if signature == self._signature:
+            return
+
+        self._entries.clear()
+        snapshot = load.open_json(self.snapshot_path) or []
+        for entry in reversed(snapshot):
+            self._entries[entry["path"]] = entry
+
+        self._journal_lines = 0
+        limit = load.get_recent_files_amount()
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    self._journal_lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A partially written last line is ignored
+                        continue
+                    self._apply(record)
+                    self._trim(limit)
+
+        self._trim(limit)
+        self._signature = signature
+
+    def _apply(self, record: dict):
+        op = record.get("op")
+        if op == "touch":
+            entry = record["entry"]
+            self._entries.pop(entry["path"], None)
+            self._entries[entry["path"]] = entry
+        elif op == "remove":
+            for path in record.get("paths", []):
+                self._entries.pop(path, None)
+        elif op == "clear":
+            self._entries.clear()
+
+    def _trim(self, limit: int = None):
+        limit = load.get_recent_files_amount() if limit is None else limit
+        while len(self._entries) > limit:
+            self._entries.popitem(last=False)
+
+    # Writing
+    def _append(self, record: dict):
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self._journal_lines += 1
+
+        if self._journal_lines >= self.compact_every:
+            self.compact()
+        else:
+            self._signature = self._files_signature()
+
+    def compact(self) -> None:
+        """ Folds the journal into the snapshot and empties it. """
+        with self._lock:
+            load.save_json(self.snapshot_path, self.entries())
+            with open(self.journal_path, "w"):
+                pass
+            self._journal_lines = 0
+            self._signature = self._files_signature()
+
+    # Access
+    def entries(self, limit: int = None) -> list:
+        """ Returns the entries, most recent first. """
+        with self._lock:
+            self._ensure_loaded()
+            return list(itertools.islice(reversed(self._entries.values()), limit))
+
+    def touch(self, entry: dict) -> None:
+        """ Moves an entry to the top of the list, adding it if needed. """
+        with self._lock:
+            self._ensure_loaded()
+            self._apply({"op": "touch", "entry": entry})
+            self._trim()
+            self._append({"op": "touch", "entry": entry})
+
+    def remove(self, paths) -> None:
+        """ Removes several entries with a single journal write. """
+        with self._lock:
+            self._ensure_loaded()
+            paths = [path for path in paths if path in self._entries]
+            if not paths:
+                return
+            self._apply({"op": "remove", "paths": paths})
+            self._append({"op": "remove", "paths": paths})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.compact()
+
+
+_recent_files = None
+
+
+def get_recent_files_store() -> RecentFiles:
+    global _recent_files
+    if _recent_files is None or _recent_files.snapshot_path != settings.RECENT_FILE_PATH:
+        state_location.ensure_user_state()
+        _recent_files = RecentFiles(settings.RECENT_FILE_PATH, settings.RECENT_JOURNAL_PATH)
+    return _recent_files
@@ -0,0 +1,339 @@
+import os
+import re
+import heapq
+import threading
+from collections import namedtuple, OrderedDict
+
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import profiles
+
+SearchResult = namedtuple("SearchResult", ["path", "name", "environment", "mtime", "score"])
+
+_WORDS = re.compile(r"[0-9A-Za-z]+")
+_CAMEL_PARTS = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Score of a query term against one token
+EXACT, PREFIX, SUBSTRING, SUBSEQUENCE = 4, 3, 2, 1
+
+
+def tokenize(text: str) -> list:
+    """ Lower case words of ``text``, plus the parts of CamelCase words. """
+    tokens = []
+    for word in _WORDS.findall(text):
+        tokens.append(word.lower())
+        parts = _CAMEL_PARTS.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def _trigrams(token: str) -> set:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """
+    In-memory index of the scene files of the project, for the quick-open palette.
+
+    Every scene is reduced to the tokens of its environment (client, project, asset, task),
+    shared by its folder, and the tokens of its file name. Query terms are first matched
+    against the token vocabulary, which is much smaller than the file list: substrings
+    through a trigram index, abbreviations ("bbb" for "bigbuckbunny") as subsequences of the
+    tokens sharing their first letter.
+
+    Each token maps to the folders it appears in, so the folders that can hold a match are
+    found with set intersections, and only their files are scored. Folders are visited most
+    recently modified first; once ``limit`` results are held, a folder whose best possible
+    score and newest file can't beat them is skipped, and the query stops when nothing left
+    can. A very broad query stays cheap without leaving a better match in an older folder out.
+    """
+
+    def __init__(self, term_cache_size: int = 256):
+        self.term_cache_size = term_cache_size
+
+        self._lock = threading.RLock()
+        self._pending = None
+        self._reset()
+
+    def _reset(self):
+        # Vocabulary
+        self._token_ids = {}
+        self._tokens = []
+        self._token_trigrams = {}
+        self._by_initial = {}
+
+        # Token id -> folders having it in their environment / {folder: [files having it in their name]}
+        self._env_dirs = []
+        self._name_dirs = []
+
+        # Folders
+        self._dirs = []
+        self._dir_ids = {}
+        self._dir_env_tokens = []
+        self._dir_files = []
+        self._dir_mtimes = []
+
+        # term -> {token id: score}, and term -> folders holding a match
+        self._term_matches = OrderedDict()
+        self._term_dirs = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(files) for files in self._dir_files)
+
+    # Update
+    def update_directory(self, path: str, environment, scenes) -> None:
+        """
+        Replaces the indexed scenes of the folder ``path`` with ``scenes``, (name, mtime) pairs.
+
+        ``environment`` is the environment the folder belongs to; when None, the folder is
+        simply dropped from the index.
+        """
+        scenes = list(scenes)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((path, environment, scenes))
+            self._update_directory(path, environment, scenes)
+
+    def _update_directory(self, path, environment, scenes):
+        if not environment:
+            scenes = []
+
+        key = os.path.normcase(os.path.normpath(path))
+        dir_id = self._dir_ids.get(key)
+        if dir_id is None:
+            if not scenes:
+                return
+            dir_id = len(self._dirs)
+            self._dir_ids[key] = dir_id
+            self._dirs.append(None)
+            self._dir_env_tokens.append(())
+            self._dir_files.append({})
+            self._dir_mtimes.append(0.0)
+
+        if environment != (self._dirs[dir_id] or (None, None))[1]:
+            for token_id in self._dir_env_tokens[dir_id]:
+                self._env_dirs[token_id].discard(dir_id)
+            env_tokens = tuple({self._token_id(token) for role in profiles.ROLES
+                                for token in tokenize((environment or {}).get(role, ""))})
+            for token_id in env_tokens:
+                self._env_dirs[token_id].add(dir_id)
+            self._dir_env_tokens[dir_id] = env_tokens
+        self._dirs[dir_id] = (path, environment)
+
+        files = self._dir_files[dir_id]
+        wanted = dict(scenes)
+
+        for name in [name for name in files if name not in wanted]:
+            for token_id in files.pop(name)[0]:
+                name_dirs = self._name_dirs[token_id]
+                name_dirs[dir_id].remove(name)
+                if not name_dirs[dir_id]:
+                    del name_dirs[dir_id]
+
+        for name, mtime in wanted.items():
+            known = files.get(name)
+            if known is not None:
+                files[name] = (known[0], mtime)
+                continue
+            name_tokens = tuple({self._token_id(token) for token in tokenize(name)})
+            for token_id in name_tokens:
+                self._name_dirs[token_id].setdefault(dir_id, []).append(name)
+            files[name] = (name_tokens, mtime)
+
+        self._dir_mtimes[dir_id] = max(wanted.values(), default=0.0)
+        self._term_dirs.clear()
+
+    def _token_id(self, token: str) -> int:
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._token_ids[token] = token_id
+            self._tokens.append(token)
+            self._env_dirs.append(set())
+            self._name_dirs.append({})
+            for trigram in _trigrams(token):
+                self._token_trigrams.setdefault(trigram, []).append(token_id)
+            self._by_initial.setdefault(token[0], []).append(token_id)
+            # New tokens can match terms that were already resolved
+            self._term_matches.clear()
+        return token_id
+
+    def rebuild(self, rows) -> None:
+        """
+        Replaces the whole index with ``rows``, (folder path, name, mtime) tuples.
+
+        The new index is built off the lock; folders updated meanwhile are replayed on it
+        before it is swapped in.
+        """
+        with self._lock:
+            self._pending = []
+
+        fresh = SearchIndex(self.term_cache_size)
+        by_dir = {}
+        for path, name, mtime in rows:
+            by_dir.setdefault(path, []).append((name, mtime))
+        for path, scenes in by_dir.items():
+            fresh._update_directory(path, maya_utils.environment_from_path(path), scenes)
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self.__dict__.update({key: value for key, value in fresh.__dict__.items()
+                                  if key not in ("_lock", "_pending")})
+            for path, environment, scenes in pending:
+                self._update_directory(path, environment, scenes)
+
+    # Query
+    def _match_term(self, term: str) -> dict:
+        """ Returns {token id: score} for the vocabulary tokens matching ``term``. """
+        matches = self._term_matches.get(term)
+        if matches is not None:
+            self._term_matches.move_to_end(term)
+            return matches
+
+        matches = {}
+        tokens = self._tokens
+        if len(term) >= 3:
+            posting_lists = sorted((self._token_trigrams.get(trigram, ()) for trigram in _trigrams(term)), key=len)
+            candidates = set(posting_lists[0]).intersection(*posting_lists[1:]) if posting_lists[0] else ()
+        else:
+            candidates = range(len(tokens))
+        for token_id in candidates:
+            token = tokens[token_id]
+            if term in token:
+                matches[token_id] = EXACT if token == term else PREFIX if token.startswith(term) else SUBSTRING
+
+        if len(term) > 1:
+            subsequence = re.compile(".*?".join(map(re.escape, term)))
+            for token_id in self._by_initial.get(term[0], ()):
+                if token_id not in matches and subsequence.match(tokens[token_id]):
+                    matches[token_id] = SUBSEQUENCE
+
+        self._term_matches[term] = matches
+        if len(self._term_matches) > self.term_cache_size:
+            self._term_matches.popitem(last=False)
+        return matches
+
+    def _match_dirs(self, term: str, matches: dict) -> set:
+        """ Returns the folders where ``term`` matches the environment or at least one file name. """
+        dirs = self._term_dirs.get(term)
+        if dirs is None:
+            dirs = set()
+            for token_id in matches:
+                dirs.update(self._env_dirs[token_id])
+                dirs.update(self._name_dirs[token_id])
+            if len(self._term_dirs) >= self.term_cache_size:
+                self._term_dirs.clear()
+            self._term_dirs[term] = dirs
+        return dirs
+
+    def search(self, query: str, limit: int = 50) -> list:
+        """
+        Returns the best ``limit`` scenes matching every word of ``query``, best first.
+
+        A file scores the sum, over the query words, of its best matching token (exact, prefix,
+        substring, then abbreviation). Ties go to the most recently modified file.
+        """
+        terms = list(dict.fromkeys(word.lower() for word in _WORDS.findall(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            term_matches = [self._match_term(term) for term in terms]
+            if not all(term_matches):
+                return []
+
+            term_dirs = sorted((self._match_dirs(term, matches) for term, matches in zip(terms, term_matches)), key=len)
+            dirs = term_dirs[0].intersection(*term_dirs[1:])
+            best_possible = sum(max(matches.values()) for matches in term_matches)
+
+            # The ``limit`` best (score, mtime, dir, name) so far, worst first
+            best = []
+            for dir_id in sorted(dirs, key=self._dir_mtimes.__getitem__, reverse=True):
+                # No file of this folder, or of the older ones, is newer than its newest file
+                newest = self._dir_mtimes[dir_id]
+                full = len(best) >= limit
+                if full and (best_possible, newest) <= best[0][:2]:
+                    break
+
+                env_tokens = self._dir_env_tokens[dir_id]
+                env_scores = [max(map(matches.__getitem__, matches.keys() & env_tokens), default=0)
+                              for matches in term_matches]
+
+                if full:
+                    bound = 0
+                    for matches, env_score in zip(term_matches, env_scores):
+                        bound += max([score for token_id, score in matches.items()
+                                      if score > env_score and dir_id in self._name_dirs[token_id]], default=env_score)
+                    if (bound, newest) <= best[0][:2]:
+                        continue
+
+                # Best file name score of each term, per file of the folder, where it beats the environment
+                name_scores = []
+                for matches, env_score in zip(term_matches, env_scores):
+                    hits = {}
+                    for token_id, token_score in matches.items():
+                        if token_score <= env_score:
+                            continue
+                        for name in self._name_dirs[token_id].get(dir_id, ()):
+                            if hits.get(name, 0) < token_score:
+                                hits[name] = token_score
+                    name_scores.append(hits)
+
+                # Terms missing from the environment must be found in the file name
+                files = self._dir_files[dir_id]
+                required = [hits.keys() for hits, env_score in zip(name_scores, env_scores) if not env_score]
+                names = set(required[0]).intersection(*required[1:]) if required else files
+
+                for name in names:
+                    score = 0
+                    for hits, env_score in zip(name_scores, env_scores):
+                        score += max(env_score, hits.get(name, 0))
+                    item = (score, files[name][1], dir_id, name)
+                    if len(best) < limit:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+            best.sort(reverse=True)
+            return [self._result(dir_id, name, mtime, score) for score, mtime, dir_id, name in best]
+
+    def _result(self, dir_id: int, name: str, mtime: float, score: int) -> SearchResult:
+        path, environment = self._dirs[dir_id]
+        return SearchResult(path=os.path.join(path, name),
+                            name=name,
+                            environment=dict(environment),
+                            mtime=mtime,
+                            score=score)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"files": sum(len(files) for files in self._dir_files),
+                    "directories": sum(1 for files in self._dir_files if files),
+                    "tokens": len(self._tokens)}
+
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    global _search_index
+    with _search_index_lock:
+        if _search_index is None:
+            _search_index = SearchIndex()
+        return _search_index
+
+
+def on_directory_stored(path: str, scenes: list) -> None:
+    """ ProjectIndex listener, keeps the search index in step with every folder listing. """
+    get_search_index().update_directory(path, maya_utils.environment_from_path(path), scenes)
+
+
+def build_from_project_index(index) -> SearchIndex:
+    """ Fills the search index from the on-disk project index and follows its updates. """
+    search_index = get_search_index()
+    if on_directory_stored not in index.listeners:
+        index.listeners.append(on_directory_stored)
+    search_index.rebuild((dir_path, name, mtime) for dir_path, name, _, mtime, _, _, _ in index.iter_scenes())
+    return search_index
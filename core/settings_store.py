@@ -0,0 +1,202 @@
+import os
+import copy
+import time
+import atexit
+import threading
+import contextlib
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import state_location
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+class SettingsStore:
+    """
+    Process-wide, in-memory view of settings.json.
+
+    The file is parsed once and only re-read when its mtime or size changes. The stat
+    itself is throttled by ``check_interval`` so a burst of getters costs a single stat.
+
+    Writes are gathered: changes made inside ``transaction()`` are written once when the
+    outermost block exits, and ``set_deferred`` coalesces high-frequency keys into a single
+    write after ``flush_delay`` seconds of quiet. Every write goes through a temp file and
+    a rename so a crash never leaves a truncated settings.json behind.
+    """
+
+    def __init__(self, path: str, check_interval: float = 0.5, flush_delay: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.flush_delay = flush_delay
+
+        self._data = {}
+        self._signature = None
+        self._last_check = None
+        self._lock = threading.RLock()
+
+        self._dirty = set()
+        self._transaction_depth = 0
+        self._flush_timer = None
+
+        self._stats = {"disk_reads": 0, "disk_writes": 0, "stat_calls": 0, "cache_hits": 0}
+
+    # Cache validation
+    def _file_signature(self):
+        self._stats["stat_calls"] += 1
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            self._stats["cache_hits"] += 1
+            return
+
+        self._last_check = now
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            self._stats["cache_hits"] += 1
+            return
+
+        self._stats["disk_reads"] += 1
+        pending = {key: self._data[key] for key in self._dirty if key in self._data}
+        # Swapped in complete, lock-free readers never see the file without the pending changes
+        data = load.open_json(self.path)
+        data.update(pending)
+        self._data = data
+        self._signature = signature
+
+    def invalidate(self):
+        """ Forces the next access to re-validate against the file on disk. """
+        with self._lock:
+            self._last_check = None
+            self._signature = None
+
+    # Access
+    def get(self, key: str, default=None):
+        last_check = self._last_check
+        if last_check is not None and time.monotonic() - last_check < self.check_interval:
+            # Checked recently: a single dict read needs neither the lock nor a stat
+            self._stats["cache_hits"] += 1
+            value = self._data.get(key, default)
+        else:
+            with self._lock:
+                self._ensure_fresh()
+                value = self._data.get(key, default)
+        # Only containers need a copy, the path getters are called in tight loops
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return value
+        return copy.deepcopy(value)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            self._ensure_fresh()
+            return copy.deepcopy(self._data)
+
+    def set(self, key: str, value) -> None:
+        """ Sets a value, written immediately unless a transaction is open. """
+        with self._lock:
+            self._ensure_fresh()
+            self._data[key] = copy.deepcopy(value)
+            self._dirty.add(key)
+            if not self._transaction_depth:
+                self.flush()
+
+    def set_deferred(self, key: str, value, delay: float = None) -> None:
+        """ Sets a value in memory and schedules a single write once updates settle. """
+        with self._lock:
+            self._ensure_fresh()
+            self._data[key] = copy.deepcopy(value)
+            self._dirty.add(key)
+            if not self._transaction_depth:
+                self._schedule_flush(self.flush_delay if delay is None else delay)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """ Gathers every change made inside the block into one write. """
+        with self._lock:
+            self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self.flush()
+
+    def flush(self) -> None:
+        """ Writes pending changes to disk, if any. """
+        with self._lock:
+            self._cancel_flush()
+            if not self._dirty:
+                return
+
+            load.save_json(self.path, self._data)
+            self._stats["disk_writes"] += 1
+            self._dirty.clear()
+
+            self._signature = self._file_signature()
+            self._last_check = time.monotonic()
+
+    def _schedule_flush(self, delay: float):
+        self._cancel_flush()
+        self._flush_timer = threading.Timer(delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _cancel_flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    # Typed values
+    def get_project_path(self) -> str:
+        return self.get("project_path", "") or ""
+
+    def get_default_task(self) -> str:
+        return self.get("default_task", "") or ""
+
+    def get_current_environment(self) -> dict:
+        return self.get("current_environment", {}) or {}
+
+    def get_current_hierarchy_profile(self) -> str:
+        return self.get("current_hierarchy_profile", "") or ""
+
+    def get_recent_files_amount(self) -> int:
+        try:
+            return int(self.get("recent_files_amount", 10))
+        except (TypeError, ValueError):
+            return 10
+
+    # Counters
+    def stats(self) -> dict:
+        """ Returns how many times the file was read, written, stat'ed, or served from memory. """
+        return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        for key in self._stats:
+            self._stats[key] = 0
+
+
+_store = None
+
+
+def get_store() -> SettingsStore:
+    """ Returns the shared settings store, recreated if the settings path moved. """
+    global _store
+    if _store is None or _store.path != settings.SETTINGS_PATH:
+        if _store is not None:
+            _store.flush()
+        state_location.ensure_user_state()
+        _store = SettingsStore(settings.SETTINGS_PATH)
+    return _store
+
+
+@atexit.register
+def _flush_on_exit():
+    if _store is not None:
+        _store.flush()
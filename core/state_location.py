@@ -0,0 +1,50 @@
+import os
+import shutil
+import threading
+
+from BetterFileExplorer.config import settings
+
+MIGRATION_MARKER = ".migrated"
+
+_lock = threading.Lock()
+_ready_for = None
+
+
+def ensure_user_state() -> str:
+    """
+    Makes sure the per-user state folder exists and was seeded from the install.
+
+    On first run, settings, recent files and the selector black list are copied from their
+    old location inside the package. A marker file keeps this from happening twice, so files
+    the user deletes later are not brought back.
+    """
+    global _ready_for
+
+    with _lock:
+        if _ready_for == settings.USER_DATA_PATH:
+            return settings.USER_DATA_PATH
+
+        os.makedirs(settings.USER_DATA_PATH, exist_ok=True)
+        marker = os.path.join(settings.USER_DATA_PATH, MIGRATION_MARKER)
+
+        if not os.path.exists(marker):
+            migrate_legacy_state()
+            with open(marker, "w") as f:
+                f.write(str(settings.DATA_PATH))
+
+        _ready_for = settings.USER_DATA_PATH
+        return settings.USER_DATA_PATH
+
+
+def migrate_legacy_state() -> list:
+    """ Copies legacy state files that don't exist yet in the user folder. Returns the copied paths. """
+    copied = []
+    for legacy_path, user_path in settings.LEGACY_STATE_FILES:
+        if os.path.exists(user_path) or not os.path.isfile(legacy_path):
+            continue
+
+        os.makedirs(os.path.dirname(user_path), exist_ok=True)
+        shutil.copy2(legacy_path, user_path)
+        copied.append(user_path)
+
+    return copied
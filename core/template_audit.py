@@ -0,0 +1,203 @@
+import os
+import time
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import profiles
+from BetterFileExplorer.core import entry_filter
+
+STATE_VERSION = 1
+
+Finding = namedtuple("Finding", ["path", "environment", "missing", "extra"])
+AuditReport = namedtuple("AuditReport", ["root", "profile", "findings", "directories", "rechecked", "seconds"])
+
+# One directory to check: its path, the template nodes expected inside and its environment
+_Task = namedtuple("_Task", ["path", "nodes", "environment"])
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def state_path(project_path: str) -> str:
+    digest = hashlib.sha1(_key(project_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.CACHE_PATH, f"template_audit_{digest}.json")
+
+
+class TemplateAudit:
+    """
+    Compares every client / project / asset folder of the project with the hierarchy profile.
+
+    Each directory of the template is a task on a thread pool, which returns its finding and
+    the tasks of its subfolders. A directory listing is kept with the directory mtime, and
+    reused while the mtime is unchanged, so a new audit only lists the directories changed
+    since the previous one; the state survives sessions in the cache folder. Template leaves
+    (e.g. the task folders) are never listed: their content is the artists' files.
+    """
+
+    def __init__(self, root: str, profile=None, max_workers: int = 16, state_file: str = None):
+        self.root = root
+        self.profile = profile or profiles.get_profile()
+        self.max_workers = max_workers
+        self.state_file = state_file or state_path(root)
+
+        self._content_filter = entry_filter.get_content_filter()
+        self._selector_filter = entry_filter.get_selector_filter()
+        self._state = self._load_state()
+
+    def _load_state(self) -> dict:
+        try:
+            data = load.open_json(self.state_file)
+        except ValueError:
+            return {}
+        if data.get("version") != STATE_VERSION:
+            return {}
+        return {path: (mtime, names) for path, (mtime, names) in data.get("directories", {}).items()}
+
+    def _save_state(self, state: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            load.save_json(self.state_file, {"version": STATE_VERSION,
+                                             "directories": {path: [mtime, names] for path, (mtime, names) in state.items()}})
+        except OSError:
+            # The state only makes the next audit faster
+            pass
+
+    def _list_directories(self, path: str):
+        """ Returns (mtime, sub folder names, listed) for ``path``, or None when it can't be read. """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._state.get(_key(path))
+        if cached is not None and cached[0] == mtime:
+            return mtime, cached[1], False
+
+        try:
+            with os.scandir(path) as iterator:
+                names = sorted(entry.name for entry in iterator
+                               if entry.is_dir() and self._content_filter.accepts(entry.name, True))
+        except OSError:
+            return None
+        return mtime, names, True
+
+    def _check(self, task: _Task):
+        listing = self._list_directories(task.path)
+        if listing is None:
+            return task, None, False, [], None
+        mtime, names, listed = listing
+
+        static = {os.path.normcase(node.name): node for node in task.nodes if node.role not in profiles.ITEM_ROLES}
+        role_node = next((node for node in task.nodes if node.role in profiles.ITEM_ROLES), None)
+        present = {os.path.normcase(name): name for name in names}
+
+        missing = [node.name for key, node in static.items() if key not in present]
+        extra = []
+        children = []
+        for key, name in present.items():
+            path = os.path.join(task.path, name)
+            if key in static:
+                if static[key].children:
+                    children.append(_Task(path, static[key].children, task.environment))
+            elif role_node is not None:
+                # Any other folder is an item of the role, e.g. a client or an asset
+                if self._selector_filter.accepts(name, True) and role_node.children:
+                    children.append(_Task(path, role_node.children, dict(task.environment, **{role_node.role: name})))
+            else:
+                extra.append(name)
+
+        finding = Finding(task.path, task.environment, missing, extra) if missing or extra else None
+        return task, (mtime, names), listed, children, finding
+
+    def run(self, should_stop=None, progress=None) -> AuditReport:
+        """ Audits the whole tree. ``progress(directories, rechecked)`` is called as directories are done. """
+        start = time.perf_counter()
+        findings = []
+        state = {}
+        rechecked = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bfe_audit") as executor:
+            pending = {executor.submit(self._check, _Task(self.root, self.profile.nodes, {}))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, listing, listed, children, finding = future.result()
+                    if listing is None:
+                        continue
+                    state[_key(task.path)] = listing
+                    rechecked += listed
+                    if finding is not None:
+                        findings.append(finding)
+                    if not (should_stop and should_stop()):
+                        pending.update(executor.submit(self._check, child) for child in children)
+                if progress:
+                    progress(len(state), rechecked)
+
+        if not (should_stop and should_stop()):
+            self._state = state
+            self._save_state(state)
+
+        findings.sort(key=lambda finding: _key(finding.path))
+        return AuditReport(root=self.root,
+                           profile=self.profile.name,
+                           findings=findings,
+                           directories=len(state),
+                           rechecked=rechecked,
+                           seconds=time.perf_counter() - start)
+
+
+def report_to_dict(report: AuditReport) -> dict:
+    return {
+        "root": report.root,
+        "profile": report.profile,
+        "directories": report.directories,
+        "rechecked": report.rechecked,
+        "seconds": round(report.seconds, 3),
+        "findings": [
+            {
+                "path": finding.path,
+                "relative_path": os.path.relpath(finding.path, report.root),
+                "environment": finding.environment,
+                "missing": finding.missing,
+                "extra": finding.extra
+            }
+            for finding in report.findings
+        ]
+    }
+
+
+def export_json(report: AuditReport, file_path: str) -> None:
+    load.save_json(file_path, report_to_dict(report))
+
+
+def format_report(report: AuditReport, limit: int = 200) -> str:
+    lines = []
+    for finding in report.findings[:limit]:
+        relative_path = os.path.relpath(finding.path, report.root)
+        if finding.missing:
+            lines.append(f"{relative_path}: missing {', '.join(finding.missing)}")
+        if finding.extra:
+            lines.append(f"{relative_path}: extra {', '.join(finding.extra)}")
+    if len(report.findings) > limit:
+        lines.append(f"... and {len(report.findings) - limit} more folders, see the JSON export")
+    return "\n".join(lines)
+
+
+def format_summary(report: AuditReport) -> str:
+    return (f"{len(report.findings)} folder(s) don't match the '{report.profile}' profile.\n"
+            f"{report.directories} folders checked, {report.rechecked} listed again, "
+            f"in {report.seconds:.1f} s.")
+
+
+_lock = threading.Lock()
+
+
+def audit_project(should_stop=None, progress=None) -> AuditReport:
+    """ Audits the current project path against the current profile. Safe to run off the main thread. """
+    with _lock:
+        return TemplateAudit(load.get_project_path()).run(should_stop=should_stop, progress=progress)
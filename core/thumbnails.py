@@ -0,0 +1,256 @@
+import os
+import hashlib
+import threading
+from collections import namedtuple, OrderedDict
+
+from maya import cmds
+
+from PySide2 import QtCore, QtGui
+
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import maya_utils
+from BetterFileExplorer.core import listing_cache
+
+PREVIEW_SETTINGS_KEY = "capture_preview_on_save"
+
+# Folders of the maya folder searched for previews, the first one receives the captures
+PREVIEW_FOLDERS = ("previews", "images")
+PREVIEW_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+THUMBNAIL_SIZE = 128
+PREVIEW_SIZE = (640, 360)
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+ThumbnailResult = namedtuple("ThumbnailResult", ["image", "cache_file"])
+
+
+def is_capture_enabled() -> bool:
+    # Opt-in: a capture is a playblast on the main thread and an image in the shared project
+    return bool(load.get_settings_parameter(PREVIEW_SETTINGS_KEY, False))
+
+
+def preview_folders(scene_path: str) -> list:
+    """ The ``previews`` and ``images`` folders of the Maya workspace of ``scene_path``. """
+    workspace = maya_utils.workspace_path(scene_path)
+    return [os.path.join(workspace, name) for name in PREVIEW_FOLDERS]
+
+
+def find_preview(scene_path: str):
+    """
+    Returns the preview image of ``scene_path``, or None.
+
+    A preview is named after the scene, ``<scene>.jpg``, or is the first frame of a
+    ``<scene>.<frame>.jpg`` sequence. The folders are read through the listing cache.
+    """
+    stem = os.path.splitext(os.path.basename(scene_path))[0].lower()
+    for folder in preview_folders(scene_path):
+        frames = []
+        for entry in listing_cache.list_entries(folder) or ():
+            name, extension = os.path.splitext(entry.name.lower())
+            if entry.is_dir or extension not in PREVIEW_EXTENSIONS:
+                continue
+            if name == stem:
+                return os.path.join(folder, entry.name)
+            if name.startswith(stem + "."):
+                frames.append(entry.name)
+        if frames:
+            return os.path.join(folder, min(frames))
+    return None
+
+
+def capture_preview(scene_path: str):
+    """
+    Playblasts the current frame as the preview of ``scene_path``, returns the image path or None.
+
+    Runs on the main thread, before the scene is saved, so the preview is already there when
+    the new version shows up in the folder content.
+    """
+    folder = preview_folders(scene_path)[0]
+    stem = os.path.splitext(os.path.basename(scene_path))[0]
+    target = os.path.join(folder, f"{stem}.jpg")
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        frame = cmds.currentTime(query=True)
+        cmds.playblast(frame=[frame],
+                       format="image",
+                       compression="jpg",
+                       completeFilename=target,
+                       widthHeight=PREVIEW_SIZE,
+                       percent=100,
+                       viewer=False,
+                       offScreen=True,
+                       showOrnaments=False,
+                       forceOverwrite=True)
+    except (OSError, RuntimeError) as error:
+        cmds.warning(f"Could not capture the preview of {os.path.basename(scene_path)}: {error}")
+        return None
+
+    listing_cache.invalidate(folder)
+    return target
+
+
+class ThumbnailCache:
+    """
+    Size bounded LRU of scaled thumbnails on local disk, one PNG per (scene path, mtime).
+
+    The recency order survives sessions through the file mtimes, which are touched on every
+    hit. The folder is only scanned on first use, from whichever thread gets there first.
+    """
+
+    def __init__(self, root: str, max_bytes: int = MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._files = None
+        self._size = 0
+
+    @staticmethod
+    def file_name(path: str, mtime: float) -> str:
+        key = f"{os.path.normcase(os.path.normpath(path))}|{mtime!r}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + ".png"
+
+    def _load(self):
+        if self._files is not None:
+            return
+        files = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.name.endswith(".png"):
+                    entry_stat = entry.stat()
+                    files.append((entry_stat.st_mtime, entry.name, entry_stat.st_size))
+        except OSError:
+            pass
+        files.sort()
+        self._files = OrderedDict((name, size) for _, name, size in files)
+        self._size = sum(self._files.values())
+
+    def get(self, path: str, mtime: float):
+        """ Returns the cached thumbnail file of ``path`` at ``mtime``, or None. """
+        name = self.file_name(path, mtime)
+        with self._lock:
+            self._load()
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+
+        cache_file = os.path.join(self.root, name)
+        try:
+            os.utime(cache_file)
+        except OSError:
+            with self._lock:
+                self._size -= self._files.pop(name, 0)
+            return None
+        return cache_file
+
+    def put(self, path: str, mtime: float, image: QtGui.QImage):
+        """ Stores ``image`` as the thumbnail of ``path`` at ``mtime``, returns the file or None. """
+        name = self.file_name(path, mtime)
+        cache_file = os.path.join(self.root, name)
+        temp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            if not image.save(temp_file, "PNG"):
+                return None
+            os.replace(temp_file, cache_file)
+            size = os.path.getsize(cache_file)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._load()
+            self._size += size - self._files.pop(name, 0)
+            self._files[name] = size
+            evicted = []
+            while self._size > self.max_bytes and len(self._files) > 1:
+                old_name, old_size = self._files.popitem(last=False)
+                self._size -= old_size
+                evicted.append(old_name)
+
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.root, old_name))
+            except OSError:
+                pass
+        return cache_file
+
+
+class ThumbnailService(workers.PathService):
+    """
+    Hands out scene thumbnails to the views without ever reading an image on the UI thread.
+
+    ``icon`` answers from memory, or returns None and queues the thumbnail on a small thread
+    pool: a disk cache hit, or else the preview found next to the scene, scaled down and
+    cached. ``thumbnail_ready`` is emitted with the scene path once its icon is in memory.
+    Views only ask for the rows they paint, so only visible rows are ever decoded.
+    """
+
+    thumbnail_ready = QtCore.Signal(str)
+
+    def __init__(self,
+                 cache: ThumbnailCache = None,
+                 max_workers: int = 2,
+                 max_icons: int = 512,
+                 max_missing: int = 4096,
+                 parent=None):
+        super(ThumbnailService, self).__init__(max_workers=max_workers, max_unavailable=max_missing, parent=parent)
+        self.cache = cache or ThumbnailCache(os.path.join(settings.CACHE_PATH, "thumbnails"))
+        self.max_icons = max_icons
+
+        self._icons = OrderedDict()
+        self._cache_files = {}
+
+    def icon(self, path: str, mtime: float):
+        """ Returns the thumbnail of ``path`` as a QIcon if it is in memory, else queues it and returns None. """
+        key = (path, mtime)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            return icon
+
+        self.request(path, mtime)
+        return None
+
+    def cached_file(self, path: str, mtime: float):
+        """ The thumbnail file of an icon already handed out, for rich text tooltips. """
+        return self._cache_files.get((path, mtime))
+
+    def _load(self, path: str, mtime: float):
+        # Worker thread: QImage, unlike QPixmap, may be used outside of the UI thread
+        cache_file = self.cache.get(path, mtime)
+        if cache_file:
+            image = QtGui.QImage(cache_file)
+            if not image.isNull():
+                return ThumbnailResult(image, cache_file)
+
+        preview = find_preview(path)
+        image = QtGui.QImage(preview) if preview else QtGui.QImage()
+        if image.isNull():
+            return None
+
+        image = image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        return ThumbnailResult(image, self.cache.put(path, mtime, image))
+
+    def _on_loaded(self, key: tuple, result: ThumbnailResult) -> None:
+        self._icons[key] = QtGui.QIcon(QtGui.QPixmap.fromImage(result.image))
+        if result.cache_file:
+            self._cache_files[key] = result.cache_file
+        while len(self._icons) > self.max_icons:
+            old_key, _ = self._icons.popitem(last=False)
+            self._cache_files.pop(old_key, None)
+
+        self.thumbnail_ready.emit(key[0])
+
+
+_service = None
+
+
+def get_service() -> ThumbnailService:
+    global _service
+    if _service is None:
+        _service = ThumbnailService()
+    return _service
@@ -0,0 +1,140 @@
+import os
+import bisect
+import threading
+from collections import OrderedDict
+
+from BetterFileExplorer.core import versions
+from BetterFileExplorer.core import listing_cache
+
+# Sub version key of a published file, so it sorts after every sub version of its version
+PUBLISHED = float("inf")
+
+
+class VersionIndex:
+    """
+    Sorted versions of one ``<asset>_<task>`` scene family in a task folder.
+
+    File names are parsed once, when they are first seen, into (version, sub version) keys
+    kept in a sorted list; a published file uses the PUBLISHED sub version key. Files that
+    don't follow the naming convention, or belong to another asset or task, are ignored.
+    The latest version and its state are read from the end of the list.
+    """
+
+    def __init__(self, base: str):
+        self.base = base
+        self._base_key = base.lower()
+
+        self._keys = []
+        self._files = {}
+        self._parsed = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # Update
+    def _parse(self, file_name: str):
+        if file_name not in self._parsed:
+            scene = versions.parse_scene_name(file_name)
+            if scene is None or scene.base.lower() != self._base_key:
+                self._parsed[file_name] = None
+            else:
+                sub_version = PUBLISHED if scene.published else scene.sub_version
+                self._parsed[file_name] = (scene.version, sub_version)
+        return self._parsed[file_name]
+
+    def add(self, file_name: str) -> None:
+        key = self._parse(file_name)
+        if key is None or key in self._files:
+            return
+        bisect.insort(self._keys, key)
+        self._files[key] = file_name
+
+    def remove(self, file_name: str) -> None:
+        key = self._parsed.pop(file_name, None)
+        if key is None or self._files.get(key) != file_name:
+            return
+        del self._keys[bisect.bisect_left(self._keys, key)]
+        del self._files[key]
+
+    def sync(self, file_names) -> None:
+        """ Applies the difference between the indexed files and ``file_names``. """
+        file_names = set(file_names)
+        for file_name in [file_name for file_name in self._parsed if file_name not in file_names]:
+            self.remove(file_name)
+        for file_name in file_names:
+            self.add(file_name)
+
+    # Queries
+    @property
+    def latest_version(self) -> int:
+        return self._keys[-1][0] if self._keys else 0
+
+    def is_published(self, version: int) -> bool:
+        return (version, PUBLISHED) in self._files
+
+    def latest_sub_version(self, version: int):
+        """ Highest sub version of ``version``, None when it has none. """
+        position = bisect.bisect_left(self._keys, (version, PUBLISHED))
+        if position and self._keys[position - 1][0] == version:
+            return self._keys[position - 1][1]
+        return None
+
+    def latest_work_file(self):
+        """ File name of the highest sub version of the latest version, or its publish. """
+        if not self._keys:
+            return None
+        version = self.latest_version
+        sub_version = self.latest_sub_version(version)
+        return self._files[(version, PUBLISHED if sub_version is None else sub_version)]
+
+    def next_save(self, publish: bool = False) -> tuple:
+        """
+        Returns the (version, sub version) of the next save, sub version None for a publish.
+
+        A new sub version of the latest version, or the latest version published. Once the
+        latest version is published, work goes on in the next one.
+        """
+        version = self.latest_version
+        if not version:
+            return 1, None if publish else 1
+        if self.is_published(version):
+            version += 1
+            return version, None if publish else 1
+        return version, None if publish else self.latest_sub_version(version) + 1
+
+    def file_name(self, version: int, sub_version=None, extension: str = "ma") -> str:
+        sub_version_text = "pub" if sub_version is None else f"{sub_version:03d}"
+        return f"{self.base}_v{version:03d}.{sub_version_text}.{extension}"
+
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+MAX_INDEXES = 64
+
+
+def get_version_index(path: str, base: str) -> VersionIndex:
+    """
+    Returns the version index of ``base`` in the task folder ``path``, in step with its listing.
+
+    The index is kept between calls and only re-synced, with the new names parsed, when the
+    listing cache hands out a new listing of the folder.
+    """
+    key = (os.path.normcase(os.path.normpath(path)), base.lower())
+    entries = listing_cache.list_entries(path) or ()
+
+    with _lock:
+        cached = _indexes.get(key)
+        if cached is not None:
+            _indexes.move_to_end(key)
+            cached_entries, index = cached
+        else:
+            cached_entries, index = None, VersionIndex(base)
+
+        if entries is not cached_entries:
+            index.sync(entry.name for entry in entries if not entry.is_dir)
+
+        _indexes[key] = (entries, index)
+        if len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+
+    return index
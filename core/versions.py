@@ -0,0 +1,29 @@
+import re
+from collections import namedtuple
+
+# <asset>_<task>_v<version>.<sub version|pub>.<ma|mb>
+SCENE_NAME_PATTERN = re.compile(
+    r"^(?P<base>.+)_v(?P<version>\d+)\.(?P<sub_version>\d+|pub)\.(?P<extension>ma|mb)$",
+    re.IGNORECASE
+)
+
+SceneName = namedtuple("SceneName", ["base", "version", "sub_version", "published", "extension"])
+
+
+def parse_scene_name(file_name: str):
+    """
+    Parses a versioned scene file name.
+
+    Returns a SceneName, with sub_version set to None for published files, or None when the
+    name doesn't follow the naming convention.
+    """
+    match = SCENE_NAME_PATTERN.match(file_name)
+    if not match:
+        return None
+
+    published = match.group("sub_version").lower() == "pub"
+    return SceneName(base=match.group("base"),
+                     version=int(match.group("version")),
+                     sub_version=None if published else int(match.group("sub_version")),
+                     published=published,
+                     extension=match.group("extension").lower())
@@ -0,0 +1,148 @@
+import traceback
+from collections import OrderedDict
+
+from maya import cmds
+
+from PySide2 import QtCore
+
+# Python references to running workers, so PySide doesn't collect them mid-run
+_active_workers = set()
+
+# Result of the PathService requests cancelled before they ran
+_SKIPPED = object()
+
+
+class WorkerSignals(QtCore.QObject):
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+    # done, total; plain Python ints, so byte counts above 2 GB go through
+    progress = QtCore.Signal(object, object)
+
+
+class Worker(QtCore.QRunnable):
+    """ Runs a callable on a QThreadPool thread and reports back to the UI thread with signals. """
+
+    def __init__(self, fn, *args, **kwargs):
+        super(Worker, self).__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+        else:
+            self.signals.finished.emit(result)
+
+
+class LatestRequest:
+    """ Hands out request ids for one target, so results of superseded requests can be dropped. """
+
+    def __init__(self):
+        self._current = 0
+
+    def next(self) -> int:
+        self._current += 1
+        return self._current
+
+    def current(self) -> int:
+        return self._current
+
+    def is_current(self, request_id: int) -> bool:
+        return request_id == self._current
+
+
+class PathService(QtCore.QObject):
+    """
+    Loads one result per (path, mtime) for the views, on its own small thread pool.
+
+    ``request`` queues ``_load(path, mtime)`` unless that key is already queued or known to be
+    unavailable; ``_on_loaded(key, result)`` receives the result on the UI thread. A load that
+    returns None or raises marks the key unavailable, and it is not queued again until the
+    file's mtime changes; the ``max_unavailable`` least recently marked keys are remembered.
+    """
+
+    def __init__(self, max_workers: int = 2, max_unavailable: int = 4096, parent=None):
+        super(PathService, self).__init__(parent)
+        self.max_unavailable = max_unavailable
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        self._pending = set()
+        # Least recently marked first
+        self._unavailable = OrderedDict()
+        self._generation = 0
+
+    def request(self, path: str, mtime: float) -> None:
+        key = (path, mtime)
+        if key in self._pending or key in self._unavailable:
+            return
+        self._pending.add(key)
+        run_in_background(self._run, key, self._generation,
+                          on_finished=lambda result: self._on_finished(key, result),
+                          on_failed=lambda _: self._on_finished(key, None),
+                          pool=self._pool)
+
+    def cancel_pending(self) -> None:
+        """ Makes the queued requests return without loading anything, e.g. when the folder changes. """
+        self._generation += 1
+        self._pending.clear()
+
+    def _run(self, key: tuple, generation: int):
+        if generation != self._generation:
+            return _SKIPPED
+        return self._load(*key)
+
+    def _on_finished(self, key: tuple, result) -> None:
+        self._pending.discard(key)
+        if result is _SKIPPED:
+            return
+        if result is None:
+            self._unavailable[key] = None
+            while len(self._unavailable) > self.max_unavailable:
+                self._unavailable.popitem(last=False)
+            return
+        self._on_loaded(key, result)
+
+    def _load(self, path: str, mtime: float):
+        """ Worker thread: returns the result of ``path`` at ``mtime``, None when it has none. """
+        raise NotImplementedError
+
+    def _on_loaded(self, key: tuple, result) -> None:
+        raise NotImplementedError
+
+
+def run_in_background(fn, *args, on_finished=None, on_failed=None, on_progress=None,
+                      pool: QtCore.QThreadPool = None, **kwargs) -> Worker:
+    """
+    Runs ``fn(*args, **kwargs)`` on a worker thread.
+
+    ``on_finished`` receives the return value and ``on_failed`` the formatted traceback, both on
+    the UI thread. With ``on_progress``, ``fn`` is also given a ``progress(done, total)``
+    callable whose calls reach ``on_progress`` on the UI thread. ``fn`` must not touch widgets
+    or maya.cmds.
+    """
+    worker = Worker(fn, *args, **kwargs)
+    if on_progress:
+        worker.kwargs["progress"] = worker.signals.progress.emit
+        worker.signals.progress.connect(on_progress)
+    _active_workers.add(worker)
+
+    def _release(*_):
+        _active_workers.discard(worker)
+
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    worker.signals.failed.connect(on_failed or _warn_failure)
+    worker.signals.finished.connect(_release)
+    worker.signals.failed.connect(_release)
+
+    (pool or QtCore.QThreadPool.globalInstance()).start(worker)
+    return worker
+
+
+def _warn_failure(message: str):
+    cmds.warning(f"Background task failed:\n{message}")
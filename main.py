@@ -2,8 +2,9 @@ from PySide2 import QtWidgets
 import maya.OpenMayaUI as omui
 from shiboken2 import wrapInstance
 
-from BetterFileExplorer.ui import main_window, settings_window, new_profile_window, new_content_window, save_as_window
+from BetterFileExplorer.ui import main_window, settings_window, new_profile_window, new_content_window, save_as_window, quick_open_window
 from BetterFileExplorer.core import load
+from BetterFileExplorer.core import logic_template_audit
 
 
 def get_maya_main_window() -> QtWidgets.QWidget:
@@ -56,3 +57,13 @@ def launch_save_as():
     parent = get_maya_main_window()
     window = save_as_window.SaveAsUI(parent)
     window.show()
+
+
+def launch_quick_open(window: QtWidgets.QDialog):
+    parent = get_maya_main_window()
+    window = quick_open_window.QuickOpenUI(parent, window)
+    window.show()
+
+
+def launch_template_audit(window: QtWidgets.QDialog):
+    logic_template_audit.run_audit(window)
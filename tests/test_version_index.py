@@ -0,0 +1,47 @@
+"""
+Run from the folder containing the BetterFileExplorer package:
+    python -m unittest BetterFileExplorer.tests.test_version_index
+"""
+import unittest
+
+from BetterFileExplorer.core.version_index import VersionIndex
+
+
+def make_index(*file_names):
+    index = VersionIndex("chair_rig")
+    index.sync(file_names)
+    return index
+
+
+class LatestWorkFileTest(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertIsNone(make_index().latest_work_file())
+
+    def test_sub_version_zero_only(self):
+        index = make_index("chair_rig_v001.001.ma", "chair_rig_v002.000.ma")
+        self.assertEqual(index.latest_sub_version(2), 0)
+        self.assertEqual(index.latest_work_file(), "chair_rig_v002.000.ma")
+        self.assertEqual(index.next_save(), (2, 1))
+
+    def test_highest_sub_version(self):
+        index = make_index("chair_rig_v003.000.ma", "chair_rig_v003.002.ma", "chair_rig_v003.001.ma")
+        self.assertEqual(index.latest_work_file(), "chair_rig_v003.002.ma")
+
+    def test_published_only(self):
+        index = make_index("chair_rig_v001.003.ma", "chair_rig_v002.pub.ma")
+        self.assertIsNone(index.latest_sub_version(2))
+        self.assertEqual(index.latest_work_file(), "chair_rig_v002.pub.ma")
+        self.assertEqual(index.next_save(), (3, 1))
+
+    def test_published_with_sub_versions(self):
+        index = make_index("chair_rig_v002.000.ma", "chair_rig_v002.004.ma", "chair_rig_v002.pub.ma")
+        self.assertEqual(index.latest_work_file(), "chair_rig_v002.004.ma")
+
+    def test_other_scene_families_ignored(self):
+        index = make_index("chair_rig_v001.000.ma", "table_rig_v005.000.ma", "notes.txt")
+        self.assertEqual(index.latest_work_file(), "chair_rig_v001.000.ma")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,18 @@ from PySide2 import QtWidgets, QtCore, QtGui
 
 from BetterFileExplorer.config import settings
 from BetterFileExplorer.core import load
+from BetterFileExplorer.core import workers
+from BetterFileExplorer.core import fs_watcher
+from BetterFileExplorer.core import thumbnails
+from BetterFileExplorer.core import ma_header
+from BetterFileExplorer.core import profiles
 from BetterFileExplorer.core import logic_selector
 from BetterFileExplorer.core import logic_folder_content
 
 from BetterFileExplorer.widgets import menu_bar
 from BetterFileExplorer.widgets import custom_frame
 from BetterFileExplorer.widgets import labeled_combo_box
+from BetterFileExplorer.widgets import folder_content_model
 from BetterFileExplorer.widgets import rounded_item_delegate as rid
 
 
@@ -19,6 +25,19 @@ class BetterFileExplorerUI(QtWidgets.QDialog):
 
         self.project_path = load.get_project_path()
 
+        # Background scans, only the result of the latest request is shown
+        self.selector_request = workers.LatestRequest()
+        self.content_request = workers.LatestRequest()
+        self.pending_file_selection = ""
+        self.applied_selector_request = 0
+
+        # Folders behind the combos and the file list, refreshed in place when they change
+        self.watched_paths = {}
+        self.folder_watcher = fs_watcher.FolderWatcher(self)
+        self.folder_watcher.directory_changed.connect(
+            lambda path: logic_selector.on_directory_changed(self, path)
+        )
+
         self.setWindowTitle(f"{settings.APP_NAME}  |  v{settings.VERSION}")
         self.setWindowFlags(QtCore.Qt.Window)
         self.setMinimumSize(0, 0)
@@ -31,8 +50,9 @@ class BetterFileExplorerUI(QtWidgets.QDialog):
         self.create_widgets()
         self.create_master_layout()
 
-        current_env = load.get_current_environment()
-        logic_selector.update_selector_on_env(self, current_env)
+        logic_selector.index_project_in_background()
+
+        self.switch_environment(load.get_current_environment())
 
     # UI
     def create_widgets(self):
@@ -95,18 +115,28 @@ class BetterFileExplorerUI(QtWidgets.QDialog):
     def create_folder_content_list_section(self):
         self.folder_content_frame = custom_frame.Frame(name="Section")
 
-        self.folder_content_list = QtWidgets.QTreeWidget()
+        self.folder_content_model = folder_content_model.FolderContentModel(self)
+        self.folder_content_model.set_thumbnail_service(thumbnails.get_service())
+        self.folder_content_model.set_header_service(ma_header.get_service())
+
+        self.folder_content_list = QtWidgets.QTreeView()
+        self.folder_content_list.setModel(self.folder_content_model)
         self.folder_content_list.setItemDelegate(rid.RoundedItemDelegate(self.folder_content_list))
         self.folder_content_list.setObjectName("AssetList")
-        self.folder_content_list.setColumnCount(2)
         self.folder_content_list.setHeaderHidden(True)
         self.folder_content_list.setIndentation(0)
+        self.folder_content_list.setRootIsDecorated(False)
+        self.folder_content_list.setUniformRowHeights(True)
+        self.folder_content_list.setIconSize(QtCore.QSize(32, 18))
         self.folder_content_list.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.folder_content_list.setColumnWidth(folder_content_model.MAYA_VERSION_COLUMN, 50)
+        self.folder_content_list.setColumnWidth(folder_content_model.UNITS_COLUMN, 150)
+        logic_folder_content.show_header_columns(self.folder_content_list, logic_folder_content.header_columns_shown())
 
         self.folder_content_frame.content_layout().addWidget(self.folder_content_list)
 
-        self.folder_content_list.itemDoubleClicked.connect(
-            lambda item, column: logic_folder_content.open_file(self, item, column, self.recent_files_tree)
+        self.folder_content_list.doubleClicked.connect(
+            lambda index: logic_folder_content.open_file(self, index, self.recent_files_tree)
         )
 
         logic_folder_content.setup_files_context_menu(self.folder_content_list)
@@ -148,6 +178,32 @@ class BetterFileExplorerUI(QtWidgets.QDialog):
         self.recent_files_frame = custom_frame.Frame(name="Section", fixed_height=250)
         self.recent_files_frame.content_layout().addWidget(self.tabs_widget)
 
+    # ENVIRONMENT
+    def current_selector_environment(self) -> dict:
+        return {role: logic_selector.get_combo(self, role).currentText() for role in profiles.ROLES}
+
+    def switch_environment(self, target_env: dict, file_name: str = ""):
+        """
+        Moves the selector to a whole target environment in one transition.
+
+        Every level is resolved in a single background pass, the four combos are filled with
+        their signals blocked, the environment is saved once and the file list rendered once.
+        ``file_name`` is selected in the file list when given.
+        """
+        is_loading = self.selector_request.current() != self.applied_selector_request
+        if not is_loading and self.current_selector_environment() == target_env:
+            # Already there, no rescan needed
+            if file_name:
+                logic_selector.select_folder_content_file(self, file_name)
+            return
+
+        self.pending_file_selection = file_name
+        logic_selector.update_selector_on_env(self, target_env)
+
+    def closeEvent(self, event):
+        load.flush_settings()
+        super(BetterFileExplorerUI, self).closeEvent(event)
+
     # SIGNALS
     def on_client_changed(self, combo_dict: dict[QtWidgets.QComboBox]):
         current_env = {
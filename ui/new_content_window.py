@@ -32,30 +32,54 @@ class NewContentUI(QtWidgets.QDialog):
         new_profile_label = QtWidgets.QLabel(f"New {self.role.capitalize()} Folder:")
         new_profile_label.setObjectName("SettingsTitles")
 
-        new_profile_line_edit = QtWidgets.QLineEdit()
-        new_profile_line_edit.returnPressed.connect(
-            lambda: logic_selector.create_client_hierarchy_from_template(self, self.role, new_profile_line_edit, self.main_window)
+        self.name_line_edit = QtWidgets.QLineEdit()
+        self.name_line_edit.returnPressed.connect(
+            lambda: logic_selector.create_new_content(self, self.role, self.main_window)
         )
 
-        create_button = QtWidgets.QPushButton("Create")
-        create_button.setObjectName("RoundedButton")
+        # Bulk mode
+        self.bulk_checkbox = QtWidgets.QCheckBox("Several names (list or CSV)")
 
-        create_button.clicked.connect(
-            lambda: logic_selector.create_client_hierarchy_from_template(self, self.role, new_profile_line_edit, self.main_window)
+        self.names_text_edit = QtWidgets.QPlainTextEdit()
+        self.names_text_edit.setPlaceholderText(f"One {self.role} name per line, or a CSV with the names in the first column")
+        self.names_text_edit.setVisible(False)
+
+        self.bulk_checkbox.toggled.connect(self.names_text_edit.setVisible)
+        self.bulk_checkbox.toggled.connect(lambda checked: self.name_line_edit.setVisible(not checked))
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+
+        self.create_button = QtWidgets.QPushButton("Create")
+        self.create_button.setObjectName("RoundedButton")
+
+        self.create_button.clicked.connect(
+            lambda: logic_selector.create_new_content(self, self.role, self.main_window)
         )
 
+        preview_button = QtWidgets.QPushButton("Preview")
+        preview_button.setObjectName("RoundedButton")
+        preview_button.setToolTip("Lists the folders that would be created, without creating them")
+
+        preview_button.clicked.connect(lambda: logic_selector.preview_new_content(self, self.role))
+
         cancel_button = QtWidgets.QPushButton("Cancel")
         cancel_button.setObjectName("RoundedButton")
 
         cancel_button.clicked.connect(self.close)
 
         buttons_layout = QtWidgets.QHBoxLayout()
-        buttons_layout.addWidget(create_button)
+        buttons_layout.addWidget(self.create_button)
+        buttons_layout.addWidget(preview_button)
         buttons_layout.addWidget(cancel_button)
 
         self.create_profile_frame = custom_frame.Frame(name="NewProfile")
         self.create_profile_frame.content_layout().addWidget(new_profile_label)
-        self.create_profile_frame.content_layout().addWidget(new_profile_line_edit)
+        self.create_profile_frame.content_layout().addWidget(self.name_line_edit)
+        self.create_profile_frame.content_layout().addWidget(self.names_text_edit)
+        self.create_profile_frame.content_layout().addWidget(self.bulk_checkbox)
+        self.create_profile_frame.content_layout().addWidget(self.progress_bar)
         self.create_profile_frame.content_layout().addLayout(buttons_layout)
 
     def create_master_layout(self):
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from PySide2 import QtWidgets, QtCore, QtGui
+
+from BetterFileExplorer.core import load
+from BetterFileExplorer.core import logic_quick_open
+from BetterFileExplorer.config import settings
+from BetterFileExplorer.widgets import custom_frame
+from BetterFileExplorer.widgets import rounded_item_delegate as rid
+
+
+class QuickOpenUI(QtWidgets.QDialog):
+    def __init__(self,
+                 parent: Optional[QtWidgets.QWidget] = None,
+                 main_window: QtWidgets.QDialog = None):
+        super(QuickOpenUI, self).__init__(parent)
+        self.main_window = main_window
+
+        self.setWindowTitle(f"Quick Open  |  {settings.APP_NAME}  |  v{settings.VERSION}")
+        self.setMinimumSize(500, 0)
+        self.resize(600, 400)
+        self.setWindowIcon(QtGui.QIcon(f"{settings.ROOT_DIR}/resources/icons/folder_black.png"))
+
+        stylesheet = load.load_qss_with_fixed_urls(rf"{settings.ROOT_DIR}/resources/styles/style.qss")
+        self.setStyleSheet(stylesheet)
+
+        self.create_widgets()
+        self.create_master_layout()
+
+        self.search_line_edit.setFocus()
+
+    # UI
+    def create_widgets(self):
+        self.search_line_edit = QtWidgets.QLineEdit()
+        self.search_line_edit.setPlaceholderText("Search scenes, e.g.  bbb rig pub")
+        self.search_line_edit.installEventFilter(self)
+
+        self.results_tree = QtWidgets.QTreeWidget()
+        self.results_tree.setItemDelegate(rid.RoundedItemDelegate(self.results_tree))
+        self.results_tree.setObjectName("AssetList")
+        self.results_tree.setColumnCount(2)
+        self.results_tree.setHeaderHidden(True)
+        self.results_tree.setIndentation(0)
+        self.results_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.results_tree.header().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
+
+        self.search_line_edit.textChanged.connect(
+            lambda text: logic_quick_open.update_results(self.results_tree, text)
+        )
+        self.search_line_edit.returnPressed.connect(
+            lambda: logic_quick_open.open_result(self, self.main_window, self.results_tree.currentItem())
+        )
+        self.results_tree.itemActivated.connect(
+            lambda item, column: logic_quick_open.open_result(self, self.main_window, item)
+        )
+
+        self.quick_open_frame = custom_frame.Frame(name="Section")
+        self.quick_open_frame.content_layout().addWidget(self.search_line_edit)
+        self.quick_open_frame.content_layout().addWidget(self.results_tree)
+
+    def create_master_layout(self):
+        _master_layout = QtWidgets.QVBoxLayout(self)
+        _master_layout.setContentsMargins(0, 0, 0, 0)
+        _master_layout.setSpacing(0)
+
+        _master_layout.addWidget(self.quick_open_frame)
+
+    # EVENTS
+    def eventFilter(self, watched, event):
+        # Up / Down move through the results while typing
+        if watched is self.search_line_edit and event.type() == QtCore.QEvent.KeyPress:
+            if event.key() == QtCore.Qt.Key_Down:
+                logic_quick_open.move_current_item(self.results_tree, 1)
+                return True
+            if event.key() == QtCore.Qt.Key_Up:
+                logic_quick_open.move_current_item(self.results_tree, -1)
+                return True
+        return super(QuickOpenUI, self).eventFilter(watched, event)
@@ -68,6 +68,15 @@ class SaveAsUI(QtWidgets.QDialog):
 
         self.v_up_radio_button()
 
+        # Publish copy of the next version, shown while it runs
+        self.copy_progress_bar = QtWidgets.QProgressBar()
+        self.copy_progress_bar.setTextVisible(True)
+        self.copy_progress_bar.setVisible(False)
+
+        self.copy_status_label = QtWidgets.QLabel("")
+        self.copy_status_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.copy_status_label.setVisible(False)
+
     def create_save_btn_widgets(self):
         self.save_button = QtWidgets.QPushButton("Save As")
         self.save_button.setObjectName("RoundedButton")
@@ -114,6 +123,8 @@ class SaveAsUI(QtWidgets.QDialog):
         center_layout.addSpacing(5)
         center_layout.addLayout(radio_buttons_layout)
         center_layout.addSpacing(5)
+        center_layout.addWidget(self.copy_progress_bar)
+        center_layout.addWidget(self.copy_status_label)
 
         self.file_name_frame = custom_frame.Frame(name="Section")
         self.file_name_frame.content_layout().addLayout(center_layout)
@@ -140,5 +151,5 @@ class SaveAsUI(QtWidgets.QDialog):
         self.version_up_rb.toggled.connect(lambda: logic_save_as.update_file_name_preview(self))
 
     def save_button_clicked(self):
+        # The window closes itself once the save, and the publish copy if any, are done
         self.save_button.clicked.connect(lambda: logic_save_as.save_file(self))
-        self.save_button.clicked.connect(self.close)
@@ -5,6 +5,9 @@ from PySide2 import QtWidgets, QtCore, QtGui
 from BetterFileExplorer import main
 from BetterFileExplorer.core import load
 from BetterFileExplorer.core import logic_settings
+from BetterFileExplorer.core import entry_filter
+from BetterFileExplorer.core import dedup
+from BetterFileExplorer.core import thumbnails
 from BetterFileExplorer.config import settings
 
 
@@ -84,8 +87,40 @@ class SettingsUI(QtWidgets.QDialog):
         self.recent_files_spinbox = QtWidgets.QSpinBox()
         self.recent_files_spinbox.setMinimum(1)
         self.recent_files_spinbox.lineEdit().setAlignment(QtCore.Qt.AlignCenter)
-        recent_files_amount_dict = load.open_json(settings.SETTINGS_PATH)
-        self.recent_files_spinbox.setValue(int(recent_files_amount_dict.get("recent_files_amount", 10)))
+        self.recent_files_spinbox.setValue(load.get_recent_files_amount())
+
+        # Divider 3
+        divider_3 = self.create_divider()
+
+        # Entry Filter Rules
+        filter_rules = entry_filter.get_rules()
+
+        hidden_entries_label = QtWidgets.QLabel("Hidden Entries (glob, comma separated) :")
+        hidden_entries_label.setObjectName("SettingsTitles")
+
+        self.hidden_entries_line_edit = QtWidgets.QLineEdit()
+        self.hidden_entries_line_edit.setText(", ".join(filter_rules["hidden_globs"]))
+
+        file_extensions_label = QtWidgets.QLabel("Displayed File Extensions (empty for all) :")
+        file_extensions_label.setObjectName("SettingsTitles")
+
+        self.file_extensions_line_edit = QtWidgets.QLineEdit()
+        self.file_extensions_line_edit.setText(", ".join(filter_rules["file_extensions"]))
+
+        # Divider 4
+        divider_4 = self.create_divider()
+
+        # Deduplication
+        self.dedup_checkbox = QtWidgets.QCheckBox("Link identical versions to a shared copy (read-only)")
+        self.dedup_checkbox.setToolTip("Byte-identical scenes of a task folder become hard links into "
+                                       f"<project>/{dedup.STORE_DIR_NAME}. The latest work file is never linked.")
+        self.dedup_checkbox.setChecked(dedup.is_enabled())
+
+        # Previews
+        self.preview_checkbox = QtWidgets.QCheckBox("Capture a viewport preview when saving")
+        self.preview_checkbox.setToolTip("Playblasts the current frame to maya/previews/<scene>.jpg, "
+                                         "shown as the scene thumbnail in the folder content.")
+        self.preview_checkbox.setChecked(thumbnails.is_capture_enabled())
 
         # Save Button
         save_settings_buttons = QtWidgets.QPushButton("Save and Close")
@@ -131,6 +166,22 @@ class SettingsUI(QtWidgets.QDialog):
 
         self.settings_layout.addLayout(recent_files_layout)
 
+        self.settings_layout.addSpacing(5)
+        self.settings_layout.addWidget(divider_3)
+        self.settings_layout.addSpacing(5)
+
+        self.settings_layout.addWidget(hidden_entries_label)
+        self.settings_layout.addWidget(self.hidden_entries_line_edit)
+        self.settings_layout.addWidget(file_extensions_label)
+        self.settings_layout.addWidget(self.file_extensions_line_edit)
+
+        self.settings_layout.addSpacing(5)
+        self.settings_layout.addWidget(divider_4)
+        self.settings_layout.addSpacing(5)
+
+        self.settings_layout.addWidget(self.dedup_checkbox)
+        self.settings_layout.addWidget(self.preview_checkbox)
+
     def create_folder_hierarchy_widgets(self):
         # Label
         folder_hierarchy_label = QtWidgets.QLabel("Template Folder Hierarchy :")
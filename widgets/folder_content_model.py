@@ -0,0 +1,347 @@
+import os
+from array import array
+
+from PySide2 import QtCore, QtGui
+
+from BetterFileExplorer.core import versions
+from BetterFileExplorer.core import ma_header
+from BetterFileExplorer.core import dependencies
+from BetterFileExplorer.core.python_utils import format_file_date
+
+NAME_COLUMN = 0
+DATE_COLUMN = 1
+# Optional columns read from the Maya ASCII header, hidden unless enabled in the view
+MAYA_VERSION_COLUMN = 2
+UNITS_COLUMN = 3
+HEADER_COLUMNS = (MAYA_VERSION_COLUMN, UNITS_COLUMN)
+
+# Sort key of the files that don't follow the naming convention, listed before the versions
+UNVERSIONED = -1
+PUBLISHED_SUB_VERSION = 999999
+
+
+def version_sort_key(file_name: str) -> int:
+    """ Packs version and sub version in one integer, a published version sorting after its sub versions. """
+    scene = versions.parse_scene_name(file_name)
+    if scene is None:
+        return UNVERSIONED
+
+    sub_version = PUBLISHED_SUB_VERSION if scene.published else min(scene.sub_version, PUBLISHED_SUB_VERSION - 1)
+    return scene.version * (PUBLISHED_SUB_VERSION + 1) + sub_version
+
+
+class FolderContentModel(QtCore.QAbstractItemModel):
+    """
+    Flat model (name, date, Maya version, units) over the files of one task folder.
+
+    Rows are kept in parallel arrays: names, raw mtimes and packed version keys. Item data,
+    date strings and fonts are only built when the view asks for them. Sorting runs on the raw
+    values, ``row_for_name`` is a dict lookup, and rows are handed to the view in batches of
+    ``batch_size`` through fetchMore. With a thumbnail service, the name column shows the
+    scene thumbnails, and with a header service, the header columns and tooltips show the
+    Maya ASCII headers; both are asked for only when the view paints the row.
+    """
+
+    def __init__(self, parent=None, batch_size: int = 256):
+        super(FolderContentModel, self).__init__(parent)
+        self.batch_size = batch_size
+
+        self.assets_path = ""
+        self.environment = {}
+        self.message = ""
+
+        self._names = []
+        self._mtimes = array("d")
+        self._version_keys = array("q")
+        self._rows = {}
+        self._loaded = 0
+
+        self._sort_column = NAME_COLUMN
+        self._sort_order = QtCore.Qt.AscendingOrder
+
+        self._bold_font = QtGui.QFont()
+        self._bold_font.setBold(True)
+
+        self.thumbnails = None
+        self.headers = None
+
+    def set_thumbnail_service(self, service) -> None:
+        self.thumbnails = service
+        service.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    def set_header_service(self, service) -> None:
+        self.headers = service
+        service.header_ready.connect(self._on_header_ready)
+
+    def _loaded_row(self, path: str) -> int:
+        if os.path.dirname(path) != self.assets_path:
+            return -1
+        row = self._rows.get(os.path.basename(path), -1)
+        return row if row < self._loaded else -1
+
+    def _on_thumbnail_ready(self, path: str):
+        row = self._loaded_row(path)
+        if row >= 0:
+            name_index = self.index(row, NAME_COLUMN)
+            self.dataChanged.emit(name_index, name_index, [QtCore.Qt.DecorationRole, QtCore.Qt.ToolTipRole])
+
+    def _on_header_ready(self, path: str):
+        row = self._loaded_row(path)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, NAME_COLUMN), self.index(row, HEADER_COLUMNS[-1]),
+                                  [QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole])
+
+    def _header(self, row: int):
+        return self.headers.header(self.file_path(row), self._mtimes[row])
+
+    def _tooltip(self, row: int):
+        parts = []
+        if self.thumbnails is not None:
+            cache_file = self.thumbnails.cached_file(self.file_path(row), self._mtimes[row])
+            if cache_file:
+                parts.append(f"<img src='{QtCore.QUrl.fromLocalFile(cache_file).toString()}'>")
+        parts.append(self._names[row])
+        if self.headers is not None:
+            header = self._header(row)
+            if header is not None:
+                parts.append(ma_header.format_tooltip(header))
+
+        graph = dependencies.get_graph()
+        if graph is not None:
+            referenced_by = graph.referenced_by(self.file_path(row))
+            if referenced_by:
+                parts.append(f"Referenced by {len(referenced_by)} scene(s)")
+        return "<br>".join(parts) if len(parts) > 1 else None
+
+    # Content
+    def set_entries(self, assets_path: str, environment: dict, entries) -> None:
+        """ Replaces the rows with the listing entries of ``assets_path``. """
+        if assets_path != self.assets_path:
+            for service in (self.thumbnails, self.headers):
+                if service is not None:
+                    service.cancel_pending()
+
+        self.beginResetModel()
+        self.assets_path = assets_path
+        self.environment = dict(environment)
+        self.message = ""
+        self._fill([(entry.name, entry.mtime) for entry in entries])
+        self.endResetModel()
+
+    def set_message(self, text: str) -> None:
+        """ Clears the rows and shows a single disabled line, e.g. while loading. """
+        self.beginResetModel()
+        self.message = text
+        self._fill([])
+        self.endResetModel()
+
+    def sync_entries(self, entries) -> None:
+        """ Updates the rows in place from a new listing of the same folder. """
+        wanted = {entry.name: entry.mtime for entry in entries}
+
+        removed = sorted((row for name, row in self._rows.items() if name not in wanted), reverse=True)
+        if len(removed) > len(self._names) // 2:
+            self.set_entries(self.assets_path, self.environment, entries)
+            return
+
+        for row in removed:
+            visible = row < self._loaded
+            if visible:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._names[row]
+            del self._mtimes[row]
+            del self._version_keys[row]
+            if visible:
+                self._loaded -= 1
+                self.endRemoveRows()
+        if removed:
+            self._index_rows()
+
+        added = []
+        for name, mtime in wanted.items():
+            row = self._rows.get(name)
+            if row is None:
+                added.append((name, mtime))
+            elif self._mtimes[row] != mtime:
+                self._mtimes[row] = mtime
+                if row < self._loaded:
+                    date_index = self.index(row, DATE_COLUMN)
+                    self.dataChanged.emit(date_index, date_index)
+
+        if added:
+            # New files are appended, then moved to their place by sorting
+            first = len(self._names)
+            visible = self._loaded == first
+            if visible:
+                self.beginInsertRows(QtCore.QModelIndex(), first, first + len(added) - 1)
+            for name, mtime in added:
+                self._append(name, mtime)
+            self._index_rows()
+            if visible:
+                self._loaded = len(self._names)
+                self.endInsertRows()
+            self.sort(self._sort_column, self._sort_order)
+
+    def _fill(self, rows):
+        self._names = []
+        self._mtimes = array("d")
+        self._version_keys = array("q")
+        for name, mtime in rows:
+            self._append(name, mtime)
+        self._apply_order(self._sorted_rows())
+        self._loaded = min(len(self._names), self.batch_size)
+
+    def _append(self, name: str, mtime: float):
+        self._names.append(name)
+        self._mtimes.append(mtime)
+        self._version_keys.append(version_sort_key(name))
+
+    def _index_rows(self):
+        self._rows = {name: row for row, name in enumerate(self._names)}
+
+    # Lookup
+    def row_for_name(self, file_name: str) -> int:
+        """ Returns the row of ``file_name``, or -1. The row is fetched into the view if needed. """
+        row = self._rows.get(file_name, -1)
+        if row >= self._loaded:
+            self.beginInsertRows(QtCore.QModelIndex(), self._loaded, row)
+            self._loaded = row + 1
+            self.endInsertRows()
+        return row
+
+    def file_path(self, row: int) -> str:
+        return os.path.join(self.assets_path, self._names[row])
+
+    def file_data(self, row: int) -> dict:
+        """ The file description used by the recent files and the context menus. """
+        return {
+            "path": self.file_path(row),
+            "file_name": self._names[row],
+            "client": self.environment.get("client", ""),
+            "project": self.environment.get("project", ""),
+            "asset": self.environment.get("asset", ""),
+            "task": self.environment.get("task", "")
+        }
+
+    # Sorting
+    def _sorted_rows(self) -> list:
+        names = self._names
+        if self._sort_column == DATE_COLUMN:
+            key_values = self._mtimes
+        else:
+            key_values = self._version_keys
+
+        rows = sorted(range(len(names)), key=lambda row: (key_values[row], names[row].lower()))
+        if self._sort_order == QtCore.Qt.DescendingOrder:
+            rows.reverse()
+        return rows
+
+    def _apply_order(self, rows: list):
+        self._names = [self._names[row] for row in rows]
+        self._mtimes = array("d", (self._mtimes[row] for row in rows))
+        self._version_keys = array("q", (self._version_keys[row] for row in rows))
+        self._index_rows()
+
+    def sort(self, column: int, order=QtCore.Qt.AscendingOrder) -> None:
+        """ Sorts on the parsed version (name column) or the raw mtime (date column). """
+        self._sort_column = column
+        self._sort_order = order
+        if not self._names:
+            return
+
+        rows = self._sorted_rows()
+        persistent = self.persistentIndexList()
+        persistent_names = [self._names[index.row()] for index in persistent]
+
+        # Rows pinned by the view (selection, current) must stay within the fetched rows
+        new_rows = {self._names[row]: new_row for new_row, row in enumerate(rows)}
+        needed = max([new_rows[name] + 1 for name in persistent_names], default=0)
+        if needed > self._loaded:
+            self.beginInsertRows(QtCore.QModelIndex(), self._loaded, needed - 1)
+            self._loaded = needed
+            self.endInsertRows()
+
+        self.layoutAboutToBeChanged.emit()
+        self._apply_order(rows)
+        self.changePersistentIndexList(persistent, [self.index(self._rows[name], index.column())
+                                                    for name, index in zip(persistent_names, persistent)])
+        self.layoutChanged.emit()
+
+    # QAbstractItemModel
+    def index(self, row: int, column: int, parent=QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if parent.isValid() or not 0 <= row < self.rowCount() or not 0 <= column < self.columnCount():
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None) -> QtCore.QModelIndex:
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return 1 if self.message else self._loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else 4
+
+    def canFetchMore(self, parent) -> bool:
+        return not parent.isValid() and self._loaded < len(self._names)
+
+    def fetchMore(self, parent) -> None:
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._names) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def flags(self, index) -> QtCore.Qt.ItemFlags:
+        if not index.isValid() or self.message:
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def headerData(self, section: int, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return ("Name", "Date", "Maya", "Units")[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+        if self.message:
+            if role == QtCore.Qt.DisplayRole and column == NAME_COLUMN:
+                return self.message
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == NAME_COLUMN:
+                return self._names[row]
+            if column == DATE_COLUMN:
+                return format_file_date(self._mtimes[row])
+            header = self._header(row) if self.headers is not None else None
+            if header is None:
+                return None
+            if column == MAYA_VERSION_COLUMN:
+                return header.maya_version
+            return ma_header.format_units(header)
+
+        if role == QtCore.Qt.TextAlignmentRole and column != NAME_COLUMN:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        if role == QtCore.Qt.DecorationRole and column == NAME_COLUMN and self.thumbnails is not None:
+            return self.thumbnails.icon(self.file_path(row), self._mtimes[row])
+
+        if role == QtCore.Qt.ToolTipRole:
+            return self._tooltip(row)
+
+        if role == QtCore.Qt.FontRole and "pub" in self._names[row].lower():
+            return self._bold_font
+
+        if role == QtCore.Qt.UserRole:
+            return self.file_data(row)
+
+        return None
@@ -1,6 +1,6 @@
 import webbrowser
 
-from PySide2 import QtWidgets, QtGui
+from PySide2 import QtWidgets, QtGui, QtCore
 
 from BetterFileExplorer import main
 from BetterFileExplorer.config import settings
@@ -49,6 +49,19 @@ class MenuBar(QtWidgets.QMenuBar):
         edit_menu.addAction(save_as_action)
         save_as_action.triggered.connect(main.launch_save_as)
 
+        quick_open_action = QtWidgets.QAction("Quick Open", self)
+        quick_open_action.setShortcut(QtGui.QKeySequence("Ctrl+P"))
+        quick_open_action.setShortcutContext(QtCore.Qt.WindowShortcut)
+        edit_menu.addAction(quick_open_action)
+        # Also owned by the window, so Ctrl+P works while the menu is closed
+        self.parent.addAction(quick_open_action)
+        quick_open_action.triggered.connect(lambda: main.launch_quick_open(self.parent))
+
+        audit_action = QtWidgets.QAction("Audit Folders", self)
+        audit_action.setToolTip("Lists the folders that don't match the current hierarchy profile")
+        edit_menu.addAction(audit_action)
+        audit_action.triggered.connect(lambda: main.launch_template_audit(self.parent))
+
     def create_about_menu(self):
         # About
         about_menu = self.addMenu("About")
@@ -7,7 +7,7 @@ class RoundedItemDelegate(QtWidgets.QStyledItemDelegate):
             rect = option.rect
             view = option.widget
 
-            total_width = sum([view.columnWidth(i) for i in range(view.columnCount())])
+            total_width = sum([view.columnWidth(i) for i in range(view.header().count())])
             rect.setWidth(total_width)
 
             # Déterminer l'état visuel